@@ -0,0 +1,312 @@
+# app/asgi.py
+"""
+ASGI (FastAPI) version of the learning API, serving the same /api/...
+contract as the Flask blueprint in app/routes/learning_routes.py but with
+Motor for MongoDB, so one process can hold many requests in flight while
+they wait on the database. Request parsing and response bodies are shared
+with the blueprint (app/learning_api.py, app/transcript_api.py); only the
+reads differ.
+
+Known limitation: content preparation (YouTube, transcripts, LLM) is not
+async; it runs the synchronous pipeline on a thread pool (see
+app/async_content.py).
+
+Run (from backend/):
+    uvicorn app.asgi:app --host 0.0.0.0 --port 8000 --workers 4
+
+Compare it with the Flask server using benchmarks/load_test.py --compare.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from werkzeug.http import parse_etags
+from app.models import KnowledgeGraphNode, VideoTranscript
+from app.async_db import get_collection, close_async_db
+from app.async_content import (
+    get_quiz_node_ids, get_cached_topic_content, prepare_topic_content, get_subject_catalogue,
+    shutdown_async_content
+)
+from app.db_metrics import db_metrics
+from app.transcript_api import (
+    TRANSCRIPT_PROJECTION, parse_include_transcript, parse_transcript_query, transcript_response
+)
+from app.content_jobs import submit_content_job, get_content_job, shutdown_content_jobs
+from app.graph_state import get_graph_version_async
+from app.http_cache import RESPONSE_CACHE, HTTP_CACHE_VERSION_MAX_AGE, make_etag, cache_control
+from app.preload import preload
+from app.topic_search import search_topics as search_topic_index
+from app.topic_suggest import suggest_topics
+from app.learning_api import (
+    invalid_parameters, topics_cache_key, parse_topic_listing, topic_listing_find, split_topic_page,
+    no_topics_payload, topic_listing_payload, parse_content_request, format_topic_content, content_error,
+    pending_job, job_payload, unknown_job, job_events, search_cache_key, parse_search, search_query_required,
+    search_payload, parse_suggest, suggest_payload, subjects_payload
+)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await asyncio.to_thread(preload)
+    yield
+    shutdown_content_jobs(wait=False)
+    shutdown_async_content(wait=False)
+    close_async_db()
+
+
+app = FastAPI(title="SmartLearn API", lifespan=lifespan)
+
+# Enable CORS for React frontend
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:5174"],  # React dev server
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Content-Type"]
+)
+
+
+def json_response(payload, status=200):
+    return JSONResponse(payload, status_code=status)
+
+
+async def cached_json(request, endpoint, key, build):
+    """
+    Async counterpart of http_cache.cached_response(): 304 for a matching
+    If-None-Match, then the in-process response cache, then `build()`.
+
+    Args:
+        build: coroutine function returning (payload, status)
+    """
+    version = await get_graph_version_async(max_age=HTTP_CACHE_VERSION_MAX_AGE)
+    key = (endpoint, key)
+    etag = make_etag(key, version)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": cache_control()}
+
+    if parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+        RESPONSE_CACHE.record_not_modified()
+        return Response(status_code=304, headers=headers)
+
+    cached = RESPONSE_CACHE.get(key, version)
+    if cached:
+        _, body, mimetype = cached
+        return Response(body, media_type=mimetype, headers=headers)
+
+    payload, status = await build()
+    response = json_response(payload, status)
+    if status != 200:
+        return response
+    RESPONSE_CACHE.put(key, version, response.body, response.media_type)
+    response.headers.update(headers)
+    return response
+
+
+# ================================================================
+# TASK 1: GET ALL SUBTOPICS FOR A SUBJECT
+# ================================================================
+
+@app.get('/api/subjects/{subject_name}/topics')
+async def get_subject_topics(subject_name: str, request: Request):
+    """See learning_routes.get_subject_topics."""
+    args = request.query_params
+    subject_name = subject_name.strip().title()
+
+    async def build():
+        try:
+            fields, limit, after = parse_topic_listing(args)
+        except ValueError as e:
+            return {"success": False, "message": str(e), "subject": subject_name}, 400
+
+        nodes_collection = get_collection(KnowledgeGraphNode)
+        page = topic_listing_find(subject_name, fields, limit, after)
+        nodes, has_more = split_topic_page(
+            [KnowledgeGraphNode._from_son(doc) async for doc in nodes_collection.find(**page)], limit
+        )
+
+        if not nodes and not after:
+            return no_topics_payload(subject_name), 404
+
+        quiz_node_ids = await get_quiz_node_ids([node.id for node in nodes]) if 'has_quiz' in fields else set()
+        total = await nodes_collection.count_documents({"subject": subject_name}) if limit else None
+        return topic_listing_payload(subject_name, nodes, fields, quiz_node_ids, limit, has_more, total), 200
+
+    try:
+        print(f"[API] Fetching topics for subject: {subject_name}")
+        return await cached_json(request, 'asgi.get_subject_topics', topics_cache_key(subject_name, args), build)
+    except Exception as e:
+        return json_response({"success": False, "error": str(e), "message": "Failed to fetch topics"}, 500)
+
+
+# ================================================================
+# TASK 2: GET VIDEO & QUIZ FOR A TOPIC
+# ================================================================
+
+@app.get('/api/topics/{topic_code}/content')
+async def get_topic_content(topic_code: str, request: Request):
+    """
+    See learning_routes.get_topic_content.
+
+    Known limitation: the stored-content fast path is async (Motor), but
+    preparing missing content (wait=true, and the background jobs) runs the
+    synchronous pipeline on a thread pool; see app/async_content.py.
+    """
+    try:
+        job_params, include_transcript, wait = parse_content_request(topic_code, request.query_params)
+
+        print(f"[API] Fetching content for topic: {topic_code}")
+
+        # Fast path: everything is already stored
+        if not (job_params['force_regenerate_quiz'] or job_params['force_revalidate']):
+            cached = await get_cached_topic_content(
+                topic_code, job_params['num_questions'], validate_with_llm=job_params['validate_with_llm']
+            )
+            if cached:
+                return json_response(format_topic_content(topic_code, cached, include_transcript))
+
+        if wait:
+            result = await prepare_topic_content(**job_params)
+            if result.get('status') == 'error':
+                return json_response(content_error(topic_code, result), 404)
+            return json_response(format_topic_content(topic_code, result, include_transcript))
+
+        job = await asyncio.to_thread(submit_content_job, **job_params)
+        pending = pending_job(topic_code, job, include_transcript)
+        return JSONResponse(pending, status_code=202, headers={"Location": pending["status_url"]})
+
+    except ValueError as ve:
+        return json_response(invalid_parameters(ve), 400)
+    except Exception as e:
+        print(f"[API ERROR] Failed to fetch content for {topic_code}: {e}")
+        return json_response({
+            "success": False,
+            "error": str(e),
+            "message": "Failed to fetch topic content"
+        }, 500)
+
+
+@app.get('/api/jobs/{job_id}')
+async def get_job_status(job_id: str, request: Request):
+    """See learning_routes.get_job_status."""
+    try:
+        include_transcript = parse_include_transcript(request.query_params.get('include_transcript'))
+    except ValueError as ve:
+        return json_response(invalid_parameters(ve), 400)
+    job = await asyncio.to_thread(get_content_job, job_id)
+    if not job:
+        return json_response(unknown_job(job_id), 404)
+    return json_response(job_payload(job, include_transcript))
+
+
+@app.get('/api/jobs/{job_id}/stream')
+async def stream_job(job_id: str, request: Request):
+    """See learning_routes.stream_job."""
+    try:
+        include_transcript = parse_include_transcript(request.query_params.get('include_transcript'))
+    except ValueError as ve:
+        return json_response(invalid_parameters(ve), 400)
+    job = await asyncio.to_thread(get_content_job, job_id)
+    if not job:
+        return json_response(unknown_job(job_id), 404)
+
+    # job_events blocks while waiting for the job, so StreamingResponse
+    # iterates it on a worker thread rather than on the event loop
+    return StreamingResponse(job_events(job, include_transcript), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# ================================================================
+# TRANSCRIPT SEGMENTS
+# ================================================================
+
+@app.get('/api/videos/{youtube_id}/transcript')
+async def get_video_transcript(youtube_id: str, request: Request):
+    """See learning_routes.get_video_transcript."""
+    try:
+        query = parse_transcript_query(request.query_params)
+    except ValueError as ve:
+        return json_response(invalid_parameters(ve), 400)
+
+    doc = await get_collection(VideoTranscript).find_one({'youtube_id': youtube_id}, TRANSCRIPT_PROJECTION)
+    status, body, mimetype, headers = transcript_response(
+        youtube_id, doc, query, request.headers.get('accept-encoding')
+    )
+    if isinstance(body, bytes):
+        return Response(body, status_code=status, media_type=mimetype, headers=headers)
+    return StreamingResponse(body, status_code=status, media_type=mimetype, headers=headers)
+
+
+# ================================================================
+# BONUS: GET ALL AVAILABLE SUBJECTS
+# ================================================================
+
+@app.get('/api/subjects')
+async def get_all_subjects(request: Request):
+    """See learning_routes.get_all_subjects."""
+    async def build():
+        return subjects_payload(await get_subject_catalogue()), 200
+
+    try:
+        print("[API] Fetching all subjects")
+        return await cached_json(request, 'asgi.get_all_subjects', (), build)
+    except Exception as e:
+        return json_response({"success": False, "error": str(e), "message": "Failed to fetch subjects"}, 500)
+
+
+# ================================================================
+# HELPER ENDPOINT: SEARCH TOPICS
+# ================================================================
+
+@app.get('/api/topics/search')
+async def search_topics(request: Request):
+    """See learning_routes.search_topics."""
+    args = request.query_params
+    try:
+        query, subject_filter, limit, offset = parse_search(args)
+    except ValueError as ve:
+        return json_response(invalid_parameters(ve), 400)
+
+    async def build():
+        if not query:
+            return search_query_required(), 400
+
+        # The index is rebuilt in the calling thread when the graph changed
+        total, hits = await asyncio.to_thread(
+            search_topic_index, query, subject=subject_filter, limit=limit, offset=offset
+        )
+        quiz_node_ids = await get_quiz_node_ids([node["_id"] for node, _ in hits])
+        return search_payload(query, total, hits, quiz_node_ids, limit, offset), 200
+
+    try:
+        return await cached_json(request, 'asgi.search_topics', search_cache_key(args), build)
+    except Exception as e:
+        return json_response({"success": False, "error": str(e), "message": "Search failed"}, 500)
+
+
+# ================================================================
+# HELPER ENDPOINT: AUTOCOMPLETE
+# ================================================================
+
+@app.get('/api/topics/suggest')
+async def suggest_topic_titles(request: Request):
+    """See learning_routes.suggest_topic_titles."""
+    try:
+        query, subject_filter, limit = parse_suggest(request.query_params)
+    except ValueError as ve:
+        return json_response(invalid_parameters(ve), 400)
+    try:
+        suggestions = await asyncio.to_thread(suggest_topics, query, limit=limit, subject=subject_filter)
+        return json_response(suggest_payload(query, suggestions))
+
+    except Exception as e:
+        return json_response({"success": False, "error": str(e), "message": "Suggestions failed"}, 500)
+
+
+# ================================================================
+# OPERATIONS: DATABASE METRICS
+# ================================================================
+
+@app.get('/api/metrics/db')
+async def get_db_metrics(request: Request):
+    """See learning_routes.get_db_metrics."""
+    reset = request.query_params.get('reset', 'false').lower() == 'true'
+    return json_response({"success": True, **db_metrics(reset=reset)})
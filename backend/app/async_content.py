@@ -0,0 +1,124 @@
+# app/async_content.py
+"""
+Async (Motor) equivalents of the content functions used by the learning
+API: node resolution, the stored-content fast path, has_quiz lookups and
+the subject catalogue. Only the reads differ from the synchronous versions;
+the decisions and result shapes are shared with them (NodeResolution and
+the stored-content helpers in app/kg_pipeline/yt_videos.py, app/catalogue.py).
+
+Known limitation: preparing missing content (YouTube search, transcript
+fetch, LLM validation and quiz generation) is not async. It is the
+synchronous pipeline in app/kg_pipeline/yt_videos.py, run on a bounded
+thread pool (ASYNC_CONTENT_WORKERS) so the event loop keeps serving other
+requests meanwhile; each preparation still holds one thread until it is done.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from app.models import KnowledgeGraphNode, VideoTranscript, Quiz, QuizQuestion, SubjectCatalogue
+from app.async_db import get_collection
+from app.graph_state import get_graph_version_async
+from app.transcript_store import joined_text
+from app.catalogue import (
+    CATALOGUE_KEY, catalogue_pipeline, catalogue_rows, current_catalogue, catalogue_summary_update
+)
+from app.learning_api import quiz_node_filter
+from app.kg_pipeline.yt_videos import (
+    NodeResolution, STORED_TRANSCRIPT_FIELDS, stored_transcript_candidates, stored_content_result,
+    get_video_transcript_and_quiz
+)
+
+# Threads running the synchronous content pipeline for wait=true requests
+ASYNC_CONTENT_WORKERS = int(os.getenv("ASYNC_CONTENT_WORKERS", "32"))
+
+_executor = ThreadPoolExecutor(max_workers=ASYNC_CONTENT_WORKERS, thread_name_prefix="async-content")
+
+
+async def get_quiz_node_ids(node_ids):
+    """Set of KG node ids that have at least one quiz (one `distinct` query)."""
+    if not node_ids:
+        return set()
+    return set(await get_collection(Quiz).distinct('KG_Node_ID', quiz_node_filter(node_ids)))
+
+
+async def resolve_node(code_or_topic, include_subject=True):
+    """NodeResolution.resolve() with Motor."""
+    nodes = get_collection(KnowledgeGraphNode)
+    matches = await nodes.find(NodeResolution.match_filter(code_or_topic)).to_list(None)
+    resolution = NodeResolution.from_matches(code_or_topic, map(KnowledgeGraphNode._from_son, matches))
+    if resolution:
+        return resolution
+    if include_subject:
+        doc = await nodes.find_one({'subject': code_or_topic})
+        if doc:
+            return NodeResolution(code_or_topic, KnowledgeGraphNode._from_son(doc), "subject")
+    return NodeResolution(code_or_topic)
+
+
+async def get_cached_topic_content(code_or_topic, num_questions=10, validate_with_llm=True):
+    """
+    yt_videos.get_cached_topic_content() with Motor: stored content only,
+    or None when anything is missing.
+    """
+    resolution = await resolve_node(code_or_topic, include_subject=False)
+    kg_node = resolution.node
+    if not kg_node or not kg_node.videos:
+        return None
+
+    topic = kg_node.title or code_or_topic
+    transcripts = get_collection(VideoTranscript)
+    docs = await transcripts.find(
+        {'youtube_id': {'$in': list(kg_node.videos)}}, dict.fromkeys(STORED_TRANSCRIPT_FIELDS, 1)
+    ).to_list(None)
+    transcript_doc = full_text = None
+    for doc in stored_transcript_candidates(kg_node, map(VideoTranscript._from_son, docs), topic, validate_with_llm):
+        full_text = doc.full_text
+        if full_text is None:
+            # Legacy document without full_text (see app/backfill_transcript_text.py)
+            raw = await transcripts.find_one({'_id': doc.id}, {'segments.text': 1}) or {}
+            full_text = joined_text(raw.get('segments') or [])
+        if full_text:
+            transcript_doc = doc
+            break
+    if not transcript_doc:
+        return None
+
+    quiz = await get_collection(Quiz).find_one(
+        {'KG_Node_ID': kg_node.id, 'quiz_type': 'progress'}, {'question_IDs': 1}
+    )
+    question_ids = ((quiz or {}).get('question_IDs') or [])[:num_questions]
+    if not question_ids:
+        return None
+    found = {
+        q['_id']: QuizQuestion._from_son(q) async for q in get_collection(QuizQuestion).find(
+            {'_id': {'$in': question_ids}},
+            {'question_text': 1, 'options': 1, 'correct_answer': 1, 'explanation': 1}
+        )
+    }
+    questions = [found[qid] for qid in question_ids if qid in found]
+    return stored_content_result(resolution, transcript_doc, full_text, quiz['_id'], questions)
+
+
+async def prepare_topic_content(**params):
+    """Run get_video_transcript_and_quiz(**params) off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, lambda: get_video_transcript_and_quiz(**params))
+
+
+async def get_subject_catalogue():
+    """catalogue.get_subject_catalogue() with Motor."""
+    version = await get_graph_version_async()
+
+    summaries = get_collection(SubjectCatalogue)
+    subjects = current_catalogue(await summaries.find_one({'key': CATALOGUE_KEY}), version)
+    if subjects is not None:
+        return subjects
+
+    docs = await get_collection(KnowledgeGraphNode).aggregate(catalogue_pipeline()).to_list(None)
+    subjects = catalogue_rows(docs)
+    await summaries.update_one({'key': CATALOGUE_KEY}, catalogue_summary_update(version, subjects), upsert=True)
+    return subjects
+
+
+def shutdown_async_content(wait=True):
+    _executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,40 @@
+# app/async_db.py
+"""
+Motor (asyncio) connection for the ASGI app, alongside the synchronous
+mongoengine connection in app/db.py. Both read the same MONGODB_URI and
+DATABASE_NAME; collections are named after the mongoengine models so the
+two data paths always see the same documents. Pool settings and metrics
+listeners are the same as well (app.db.client_options).
+"""
+import os
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.db import client_options
+
+load_dotenv()
+
+_client = None
+
+
+def get_async_client():
+    """The process-wide Motor client, created on first use (i.e. after any fork)."""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(os.getenv("MONGODB_URI"), **client_options())
+    return _client
+
+
+def get_async_db():
+    return get_async_client()[os.getenv("DATABASE_NAME")]
+
+
+def get_collection(model):
+    """Motor collection backing a mongoengine Document class."""
+    return get_async_db()[model._get_collection_name()]
+
+
+def close_async_db():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -0,0 +1,93 @@
+# app/async_traversal.py
+"""
+Async (Motor) equivalents of app/graph_traversal.py for the ASGI app.
+
+Graph structure still comes from the shared in-memory snapshot; only the
+node documents are read with Motor. The snapshot getter touches MongoDB
+just to re-check the graph version (or rebuild), so it runs in a worker
+thread instead of on the event loop.
+"""
+import asyncio
+from app.models import KnowledgeGraphNode
+from app.async_db import get_collection
+from app.graph_snapshot import GraphSnapshot, get_snapshot
+from app import graph_traversal
+from app.graph_traversal import (
+    PREREQUISITE_CHAIN_PROJECTION, _check_backend, _graph_lookup_pipeline, _reachable_nodes
+)
+
+
+async def current_snapshot():
+    return await asyncio.to_thread(get_snapshot)
+
+
+async def find_nodes(query, projection=None, sort=None, limit=0):
+    """KnowledgeGraphNode documents matching a raw filter."""
+    cursor = get_collection(KnowledgeGraphNode).find(query, projection, sort=sort, limit=limit)
+    return [KnowledgeGraphNode._from_son(doc) async for doc in cursor]
+
+
+async def find_nodes_by_code(codes):
+    """Nodes for `codes`, in the same order (missing codes are skipped)."""
+    if not codes:
+        return []
+    nodes = {n.code: n for n in await find_nodes({"code": {"$in": list(codes)}})}
+    return [nodes[c] for c in codes if c in nodes]
+
+
+# 🔹 1. Get all topics of a subject (optionally by difficulty level)
+async def get_topics_by_subject(subject: str, difficulty_level: str = None):
+    query = {"subject": subject}
+    if difficulty_level:
+        query["difficulty_level"] = difficulty_level
+    return await find_nodes(query)
+
+
+# 🔹 2. Get all immediate prerequisites of a topic
+async def get_prerequisites(code: str):
+    snap = await current_snapshot()
+    if code not in snap:
+        return []
+    return await find_nodes({"code": {"$in": snap.prerequisite_codes(code)}})
+
+
+# 🔹 3. Get all next (dependent) topics of a node
+async def get_next_topics(code: str):
+    snap = await current_snapshot()
+    if code not in snap:
+        return []
+    return await find_nodes({"code": {"$in": snap.next_topic_codes(code)}})
+
+
+# 🔹 4. Recursively fetch the full prerequisite chain (bottom-up)
+async def get_full_prerequisite_chain(code: str, backend: str = "snapshot", max_depth: int = None):
+    """See graph_traversal.get_full_prerequisite_chain."""
+    if backend == "graphlookup":
+        docs = await _graph_lookup(code, "prerequisites", max_depth, projection=PREREQUISITE_CHAIN_PROJECTION)
+        return GraphSnapshot.from_nodes(docs).prerequisite_chain(code)
+    _check_backend(backend)
+    return (await current_snapshot()).prerequisite_chain(code)
+
+
+# 🔹 5. Recursively fetch all subtopics for a subject (breadth-first style)
+async def get_all_subtopics(subject: str, start_code: str, depth_limit: int = 2, backend: str = "snapshot"):
+    if backend == "graphlookup":
+        if depth_limit < 0:
+            return []
+        docs = await _graph_lookup(start_code, "next_topics", depth_limit - 1)
+        codes = GraphSnapshot.from_nodes(docs).subtopic_codes(start_code, depth_limit)
+        nodes = {d["code"]: d for d in docs}
+        return [KnowledgeGraphNode._from_son(nodes[c]) for c in codes]
+    _check_backend(backend)
+    codes = (await current_snapshot()).subtopic_codes(start_code, depth_limit)
+    return await find_nodes_by_code(codes)
+
+
+async def _graph_lookup(start_code, connect_field, max_depth, projection=None):
+    pipeline = _graph_lookup_pipeline(start_code, connect_field, max_depth, projection)
+    return _reachable_nodes(await get_collection(KnowledgeGraphNode).aggregate(pipeline).to_list(None))
+
+
+# 🔹 6. Search topics by keyword (ranked by the in-memory search index)
+async def search_topics(keyword: str, subject: str = None, limit: int = None):
+    return await asyncio.to_thread(graph_traversal.search_topics, keyword, subject, limit)
@@ -0,0 +1,51 @@
+# app/backfill_transcript_text.py
+"""
+One-time backfill of VideoTranscript.full_text for legacy documents that
+only stored segments, so content requests can read the text alone.
+
+Usage (from backend/):
+    python -m app.backfill_transcript_text [--dry-run] [--batch 200]
+
+Running it again only touches documents that still lack full_text.
+"""
+import argparse
+from mongoengine.connection import get_db
+from pymongo import UpdateOne
+from app.db import *
+from app.models import VideoTranscript
+from app.transcript_store import joined_text
+
+# Legacy documents: segments stored, full_text missing or null
+MISSING_TEXT = {"full_text": None, "segments.0": {"$exists": True}}
+
+
+def backfill_full_text(dry_run=False, batch_size=200):
+    """
+    Returns:
+        number of documents updated (or that would be, with dry_run)
+    """
+    collection = get_db()[VideoTranscript._get_collection_name()]
+    updated = 0
+    ops = []
+    for doc in collection.find(MISSING_TEXT, {"segments.text": 1}):
+        updated += 1
+        if dry_run:
+            continue
+        ops.append(UpdateOne({"_id": doc["_id"], "full_text": None},
+                             {"$set": {"full_text": joined_text(doc["segments"])}}))
+        if len(ops) >= batch_size:
+            collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="only count documents lacking full_text")
+    parser.add_argument("--batch", type=int, default=200, help="documents per bulk write")
+    args = parser.parse_args()
+
+    n = backfill_full_text(dry_run=args.dry_run, batch_size=args.batch)
+    print(f"[backfill_transcript_text] {'Would backfill' if args.dry_run else 'Backfilled'} full_text on {n} transcripts")
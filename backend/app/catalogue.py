@@ -0,0 +1,83 @@
+# app/catalogue.py
+from datetime import datetime, timezone
+from app.models import KnowledgeGraphNode, Quiz, SubjectCatalogue
+from app.graph_state import get_graph_version
+
+CATALOGUE_KEY = "subjects"
+
+
+def catalogue_pipeline():
+    """Per-subject topic, video and quiz counts (quizzes are joined by KG_Node_ID via $lookup)."""
+    return [
+        {"$project": {
+            "subject": 1,
+            "video_count": {"$size": {"$ifNull": ["$videos", []]}}
+        }},
+        {"$lookup": {
+            "from": Quiz._get_collection_name(),
+            "localField": "_id",
+            "foreignField": "KG_Node_ID",
+            "pipeline": [{"$project": {"_id": 1}}],
+            "as": "quizzes"
+        }},
+        {"$group": {
+            "_id": "$subject",
+            "topic_count": {"$sum": 1},
+            "total_videos": {"$sum": "$video_count"},
+            "total_quizzes": {"$sum": {"$size": "$quizzes"}}
+        }},
+        {"$sort": {"_id": 1}}
+    ]
+
+
+def catalogue_rows(docs):
+    return [
+        {
+            "name": subj["_id"],
+            "topic_count": subj["topic_count"],
+            "total_videos": subj["total_videos"],
+            "total_quizzes": subj["total_quizzes"]
+        }
+        for subj in docs
+    ]
+
+
+def compute_subject_catalogue():
+    """
+    Compute topic, video and quiz counts for every subject in one
+    server-side aggregation.
+
+    Returns:
+        list of dicts: [{"name", "topic_count", "total_videos", "total_quizzes"}, ...]
+    """
+    return catalogue_rows(KnowledgeGraphNode.objects.aggregate(catalogue_pipeline()))
+
+
+def current_catalogue(summary, version):
+    """The subjects of a stored summary document (raw), if it was built for graph `version`; else None."""
+    if summary and summary.get('graph_version') == version:
+        return summary.get('subjects') or []
+    return None
+
+
+def catalogue_summary_update(version, subjects):
+    """Update storing `subjects` as the summary for graph `version` (upserted on {'key': CATALOGUE_KEY})."""
+    return {'$set': {'graph_version': version, 'subjects': subjects, 'computedAt': datetime.now(timezone.utc)}}
+
+
+def get_subject_catalogue():
+    """
+    Return the subject catalogue, served from the precomputed summary
+    document while the graph version it was built for is still current.
+    The summary is recomputed and stored when the graph has changed.
+    """
+    version = get_graph_version()
+
+    summaries = SubjectCatalogue._get_collection()
+    subjects = current_catalogue(summaries.find_one({'key': CATALOGUE_KEY}), version)
+    if subjects is not None:
+        return subjects
+
+    subjects = compute_subject_catalogue()
+    summaries.update_one({'key': CATALOGUE_KEY}, catalogue_summary_update(version, subjects), upsert=True)
+    return subjects
@@ -0,0 +1,226 @@
+# app/content_jobs.py
+import json
+import os
+import time
+import uuid
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from app.models import ContentJobRecord
+from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz
+
+# Worker pool preparing topic content in the background (in-process queue,
+# so no external broker is needed). Job state is written to the content_jobs
+# collection, so any server process can answer polls for any job.
+CONTENT_JOB_WORKERS = int(os.getenv("CONTENT_JOB_WORKERS", "4"))
+# Finished jobs are kept this long (seconds) so clients can collect results
+CONTENT_JOB_RETENTION = float(os.getenv("CONTENT_JOB_RETENTION", "900"))
+# Queued/running jobs older than this (seconds) are presumed lost with their
+# process and are not joined by new identical requests
+CONTENT_JOB_TIMEOUT = float(os.getenv("CONTENT_JOB_TIMEOUT", "600"))
+# How often (seconds) a process waiting on another process's job re-reads it
+CONTENT_JOB_POLL_INTERVAL = float(os.getenv("CONTENT_JOB_POLL_INTERVAL", "1.0"))
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class ContentJob:
+    """
+    One content-preparation request and its progress events.
+
+    The process running the job holds it in memory and writes every change
+    through to its ContentJobRecord; other processes get a copy loaded from
+    the record (see get_content_job) that re-reads it while waiting.
+    """
+
+    def __init__(self, key, params, job_id=None, local=True):
+        self.id = job_id or uuid.uuid4().hex
+        self.key = key
+        self.params = params
+        self.status = "queued"       # queued | running | done | error
+        self.events = []             # [{"stage", "message", "at"}]
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.local = local           # running in this process
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_record(cls, record):
+        job = cls(record.key, dict(record.params or {}), job_id=record.job_id, local=False)
+        job._load(record)
+        return job
+
+    def _load(self, record):
+        self.status = record.status
+        self.events = list(record.events or [])
+        self.error = record.error
+        self.created_at = record.created_at
+        self.finished_at = record.finished_at
+        if self.status == "done" and self.result is None:
+            self.result = dict(ContentJobRecord.objects(job_id=self.id).only("result").first().result or {})
+
+    def _store(self, **update):
+        try:
+            ContentJobRecord.objects(job_id=self.id).update_one(**update)
+        except Exception as e:
+            print(f"[content_jobs] Failed to store job {self.id}: {e}")
+
+    def save_new(self):
+        ContentJobRecord(
+            job_id=self.id, key=self.key, params=self.params, status=self.status, created_at=self.created_at,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=CONTENT_JOB_TIMEOUT + CONTENT_JOB_RETENTION)
+        ).save()
+
+    def report(self, stage, message):
+        """progress(stage, message) callback handed to the content pipeline."""
+        event = {"stage": stage, "message": message, "at": time.time()}
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+        self._store(push__events=event)
+
+    def _start(self):
+        self.status = "running"
+        self._store(set__status="running")
+        self.report("started", "Preparing content")
+
+    def _finish(self, status, result=None, error=None):
+        with self._cond:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            event = {"stage": status, "message": error or "Content ready", "at": self.finished_at}
+            self.events.append(event)
+            self._cond.notify_all()
+        self._store(
+            set__status=status, set__result=result or {}, set__error=error, set__finished_at=self.finished_at,
+            push__events=event,
+            set__expires_at=datetime.now(timezone.utc) + timedelta(seconds=CONTENT_JOB_RETENTION)
+        )
+
+    @property
+    def finished(self):
+        return self.status in ("done", "error")
+
+    def refresh(self):
+        """Re-read a job running in another process from its record."""
+        record = ContentJobRecord.objects(job_id=self.id).exclude("result").first()
+        if record is not None:
+            self._load(record)
+
+    def wait_for_events(self, since, timeout=15.0):
+        """Block until there are events after index `since` (or the job finished / timeout)."""
+        if self.local:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self.events) > since or self.finished, timeout=timeout)
+                return self.events[since:]
+        deadline = time.monotonic() + timeout
+        while not (len(self.events) > since or self.finished):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(CONTENT_JOB_POLL_INTERVAL, remaining))
+            self.refresh()
+        return self.events[since:]
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "topic_code": self.params["code_or_topic"],
+            "events": list(self.events),
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+_executor = ThreadPoolExecutor(max_workers=CONTENT_JOB_WORKERS, thread_name_prefix="content-job")
+_jobs = {}       # job id -> ContentJob run by this process
+_active = {}     # request key -> ContentJob still queued/running in this process
+_lock = threading.Lock()
+
+
+def _run(job):
+    job._start()
+    try:
+        result = get_video_transcript_and_quiz(progress=job.report, **job.params)
+        job._finish("done", result=result)
+    except Exception as e:
+        print(f"[content_jobs] Job {job.id} failed: {e}")
+        job._finish("error", error=str(e))
+    finally:
+        with _lock:
+            if _active.get(job.key) is job:
+                del _active[job.key]
+
+
+def _prune():
+    cutoff = time.time() - CONTENT_JOB_RETENTION
+    for job_id in [j.id for j in _jobs.values() if j.finished and j.finished_at < cutoff]:
+        del _jobs[job_id]
+
+
+def _find_active(key):
+    """An identical job queued or running in any process, if one is recent enough to still be alive."""
+    record = ContentJobRecord.objects(
+        key=key, status__in=ACTIVE_STATUSES, created_at__gt=time.time() - CONTENT_JOB_TIMEOUT
+    ).exclude("result").first()
+    return ContentJob.from_record(record) if record else None
+
+
+def submit_content_job(code_or_topic, num_questions=10, validate_with_llm=True,
+                       force_regenerate_quiz=False, force_revalidate=False):
+    """
+    Queue content preparation for a topic. Identical requests that are
+    still queued or running (in this or another process) share one job.
+
+    Returns:
+        ContentJob
+    """
+    params = {
+        "code_or_topic": code_or_topic,
+        "num_questions": num_questions,
+        "validate_with_llm": validate_with_llm,
+        "force_regenerate_quiz": force_regenerate_quiz,
+        "force_revalidate": force_revalidate,
+    }
+    key = json.dumps(params, sort_keys=True)
+    with _lock:
+        _prune()
+        job = _active.get(key) or _find_active(key)
+        if job:
+            return job
+        job = ContentJob(key, params)
+        job.save_new()
+        _jobs[job.id] = job
+        _active[key] = job
+    _executor.submit(_run, job)
+    return job
+
+
+def get_content_job(job_id):
+    """The job with this id, wherever it runs (None if unknown or expired)."""
+    with _lock:
+        job = _jobs.get(job_id)
+    if job:
+        return job
+    record = ContentJobRecord.objects(job_id=job_id).exclude("result").first()
+    return ContentJob.from_record(record) if record else None
+
+
+def shutdown_content_jobs(wait=True):
+    """
+    Stop accepting work on server shutdown: queued jobs are cancelled
+    (marked as errors) and running ones finish when `wait` is set.
+    """
+    _executor.shutdown(wait=False, cancel_futures=True)
+    with _lock:
+        queued = [job for job in _jobs.values() if job.status == "queued"]
+    for job in queued:
+        job._finish("error", error="Server shutting down")
+    if wait:
+        _executor.shutdown(wait=True)
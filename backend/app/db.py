@@ -1,14 +1,72 @@
 # app/db.py
 import os
-from mongoengine import connect
+from mongoengine import connect, disconnect, register_connection
+from mongoengine.connection import DEFAULT_CONNECTION_NAME
+from pymongo import ReadPreference
 from dotenv import load_dotenv
+from app.db_metrics import COMMAND_METRICS, POOL_METRICS
 
 load_dotenv()
 
-connect(
-    db=os.getenv("DATABASE_NAME"),
-    host=os.getenv("MONGODB_URI"),
-)
+# Connection pool (per process; each server worker has its own)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+# Milliseconds a request waits for a free pooled connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+# primary | primaryPreferred | secondary | secondaryPreferred | nearest
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+# Command/pool listeners feeding GET /api/metrics/db
+DB_METRICS_ENABLED = os.getenv("DB_METRICS_ENABLED", "true").lower() == "true"
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+def client_options():
+    """MongoClient keyword options shared by the mongoengine and Motor clients."""
+    if MONGO_READ_PREFERENCE not in READ_PREFERENCES:
+        raise ValueError(f"Unknown MONGO_READ_PREFERENCE: {MONGO_READ_PREFERENCE} "
+                         f"(expected one of {', '.join(READ_PREFERENCES)})")
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "read_preference": READ_PREFERENCES[MONGO_READ_PREFERENCE],
+    }
+    if DB_METRICS_ENABLED:
+        options["event_listeners"] = [COMMAND_METRICS, POOL_METRICS]
+    return options
+
+
+def connect_db():
+    """
+    (Re)register the default MongoDB connection from the environment. The
+    client itself is only created by the first query, so importing app.db
+    (or anything that star-imports it) opens no sockets or monitor threads.
+    """
+    register_connection(
+        DEFAULT_CONNECTION_NAME,
+        db=os.getenv("DATABASE_NAME"),
+        host=os.getenv("MONGODB_URI"),
+        **client_options()
+    )
+
+
+def reconnect_db():
+    """
+    Drop the inherited client and connect again. MongoClient is not
+    fork-safe, so each pre-forked server worker calls this after fork.
+    """
+    disconnect()
+    return connect_db()
+
+
+connect_db()
 
 # handy function to convert ObjectId to str (optional)
 from bson import ObjectId
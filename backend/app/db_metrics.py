@@ -0,0 +1,208 @@
+# app/db_metrics.py
+"""
+pymongo command and connection-pool listeners that keep per-collection
+query counts and latencies and pool checkout waits in memory, exported by
+GET /api/metrics/db.
+"""
+import threading
+import time
+from bisect import bisect_left
+from pymongo import monitoring
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+
+class LatencyStats:
+    """Count, total, max and a bucketed histogram of durations in milliseconds."""
+
+    __slots__ = ("count", "failures", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def add(self, ms, failed=False):
+        self.count += 1
+        self.failures += failed
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile, capped at the max (None without samples)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, round(self.max_ms, 3))
+        return round(self.max_ms, 3)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+        }
+
+
+def command_collection(event):
+    """Collection a started command targets ("" for database/admin commands)."""
+    if event.command_name == "getMore":
+        return event.command.get("collection", "")
+    target = event.command.get(event.command_name)
+    return target if isinstance(target, str) else ""
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Per (collection, command) counts and latencies."""
+
+    # Handshake/monitoring chatter that says nothing about the app's queries
+    IGNORED_COMMANDS = frozenset(("hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue",
+                                  "endSessions", "buildInfo", "killCursors"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}       # (connection, request_id) -> key
+        self.stats = {}          # (collection, command) -> LatencyStats
+
+    def started(self, event):
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (command_collection(event), event.command_name)
+
+    def _finish(self, event, failed):
+        with self._lock:
+            key = self._pending.pop((event.connection_id, event.request_id), None)
+            if key is None:
+                return
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = LatencyStats()
+            stats.add(event.duration_micros / 1000.0, failed)
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def snapshot(self):
+        with self._lock:
+            collections = {}
+            for (collection, command), stats in sorted(self.stats.items()):
+                collections.setdefault(collection or "(database)", {})[command] = stats.to_dict()
+            return collections
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Per server: open/checked-out connections, checkout waits and failures."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.servers = {}
+
+    def _server(self, address):
+        server = self.servers.get(address)
+        if server is None:
+            server = self.servers[address] = {
+                "open": 0, "checked_out": 0, "created": 0, "closed": 0,
+                "checkout_failures": {}, "checkout_wait": LatencyStats(), "cleared": 0,
+            }
+        return server
+
+    def _update(self, address, **deltas):
+        with self._lock:
+            server = self._server(address)
+            for field, delta in deltas.items():
+                server[field] += delta
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event.address, cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event.address, open=1, created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1, closed=1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            server = self._server(event.address)
+            reason = str(event.reason)
+            server["checkout_failures"][reason] = server["checkout_failures"].get(reason, 0) + 1
+            server["checkout_wait"].add(event.duration * 1000.0, failed=True)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            server = self._server(event.address)
+            server["checked_out"] += 1
+            server["checkout_wait"].add(event.duration * 1000.0)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                f"{host}:{port}": {**server, "checkout_failures": dict(server["checkout_failures"]),
+                                   "checkout_wait": server["checkout_wait"].to_dict()}
+                for (host, port), server in self.servers.items()
+            }
+
+    def reset(self):
+        # Gauges (open/checked_out) keep their values; counters start over
+        with self._lock:
+            for server in self.servers.values():
+                server.update(created=0, closed=0, cleared=0, checkout_failures={}, checkout_wait=LatencyStats())
+
+
+COMMAND_METRICS = CommandMetrics()
+POOL_METRICS = PoolMetrics()
+_started_at = time.time()
+
+
+def db_metrics(reset=False):
+    """Current command and pool metrics (optionally starting a new window)."""
+    global _started_at
+
+    payload = {
+        "since": _started_at,
+        "collections": COMMAND_METRICS.snapshot(),
+        "pools": POOL_METRICS.snapshot(),
+    }
+    if reset:
+        COMMAND_METRICS.reset()
+        POOL_METRICS.reset()
+        _started_at = time.time()
+    return payload
@@ -0,0 +1,174 @@
+# app/graph_snapshot.py
+import os
+import sys
+import threading
+from array import array
+from collections import deque
+from app.models import KnowledgeGraphNode
+from app.graph_state import get_graph_version
+
+# How long (seconds) a process trusts its view of the graph version before
+# re-checking MongoDB for changes made by other processes (e.g. the pipeline)
+SNAPSHOT_MAX_AGE = float(os.getenv("GRAPH_SNAPSHOT_MAX_AGE", "5"))
+
+
+class GraphSnapshot:
+    """
+    Read-only, in-memory view of the knowledge graph.
+
+    Node codes are interned to integer ids (their position in `codes`) and
+    edges are stored in CSR form: the prerequisites of node i are
+    prereq_targets[prereq_offsets[i]:prereq_offsets[i + 1]], likewise for
+    next topics. Edges pointing at codes that are not nodes are dropped,
+    which matches how the Mongo-backed traversals skipped missing nodes.
+    """
+
+    __slots__ = (
+        "version", "codes", "index", "subjects",
+        "prereq_offsets", "prereq_targets", "next_offsets", "next_targets"
+    )
+
+    def __init__(self, codes, subjects, prereq_lists, next_lists, version=0):
+        self.version = version
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.subjects = subjects
+        self.prereq_offsets, self.prereq_targets = self._pack(prereq_lists)
+        self.next_offsets, self.next_targets = self._pack(next_lists)
+
+    def _pack(self, adjacency):
+        offsets = array("i", [0])
+        targets = array("i")
+        for neighbours in adjacency:
+            targets.extend(self.index[c] for c in neighbours if c in self.index)
+            offsets.append(len(targets))
+        return offsets, targets
+
+    @classmethod
+    def from_nodes(cls, nodes, version=0):
+        """
+        Build a snapshot from node dicts with 'code', 'subject',
+        'prerequisites' and 'next_topics' keys (raw Mongo documents or the
+        kg_final*.json files).
+        """
+        codes, subjects, prereqs, nexts = [], [], [], []
+        seen = set()
+        for n in nodes:
+            code = n.get("code")
+            if not code or code in seen:
+                continue
+            seen.add(code)
+            codes.append(sys.intern(code))
+            subjects.append(sys.intern(n.get("subject") or ""))
+            prereqs.append(n.get("prerequisites") or [])
+            nexts.append(n.get("next_topics") or [])
+        return cls(codes, subjects, prereqs, nexts, version=version)
+
+    @classmethod
+    def load(cls, version=None):
+        """Load a snapshot of every KnowledgeGraphNode with one projected query."""
+        if version is None:
+            version = get_graph_version()
+        cursor = KnowledgeGraphNode._get_collection().find(
+            {}, {"_id": 0, "code": 1, "subject": 1, "prerequisites": 1, "next_topics": 1}
+        )
+        return cls.from_nodes(cursor, version=version)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def _prereq_ids(self, i):
+        return self.prereq_targets[self.prereq_offsets[i]:self.prereq_offsets[i + 1]]
+
+    def _next_ids(self, i):
+        return self.next_targets[self.next_offsets[i]:self.next_offsets[i + 1]]
+
+    def prerequisite_codes(self, code):
+        i = self.index.get(code)
+        if i is None:
+            return []
+        return [self.codes[j] for j in self._prereq_ids(i)]
+
+    def next_topic_codes(self, code):
+        i = self.index.get(code)
+        if i is None:
+            return []
+        return [self.codes[j] for j in self._next_ids(i)]
+
+    def prerequisite_chain(self, code):
+        """Full prerequisite chain of `code`, ordered base → target (DFS post-order)."""
+        root = self.index.get(code)
+        if root is None:
+            return []
+
+        visited = {root}
+        chain = []
+        stack = [(root, iter(self._prereq_ids(root)))]
+        while stack:
+            i, pending = stack[-1]
+            for j in pending:
+                if j not in visited:
+                    visited.add(j)
+                    stack.append((j, iter(self._prereq_ids(j))))
+                    break
+            else:
+                stack.pop()
+                chain.append(self.codes[i])
+        return chain
+
+    def subtopic_codes(self, start_code, depth_limit=2):
+        """Codes reachable from `start_code` via next_topics within depth_limit (BFS order)."""
+        root = self.index.get(start_code)
+        if root is None:
+            return []
+
+        visited = set()
+        queue = deque([(root, 0)])
+        result = []
+        while queue:
+            i, depth = queue.popleft()
+            if depth > depth_limit or i in visited:
+                continue
+            visited.add(i)
+            result.append(self.codes[i])
+            for j in self._next_ids(i):
+                queue.append((j, depth + 1))
+        return result
+
+
+_snapshot = None
+_build_lock = threading.Lock()
+
+
+def get_snapshot(max_age=SNAPSHOT_MAX_AGE):
+    """
+    Return the process-wide graph snapshot, rebuilding it when the graph
+    version has moved on. The new snapshot is built off to the side and
+    swapped in with a single assignment, so readers never see a partial one.
+    """
+    global _snapshot
+
+    version = get_graph_version(max_age=max_age)
+    snap = _snapshot
+    if snap is not None and snap.version == version:
+        return snap
+
+    with _build_lock:
+        snap = _snapshot
+        if snap is None or snap.version != version:
+            snap = GraphSnapshot.load(version=version)
+            _snapshot = snap
+            print(f"[graph_snapshot] Loaded graph v{version}: {len(snap)} nodes")
+    return snap
+
+
+def refresh_snapshot():
+    """Force a reload of the snapshot from MongoDB."""
+    global _snapshot
+
+    with _build_lock:
+        _snapshot = GraphSnapshot.load()
+    return _snapshot
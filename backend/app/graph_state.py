@@ -0,0 +1,78 @@
+# app/graph_state.py
+import time
+import threading
+from datetime import datetime, timezone
+from app.models import GraphState
+from app.async_db import get_collection
+
+GRAPH_STATE_KEY = "knowledge_graph"
+
+_lock = threading.Lock()
+_cached_version = None
+_cached_at = 0.0
+
+
+def get_graph_version(max_age=0.0):
+    """
+    Return the current knowledge-graph version counter.
+
+    Args:
+        max_age: Seconds a previously read version may be reused before
+                 re-reading it from MongoDB (0 = always read)
+
+    Returns:
+        int: version (0 if the graph has never been bumped)
+    """
+    global _cached_version, _cached_at
+
+    with _lock:
+        if _cached_version is not None and time.monotonic() - _cached_at < max_age:
+            return _cached_version
+
+    state = GraphState.objects(key=GRAPH_STATE_KEY).only("version").first()
+    version = state.version if state else 0
+
+    with _lock:
+        _cached_version = version
+        _cached_at = time.monotonic()
+    return version
+
+
+async def get_graph_version_async(max_age=0.0):
+    """
+    get_graph_version() for the ASGI app: the version document is read with
+    Motor, and the cached value is shared with the synchronous callers.
+    """
+    global _cached_version, _cached_at
+
+    with _lock:
+        if _cached_version is not None and time.monotonic() - _cached_at < max_age:
+            return _cached_version
+
+    state = await get_collection(GraphState).find_one({"key": GRAPH_STATE_KEY}, {"version": 1})
+    version = state.get("version", 0) if state else 0
+
+    with _lock:
+        _cached_version = version
+        _cached_at = time.monotonic()
+    return version
+
+
+def bump_graph_version(reason=None):
+    """
+    Increment the graph version so every derived view (subject catalogue,
+    in-memory snapshots, HTTP caches) knows it is stale.
+
+    Call after any write that changes nodes, attached videos or quizzes.
+    """
+    global _cached_version
+
+    GraphState.objects(key=GRAPH_STATE_KEY).update_one(
+        inc__version=1,
+        set__updatedAt=datetime.now(timezone.utc),
+        upsert=True
+    )
+    with _lock:
+        _cached_version = None
+    if reason:
+        print(f"[graph_state] Graph version bumped ({reason})")
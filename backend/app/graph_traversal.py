@@ -1,6 +1,8 @@
 # app/graph_traversal.py
-from app.models import KnowledgeGraphNode, VideoTranscript, TranscriptSegment
+from app.models import KnowledgeGraphNode, VideoTranscript
 from app.db import *
+from app.graph_snapshot import GraphSnapshot, get_snapshot
+from app.topic_search import get_search_index
 from youtube_transcript_api import YouTubeTranscriptApi
 
 
@@ -14,69 +16,125 @@ def get_topics_by_subject(subject: str, difficulty_level: str = None):
 
 # 🔹 2. Get all immediate prerequisites of a topic
 def get_prerequisites(code: str):
-    node = KnowledgeGraphNode.objects(code=code).first()
-    if not node:
+    snap = get_snapshot()
+    if code not in snap:
         return []
-    return KnowledgeGraphNode.objects(code__in=node.prerequisites)
+    return KnowledgeGraphNode.objects(code__in=snap.prerequisite_codes(code))
 
 
 # 🔹 3. Get all next (dependent) topics of a node
 def get_next_topics(code: str):
-    node = KnowledgeGraphNode.objects(code=code).first()
-    if not node:
+    snap = get_snapshot()
+    if code not in snap:
         return []
-    return KnowledgeGraphNode.objects(code__in=node.next_topics)
+    return KnowledgeGraphNode.objects(code__in=snap.next_topic_codes(code))
 
 
 # 🔹 4. Recursively fetch the full prerequisite chain (bottom-up)
-def get_full_prerequisite_chain(code: str):
-    visited = set()
-    chain = []
+def get_full_prerequisite_chain(code: str, backend: str = "snapshot", max_depth: int = None):
+    """
+    Args:
+        backend: "snapshot" walks the in-memory graph snapshot,
+                 "graphlookup" resolves the chain in MongoDB with $graphLookup
+        max_depth: Optional recursion limit for the "graphlookup" backend
+    """
+    if backend == "graphlookup":
+        return _graphlookup_prerequisite_chain(code, max_depth)
+    _check_backend(backend)
+    return get_snapshot().prerequisite_chain(code)  # ordered base → target
 
-    def dfs(cur_code):
-        if cur_code in visited:
-            return
-        visited.add(cur_code)
-        node = KnowledgeGraphNode.objects(code=cur_code).first()
-        if not node:
-            return
-        for pre_code in node.prerequisites:
-            dfs(pre_code)
-        chain.append(cur_code)
 
-    dfs(code)
-    return chain  # ordered base → target
+# 🔹 5. Recursively fetch all subtopics for a subject (breadth-first style)
+def get_all_subtopics(subject: str, start_code: str, depth_limit: int = 2, backend: str = "snapshot"):
+    if backend == "graphlookup":
+        return _graphlookup_subtopics(start_code, depth_limit)
+    _check_backend(backend)
+    codes = get_snapshot().subtopic_codes(start_code, depth_limit)
+    if not codes:
+        return []
+    # One query for all nodes, returned in traversal order
+    nodes = {n.code: n for n in KnowledgeGraphNode.objects(code__in=codes)}
+    return [nodes[c] for c in codes if c in nodes]
+
+
+TRAVERSAL_BACKENDS = ("snapshot", "graphlookup")
+
+
+def _check_backend(backend):
+    if backend not in TRAVERSAL_BACKENDS:
+        raise ValueError(f"Unknown traversal backend: {backend} (expected one of {TRAVERSAL_BACKENDS})")
+
+
+def _graph_lookup_pipeline(start_code, connect_field, max_depth, projection=None):
+    pipeline = [{"$match": {"code": start_code}}]
+    if max_depth is None or max_depth >= 0:
+        lookup = {
+            "from": KnowledgeGraphNode._get_collection_name(),
+            "startWith": f"${connect_field}",
+            "connectFromField": connect_field,
+            "connectToField": "code",
+            "as": "reachable"
+        }
+        if max_depth is not None:
+            lookup["maxDepth"] = max_depth
+        pipeline.append({"$graphLookup": lookup})
+    if projection:
+        pipeline.append({"$project": {
+            **projection,
+            **{f"reachable.{field}": 1 for field in projection}
+        }})
+    return pipeline
+
+
+def _reachable_nodes(docs):
+    """Flatten a $graphLookup result into [start node, *reachable nodes]."""
+    if not docs:
+        return []
+    root = docs[0]
+    return [root] + root.pop("reachable", [])
 
 
-# 🔹 5. Recursively fetch all subtopics for a subject (breadth-first style)
-def get_all_subtopics(subject: str, start_code: str, depth_limit: int = 2):
-    from collections import deque
+def _graph_lookup(start_code, connect_field, max_depth, projection=None):
+    """
+    Fetch `start_code` and every node reachable through `connect_field`
+    in a single $graphLookup round-trip.
 
-    visited = set()
-    queue = deque([(start_code, 0)])
-    result = []
+    Returns:
+        list of raw node documents (start node first), or [] if not found
+    """
+    pipeline = _graph_lookup_pipeline(start_code, connect_field, max_depth, projection)
+    return _reachable_nodes(list(KnowledgeGraphNode._get_collection().aggregate(pipeline)))
 
-    while queue:
-        cur_code, depth = queue.popleft()
-        if depth > depth_limit or cur_code in visited:
-            continue
-        visited.add(cur_code)
-        node = KnowledgeGraphNode.objects(code=cur_code).first()
-        if not node:
-            continue
-        result.append(node)
-        for nxt in node.next_topics:
-            queue.append((nxt, depth + 1))
-    return result
+
+PREREQUISITE_CHAIN_PROJECTION = {"_id": 0, "code": 1, "prerequisites": 1}
 
 
-# 🔹 6. Search topics by keyword
-def search_topics(keyword: str):
-    return list(
-        KnowledgeGraphNode.objects(
-            keywords__icontains=keyword
-        ).only("code", "title", "subject", "difficulty_level")
-    )
+def _graphlookup_prerequisite_chain(code, max_depth=None):
+    docs = _graph_lookup(code, "prerequisites", max_depth, projection=PREREQUISITE_CHAIN_PROJECTION)
+    # Topologically order the returned sub-graph client-side
+    return GraphSnapshot.from_nodes(docs).prerequisite_chain(code)
+
+
+def _graphlookup_subtopics(start_code, depth_limit=2):
+    if depth_limit < 0:
+        return []
+    # $graphLookup depth 0 is the direct next_topics, i.e. BFS depth 1
+    docs = _graph_lookup(start_code, "next_topics", depth_limit - 1)
+    codes = GraphSnapshot.from_nodes(docs).subtopic_codes(start_code, depth_limit)
+    nodes = {d["code"]: d for d in docs}
+    return [KnowledgeGraphNode._from_son(nodes[c]) for c in codes]
+
+
+# 🔹 6. Search topics by keyword (ranked by the in-memory search index)
+def search_topics(keyword: str, subject: str = None, limit: int = None):
+    _, hits = get_search_index().search(keyword, subject=subject, limit=limit)
+    return [
+        KnowledgeGraphNode._from_son({
+            "_id": node["_id"], "code": node["code"], "title": node["title"],
+            "subject": node["subject"], "difficulty_level": node["difficulty_level"]
+        })
+        for node, _ in hits
+    ]
 
 def show_node_video_and_transcript(code):
     """
@@ -98,19 +156,17 @@ def show_node_video_and_transcript(code):
     for vid_id in node.videos:
         print(f"🎥 Video: https://www.youtube.com/watch?v={vid_id}")
 
-        vt = VideoTranscript.objects(youtube_id=vid_id).first()
+        vt = VideoTranscript.without_segments().filter(youtube_id=vid_id).first()
         if not vt:
             print("⚠️ Transcript not found in database.\n")
             continue
 
-        if not vt.segments:
-            print("⚠️ Transcript segments are empty.\n")
+        full_transcript = vt.get_full_text()
+        if not full_transcript:
+            print("⚠️ Transcript text is empty.\n")
             continue
 
-        # Combine all segment texts into one readable transcript
-        full_transcript = " ".join(seg.text.strip() for seg in vt.segments if seg.text)
-
-        print(f"✅ Transcript found ({len(vt.segments)} segments)")
+        print(f"✅ Transcript found ({len(full_transcript)} characters)")
         print("--- Transcript Preview ---")
         print(full_transcript[:800] + ("..." if len(full_transcript) > 800 else ""))  # print first 800 chars
         print("--- End of Transcript ---\n")
@@ -0,0 +1,120 @@
+# app/http_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, make_response, request
+from app.graph_state import get_graph_version
+from app.graph_snapshot import SNAPSHOT_MAX_AGE
+
+# Seconds clients may reuse a response without revalidating (0 = always
+# revalidate, which costs a 304 while the graph is unchanged)
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+# Seconds the graph version is trusted before re-reading it from MongoDB
+HTTP_CACHE_VERSION_MAX_AGE = float(os.getenv("HTTP_CACHE_VERSION_MAX_AGE", str(SNAPSHOT_MAX_AGE)))
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "512"))
+# Change to invalidate every client's cached copy after a response format change
+HTTP_CACHE_SALT = os.getenv("HTTP_CACHE_SALT", "1")
+
+
+class ResponseCache:
+    """LRU of rendered 200 responses, each tagged with the graph version it was built for."""
+
+    def __init__(self, max_entries=HTTP_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (version, body bytes, mimetype)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key, version):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] != version:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def put(self, key, version, body, mimetype):
+        with self._lock:
+            self._data[key] = (version, body, mimetype)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses,
+                    "not_modified": self.not_modified}
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def make_etag(key, version):
+    """
+    Strong validator for a cached endpoint: the responses are a pure
+    function of the graph version and the normalised parameters, so the tag
+    is known before (and without) rendering the response.
+    """
+    raw = repr((HTTP_CACHE_SALT, version, key)).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def cache_control():
+    return f"public, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate"
+
+
+def _with_cache_headers(response, etag):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control()
+    return response
+
+
+def cached_response(key_func=None):
+    """
+    Cache a read-only view's 200 responses until the graph version changes.
+
+    Args:
+        key_func: key_func(**view_args) -> hashable of the normalised request
+                  parameters that shape the response (default: none)
+
+    A request whose If-None-Match matches gets a 304 from the in-process
+    version and tag alone; other hits are served from memory. Error
+    responses are never cached.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = get_graph_version(max_age=HTTP_CACHE_VERSION_MAX_AGE)
+            key = (request.endpoint, key_func(**kwargs) if key_func else ())
+            etag = make_etag(key, version)
+
+            if request.if_none_match.contains_weak(etag):
+                RESPONSE_CACHE.record_not_modified()
+                return _with_cache_headers(Response(status=304), etag)
+
+            cached = RESPONSE_CACHE.get(key, version)
+            if cached:
+                _, body, mimetype = cached
+                return _with_cache_headers(Response(body, status=200, mimetype=mimetype), etag)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            RESPONSE_CACHE.put(key, version, response.get_data(), response.mimetype)
+            return _with_cache_headers(response, etag)
+        return wrapper
+    return decorator
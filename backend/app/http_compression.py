@@ -0,0 +1,70 @@
+# app/http_compression.py
+"""
+Response compression for large payloads (transcripts): gzip always, brotli
+when the optional `brotli` package is installed. Works for whole bodies and
+for streamed chunks, so the Flask and ASGI servers share it.
+"""
+import os
+import zlib
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+
+def choose_encoding(accept_encoding):
+    """Best encoding the client accepts: "br", "gzip" or None (identity)."""
+    accepted = parse_accept_header(accept_encoding or "")
+    candidates = (["br"] if brotli else []) + ["gzip"]
+    best = max(candidates, key=lambda enc: accepted.quality(enc))
+    return best if accepted.quality(best) > 0 else None
+
+
+class StreamCompressor:
+    """Incremental compressor; every chunk is flushed so clients can decode it on arrival."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._gz = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)    # 31 = gzip container
+
+    def compress(self, chunk):
+        if self.encoding == "br":
+            return self._br.process(chunk) + self._br.flush()
+        return self._gz.compress(chunk) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush(zlib.Z_FINISH)
+
+
+def compress_body(body, encoding):
+    """(body, encoding actually applied) for a complete response body."""
+    if not encoding or len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY), "br"
+    return zlib.compress(body, GZIP_LEVEL, wbits=31), "gzip"
+
+
+def compress_chunks(chunks, encoding):
+    """Compress an iterable of byte chunks as one stream (pass-through without an encoding)."""
+    if not encoding:
+        yield from chunks
+        return
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
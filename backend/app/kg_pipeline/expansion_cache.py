@@ -0,0 +1,142 @@
+# app/kg_pipeline/expansion_cache.py
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl  # POSIX only; on Windows writers are serialized per process
+except ImportError:
+    fcntl = None
+
+
+class ExpansionCache:
+    """
+    Append-only JSONL journal of LLM topic expansions.
+
+    Each put() appends one `{"k": key, "v": value}` line, so a write costs
+    O(1) regardless of cache size. The journal is read lazily on first use,
+    the latest line for a key wins, and a truncated trailing line (from an
+    interrupted write) is ignored. When the journal holds more than
+    `compact_ratio` lines per live key it is rewritten to a temp file and
+    atomically swapped in.
+
+    Writers in other processes are coordinated with an exclusive flock on
+    the journal; a writer that finds the journal replaced under it reopens it.
+    """
+
+    def __init__(self, path, legacy_path=None, compact_ratio=2.0, min_compact_lines=256):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.compact_ratio = compact_ratio
+        self.min_compact_lines = min_compact_lines
+        self._entries = None
+        self._journal_lines = 0
+        self._lock = threading.RLock()
+
+    # ---------------- loading ----------------
+
+    def _read_journal(self):
+        entries, lines, damaged = {}, 0, False
+        if not os.path.exists(self.path):
+            return entries, lines, damaged
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    entries[record["k"]] = record["v"]
+                    lines += 1
+                except (ValueError, KeyError, TypeError):
+                    # Partial line left by an interrupted writer
+                    damaged = True
+        return entries, lines, damaged
+
+    def _ensure_loaded(self):
+        if self._entries is not None:
+            return
+        with self._lock:
+            if self._entries is not None:
+                return
+            if not os.path.exists(self.path) and self.legacy_path and os.path.exists(self.legacy_path):
+                with open(self.legacy_path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+                self._write_compacted(legacy)
+                print(f"[expansion_cache] Imported {len(legacy)} entries from {os.path.basename(self.legacy_path)}")
+            self._entries, self._journal_lines, damaged = self._read_journal()
+            if damaged:
+                # Rewrite so new lines are not appended onto a partial one
+                self.compact()
+
+    # ---------------- mapping API ----------------
+
+    def __contains__(self, key):
+        self._ensure_loaded()
+        return key in self._entries
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        self._ensure_loaded()
+        return self._entries.get(key, default)
+
+    def put(self, key, value):
+        """Record `value` for `key` by appending a single journal line."""
+        self._ensure_loaded()
+        line = (json.dumps({"k": key, "v": value}, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            with self._locked_journal() as fd:
+                os.write(fd, line)
+            self._entries[key] = value
+            self._journal_lines += 1
+            if self._journal_lines > max(self.min_compact_lines, self.compact_ratio * len(self._entries)):
+                self.compact()
+
+    # ---------------- compaction ----------------
+
+    def compact(self):
+        """Rewrite the journal with one line per key (merging other writers' lines)."""
+        self._ensure_loaded()
+        with self._lock:
+            with self._locked_journal():
+                on_disk, _, _ = self._read_journal()
+                on_disk.update(self._entries)
+                self._write_compacted(on_disk)
+            self._entries = on_disk
+            self._journal_lines = len(on_disk)
+
+    def _write_compacted(self, entries):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, value in entries.items():
+                f.write(json.dumps({"k": key, "v": value}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def _locked_journal(self):
+        """Open the journal for appending, holding an exclusive lock on it."""
+        while True:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if fcntl is None:
+                break
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                same_file = os.fstat(fd).st_ino == os.stat(self.path).st_ino
+            except FileNotFoundError:
+                same_file = False
+            if same_file:
+                break
+            # Journal was compacted and replaced while we waited: retry on the new file
+            os.close(fd)
+        try:
+            yield fd
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
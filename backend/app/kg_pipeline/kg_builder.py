@@ -1,22 +1,26 @@
-import json, time, os
+import json, time, os, threading
 from app.kg_pipeline.llm_client import llm_call
+from app.kg_pipeline.expansion_cache import ExpansionCache
 import networkx as nx
 from tqdm import tqdm
 from datetime import datetime
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 SEED_FILE = os.path.join(os.path.dirname(__file__), "kg_seed.json")
 OUT_FILE = os.path.join(os.path.dirname(__file__), "kg_final.json")
 CACHE_FILE = os.path.join(os.path.dirname(__file__), "kg_cache.json")
+JOURNAL_FILE = os.path.join(os.path.dirname(__file__), "kg_cache.jsonl")
 
 DIFFICULTY_LEVELS = ["base", "level_1", "level_2", "level_3", "level_4"]
 
-# Load or initialize cache
-if os.path.exists(CACHE_FILE):
-    with open(CACHE_FILE, "r", encoding="utf-8") as f:
-        CACHE = json.load(f)
-else:
-    CACHE = {}
+# Number of expand_topic calls kept in flight and LLM request rate (req/sec, 0 = unlimited)
+EXPANSION_CONCURRENCY = int(os.getenv("KG_EXPANSION_CONCURRENCY", "4"))
+LLM_RATE_PER_SEC = float(os.getenv("KG_LLM_RATE_PER_SEC", "0.8"))
+
+# Expansion cache: append-only journal, loaded on first use. The old
+# whole-file kg_cache.json is imported once if the journal does not exist.
+CACHE = ExpansionCache(JOURNAL_FILE, legacy_path=CACHE_FILE)
 
 PROMPT_TEMPLATE = """
 You are an educational curriculum designer for Grades 9-12 science. Create a comprehensive breakdown for the topic: "{topic}" in {subject}.
@@ -50,22 +54,52 @@ Return ONLY valid JSON.
 """
 
 
-def save_cache():
-    """Persist cache to file."""
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(CACHE, f, indent=2, ensure_ascii=False)
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter: `rate` tokens/sec, bursts up to
+    `capacity`. A rate of 0 means unlimited (acquire() never waits).
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate < 0:
+            raise ValueError(f"TokenBucket rate must not be negative: {rate}")
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+LLM_RATE_LIMITER = TokenBucket(LLM_RATE_PER_SEC)
 
 def expand_topic(topic_name, subject, current_level="base", max_retries=2, depth=1):
     """Expand a topic using LLM or return from cache if available."""
     cache_key = f"{subject}::{topic_name}::{current_level}"
 
     # ✅ Use cached response if available
-    if cache_key in CACHE:
-        return CACHE[cache_key]
+    cached = CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
     prompt = PROMPT_TEMPLATE.format(topic=topic_name, subject=subject, level=current_level, depth=depth)
     for attempt in range(max_retries + 1):
         try:
+            LLM_RATE_LIMITER.acquire()
             data = llm_call(prompt, max_tokens=1200)
             # txt = raw.strip()
             # if txt.startswith("```"):
@@ -75,9 +109,8 @@ def expand_topic(topic_name, subject, current_level="base", max_retries=2, depth
             if data.get("difficulty_level") not in DIFFICULTY_LEVELS:
                 data["difficulty_level"] = current_level
 
-            # ✅ Save to cache
-            CACHE[cache_key] = data
-            save_cache()
+            # ✅ Save to cache (one appended journal line)
+            CACHE.put(cache_key, data)
 
             return data
 
@@ -94,14 +127,45 @@ def generate_code(subject, title):
     title_part = "".join(c for c in title_part if c.isalnum() or c == "_")[:40]
     return f"{subject_prefix}_{title_part}"
 
-def build_graph(seed_nodes, recursive_depth=2, max_nodes=500):
+def build_graph(seed_nodes, recursive_depth=2, max_nodes=500, concurrency=EXPANSION_CONCURRENCY):
+    """
+    Expand the seed nodes breadth-first into a knowledge graph.
+
+    Up to `concurrency` expand_topic calls run ahead of the BFS in a thread
+    pool, but their results are applied strictly in queue order, so the
+    resulting graph is the same as a sequential build for the same cache.
+    """
     G = nx.DiGraph()
     nodes_map = {}
     processed = set()
+    in_flight = {}  # code -> Future of expand_topic
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+    def submit_expansion(code, current_depth):
+        node = nodes_map[code]
+        return executor.submit(
+            expand_topic, node["title"], node["subject"], node["difficulty_level"],
+            depth=current_depth + 1
+        )
+
+    def prefetch():
+        # Start expansions for the next entries the BFS will process: at most
+        # `concurrency`, and no more than the nodes still missing, since each
+        # expansion usually adds at least one node and the build stops at max_nodes
+        window = min(concurrency, max_nodes - len(nodes_map))
+        pending = 0
+        for code, depth_remaining, current_depth in q:
+            if pending >= window:
+                break
+            if code in processed or depth_remaining <= 0:
+                continue
+            pending += 1
+            if code not in in_flight:
+                in_flight[code] = submit_expansion(code, current_depth)
 
     print(f"\n{'='*60}")
     print(f"Building Knowledge Graph")
-    print(f"Recursive Depth: {recursive_depth} | Max Nodes: {max_nodes}")
+    print(f"Recursive Depth: {recursive_depth} | Max Nodes: {max_nodes} | Concurrency: {concurrency}")
     print(f"{'='*60}\n")
 
     # Initialize seed nodes with varied difficulties
@@ -128,6 +192,7 @@ def build_graph(seed_nodes, recursive_depth=2, max_nodes=500):
     pbar.update(len(nodes_map))
 
     while q and len(nodes_map) < max_nodes:
+        prefetch()
         code, depth_remaining, current_depth = q.popleft()
         if code in processed or depth_remaining <= 0:
             continue
@@ -139,8 +204,9 @@ def build_graph(seed_nodes, recursive_depth=2, max_nodes=500):
         current_level = node["difficulty_level"]
 
         try:
-            # Pass current depth to expand_topic
-            expansion = expand_topic(title, subject, current_level, depth=current_depth + 1)
+            # Pass current depth to expand_topic (already running in the pool)
+            future = in_flight.pop(code, None) or submit_expansion(code, current_depth)
+            expansion = future.result()
             
             node["objectives"] = expansion.get("objectives", node["objectives"])
             node["keywords"] = expansion.get("keywords", node["keywords"])
@@ -207,13 +273,17 @@ def build_graph(seed_nodes, recursive_depth=2, max_nodes=500):
                 if not G.has_edge(pre_code, code):
                     G.add_edge(pre_code, code, relationship="prerequisite_for")
 
-            time.sleep(1.2)  # Slightly reduced sleep time
-
         except Exception as e:
             print(f"\n⚠ Failed to expand '{title}': {e}")
             continue
 
     pbar.close()
+    # Expansions started ahead of a max_nodes cutoff are not needed any more:
+    # drop the queued ones before they spend LLM budget, and wait for the
+    # running ones so no worker writes to CACHE after build_graph returns
+    for future in in_flight.values():
+        future.cancel()
+    executor.shutdown(wait=True, cancel_futures=True)
 
 
     # Populate edges data back to nodes
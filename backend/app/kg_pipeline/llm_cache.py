@@ -0,0 +1,217 @@
+# app/kg_pipeline/llm_cache.py
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")   # memory | disk | mongo | none
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))   # seconds
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(os.path.dirname(__file__), "llm_cache"))
+
+
+def make_cache_key(model, system_prompt, prompt, max_tokens, temperature):
+    """Content address of an LLM request: sha256 over everything that shapes the response."""
+    raw = json.dumps([model, system_prompt, prompt, max_tokens, temperature], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ================================================================
+# Backends: get(key) -> value or None, put(key, value, ttl) -> evicted count
+# ================================================================
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def put(self, key, value, ttl):
+        evicted = 0
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DiskBackend:
+    """One JSON file per key under `directory`; least recently used files are evicted."""
+
+    def __init__(self, directory=LLM_CACHE_DIR, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._puts = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                item = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if item["expires_at"] < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        os.utime(path)  # mark as recently used
+        return item["value"]
+
+    def put(self, key, value, ttl):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": time.time() + ttl, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        # Scanning the directory is not free, so only enforce the bound periodically
+        with self._lock:
+            self._puts += 1
+            if self._puts % 64:
+                return 0
+        return self._evict()
+
+    def _evict(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            files.extend(os.path.join(root, n) for n in names if n.endswith(".json"))
+        excess = len(files) - self.max_entries
+        if excess <= 0:
+            return 0
+        files.sort(key=lambda p: os.path.getmtime(p))
+        for path in files[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return excess
+
+
+class MongoBackend:
+    """Entries in the llm_cache_entry collection; MongoDB's TTL index expires them."""
+
+    def __init__(self, max_entries=LLM_CACHE_MAX_ENTRIES):
+        import app.db  # registers the MongoDB connection
+        from app.models import LLMCacheEntry
+        self.model = LLMCacheEntry
+        self.max_entries = max_entries
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = datetime.now(timezone.utc)
+        entry = self.model.objects(key=key, expires_at__gt=now).only("value").first()
+        if entry is None:
+            return None
+        self.model.objects(key=key).update_one(set__last_used=now)
+        return entry.value
+
+    def put(self, key, value, ttl):
+        now = datetime.now(timezone.utc)
+        self.model.objects(key=key).update_one(
+            set__value=value,
+            set__expires_at=now + timedelta(seconds=ttl),
+            set__last_used=now,
+            upsert=True
+        )
+        with self._lock:
+            self._puts += 1
+            if self._puts % 64:
+                return 0
+        excess = self.model.objects.count() - self.max_entries
+        if excess <= 0:
+            return 0
+        stale = self.model.objects.order_by("last_used").limit(excess).scalar("id")
+        return self.model.objects(id__in=list(stale)).delete()
+
+
+BACKENDS = {"memory": MemoryBackend, "disk": DiskBackend, "mongo": MongoBackend}
+
+
+class LLMCache:
+    """Content-addressed response cache with hit/miss/eviction counters."""
+
+    def __init__(self, backend, ttl=LLM_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, key):
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"[llm_cache] Cache read failed: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        # Callers mutate the parsed response, so never hand out the cached object
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        try:
+            evicted = self.backend.put(key, copy.deepcopy(value), self.ttl)
+        except Exception as e:
+            print(f"[llm_cache] Cache write failed: {e}")
+            return
+        with self._lock:
+            self.stores += 1
+            self.evictions += evicted
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+
+def make_llm_cache(backend=LLM_CACHE_BACKEND):
+    """Build the cache configured by LLM_CACHE_BACKEND (None when disabled)."""
+    if not backend or backend == "none":
+        return None
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM_CACHE_BACKEND: {backend} (expected one of {list(BACKENDS)} or 'none')")
+    return LLMCache(BACKENDS[backend]())
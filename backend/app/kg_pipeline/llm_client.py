@@ -1,23 +1,162 @@
 # llm_client.py
 import os
+import time
+import random
+import threading
 import requests
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from app.kg_pipeline.llm_cache import make_cache_key, make_llm_cache
 import json
 
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL")
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 
-def llm_call(prompt, max_tokens=800, parse_json=True):
+# Transport settings
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))   # seconds
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "30"))      # seconds
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))              # seconds
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+SYSTEM_PROMPT = "You are an educational assistant that helps create structured knowledge graphs for grade 9–12 science topics."
+LLM_TEMPERATURE = 0.2
+
+
+class LLMMetrics:
+    """Thread-safe counters for LLM calls: latency, retries and token usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.failures = 0
+            self.retries = 0
+            self.total_latency = 0.0
+            self.max_latency = 0.0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_call(self, latency, usage=None, failed=False):
+        usage = usage or {}
+        with self._lock:
+            self.calls += 1
+            self.failures += int(failed)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.prompt_tokens += usage.get("prompt_tokens", 0) or 0
+            self.completion_tokens += usage.get("completion_tokens", 0) or 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "avg_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+                "max_latency_ms": round(self.max_latency * 1000, 1),
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+
+METRICS = LLMMetrics()
+
+# Response cache for identical requests (LLM_CACHE_BACKEND=memory|disk|mongo|none)
+LLM_CACHE = make_llm_cache()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Shared requests.Session with a keep-alive connection pool of
+    LLM_POOL_SIZE connections, so calls reuse TLS connections.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries are handled in _post_with_retries (to honor Retry-After)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LLM_POOL_SIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Connection": "keep-alive"})
+                _session = session
+    return _session
+
+
+def _retry_delay(attempt, response=None):
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if sent, else jittered exponential backoff."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(LLM_BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                return min(LLM_BACKOFF_MAX, max(0.0, (when - datetime.now(timezone.utc)).total_seconds()))
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _post_with_retries(body, headers):
+    """POST to the chat-completions endpoint, retrying 429/5xx and connection errors."""
+    session = get_session()
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        response = None
+        try:
+            response = session.post(GROQ_API_URL, json=body, headers=headers, timeout=LLM_TIMEOUT)
+            if response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= LLM_MAX_RETRIES:
+                raise
+        if attempt >= LLM_MAX_RETRIES:
+            response.raise_for_status()
+        delay = _retry_delay(attempt, response)
+        status = response.status_code if response is not None else "connection error"
+        print(f"[llm_client] {status}, retrying in {delay:.1f}s (attempt {attempt + 1}/{LLM_MAX_RETRIES})")
+        METRICS.record_retry()
+        time.sleep(delay)
+
+
+def llm_call(prompt, max_tokens=800, parse_json=True, use_cache=True):
     """
     Calls Groq Cloud API with a system + user prompt.
     Returns the model's textual response or parsed JSON.
+
+    Identical requests (model, system prompt, prompt, max_tokens,
+    temperature) are answered from LLM_CACHE unless use_cache is False.
     """
+    cache_key = None
+    if use_cache and LLM_CACHE is not None:
+        cache_key = make_cache_key(GROQ_MODEL, SYSTEM_PROMPT, prompt, max_tokens, LLM_TEMPERATURE)
+        cached = LLM_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
     if not GROQ_API_KEY:
         raise RuntimeError("GROQ_API_KEY not set in .env")
 
-    url = "https://api.groq.com/openai/v1/chat/completions"
     headers = {
         "Authorization": f"Bearer {GROQ_API_KEY}",
         "Content-Type": "application/json",
@@ -25,18 +164,25 @@ def llm_call(prompt, max_tokens=800, parse_json=True):
     body = {
         "model": GROQ_MODEL,
         "messages": [
-            {"role": "system", "content": "You are an educational assistant that helps create structured knowledge graphs for grade 9–12 science topics."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
         "max_tokens": max_tokens,
-        "temperature": 0.2,
+        "temperature": LLM_TEMPERATURE,
         "response_format": {"type": "json_object"}  # This forces JSON output
     }
 
+    content = None
+    start = time.perf_counter()
     try:
-        r = requests.post(url, json=body, headers=headers, timeout=60)
-        r.raise_for_status()
+        r = _post_with_retries(body, headers)
         j = r.json()
+        METRICS.record_call(time.perf_counter() - start, j.get("usage"))
+    except Exception as e:
+        METRICS.record_call(time.perf_counter() - start, failed=True)
+        raise RuntimeError(f"LLM request failed: {e}") from e
+
+    try:
         content = j["choices"][0]["message"]["content"].strip()
         # print("LLM raw response:", content)
         
@@ -53,11 +199,13 @@ def llm_call(prompt, max_tokens=800, parse_json=True):
         # Parse JSON
         data = json.loads(txt)
         print("LLM parsed data type:", type(data))
-        
-        return data
     except Exception as e:
         raise RuntimeError(f"Failed to parse LLM response: {content}") from e
 
+    if cache_key is not None:
+        LLM_CACHE.put(cache_key, data)
+    return data
+
 # # Alternative OpenRouter implementation (commented out)
 
 # OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
@@ -0,0 +1,126 @@
+# app/kg_pipeline/llm_stub_server.py
+"""
+Local stand-in for the Groq chat-completions endpoint, for exercising
+llm_client (pooling, retries, metrics) and the pipeline without network access.
+
+Usage (from backend/):
+    python -m app.kg_pipeline.llm_stub_server --port 8765 --fail-every 5 --delay 0.2
+
+then point the client at it:
+    GROQ_API_URL=http://127.0.0.1:8765/openai/v1/chat/completions GROQ_API_KEY=stub
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def canned_response(prompt):
+    """Return a plausible JSON payload for each kind of prompt the pipeline sends."""
+    if '"quiz"' in prompt:
+        return {"quiz": [
+            {
+                "question": f"Stub question {i + 1}?",
+                "options": ["A", "B", "C", "D"],
+                "correct_answer": "A",
+                "category": "what",
+                "explanation": "Stub explanation."
+            }
+            for i in range(10)
+        ]}
+    if '"is_relevant"' in prompt:
+        return {"is_relevant": True, "confidence": 0.9, "reason": "Stub verdict", "educational_quality": "high"}
+    if '"is_valid"' in prompt:
+        query = prompt.split('Query: "', 1)[-1].split('"', 1)[0]
+        return {"is_valid": True, "subject": "Physics", "difficulty_level": "Basic",
+                "reason": "Stub verdict", "suggested_query": query}
+    return {
+        "subtopics": ["Stub Subtopic A", "Stub Subtopic B"],
+        "prerequisites": ["Stub Prerequisite"],
+        "objectives": ["Understand the stub"],
+        "difficulty_level": "base",
+        "keywords": ["stub"],
+        "estimated_hours": 2
+    }
+
+
+class StubState:
+    def __init__(self, fail_every=0, retry_after=1, delay=0.0):
+        self.fail_every = fail_every
+        self.retry_after = retry_after
+        self.delay = delay
+        self.requests = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    state = None
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        with self.state.lock:
+            self.state.requests += 1
+            n = self.state.requests
+            self.state.connections.add(self.client_address)
+
+        if self.state.delay:
+            time.sleep(self.state.delay)
+
+        if self.state.fail_every and n % self.state.fail_every == 0:
+            return self._send(429, {"error": {"message": "rate limited (stub)"}},
+                              {"Retry-After": str(self.state.retry_after)})
+
+        prompt = next((m["content"] for m in body.get("messages", []) if m.get("role") == "user"), "")
+        content = json.dumps(canned_response(prompt))
+        self._send(200, {
+            "id": f"stub-{n}",
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4
+            }
+        })
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def make_server(port=8765, fail_every=0, retry_after=1, delay=0.0):
+    """Create (but do not start) a stub server; handy for starting in a background thread."""
+    handler = type("Handler", (ChatCompletionsHandler,), {"state": StubState(fail_every, retry_after, delay)})
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds of simulated latency per request")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.fail_every, args.retry_after, args.delay)
+    print(f"[llm_stub] Listening on http://127.0.0.1:{args.port}/openai/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        state = server.RequestHandlerClass.state
+        print(f"\n[llm_stub] {state.requests} requests over {len(state.connections)} connections")
@@ -0,0 +1,182 @@
+# app/kg_pipeline/prewarm.py
+"""
+Prepare video, transcript, validation and quiz for knowledge-graph nodes
+ahead of time, so students never wait on the first click.
+
+Usage (from backend/):
+    python -m app.kg_pipeline.prewarm [--subject Physics] [--level base] [--workers 4]
+                                      [--num-questions 10] [--restart] [--limit N]
+
+Progress is checkpointed to prewarm_checkpoint.jsonl; re-running resumes
+with the nodes that are not complete yet.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app.models import KnowledgeGraphNode
+from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz, get_cached_topic_content
+from app.kg_pipeline.relevance import PREFILTER_METRICS
+from app.db import *
+
+CHECKPOINT_FILE = os.path.join(os.path.dirname(__file__), "prewarm_checkpoint.jsonl")
+
+
+class Checkpoint:
+    """Append-only record of finished nodes (latest line per code wins)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self.done[record["code"]] = record
+                    except (ValueError, KeyError):
+                        continue  # partial line from an interrupted run
+
+    def is_complete(self, code):
+        return self.done.get(code, {}).get("complete", False)
+
+    def record(self, record):
+        with self._lock:
+            self.done[record["code"]] = record
+            # Terminate a partial last line left by an interrupted run, so this
+            # record is not joined onto it (and dropped with it) on load
+            partial = False
+            if os.path.exists(self.path) and os.path.getsize(self.path):
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    partial = f.read(1) != b"\n"
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(("\n" if partial else "") + json.dumps(record) + "\n")
+
+
+class StageStats:
+    """Accumulates time spent per pipeline stage across worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = Counter()
+        self.seconds = defaultdict(float)
+
+    def add_timeline(self, timeline):
+        # timeline: [(stage, t), ...] ending with ("end", t); each stage lasts until the next event
+        with self._lock:
+            for (stage, t0), (_, t1) in zip(timeline, timeline[1:]):
+                self.count[stage] += 1
+                self.seconds[stage] += t1 - t0
+
+    def report(self, elapsed):
+        lines = [f"  {'stage':<18}{'runs':>6}{'total s':>10}{'avg s':>9}{'per min':>9}"]
+        for stage, n in self.count.most_common():
+            total = self.seconds[stage]
+            lines.append(f"  {stage:<18}{n:>6}{total:>10.1f}{total / n:>9.2f}{n / elapsed * 60:>9.1f}")
+        return "\n".join(lines)
+
+
+def prewarm_node(code, num_questions=10, validate_with_llm=True):
+    """
+    Prepare content for one node.
+
+    Returns:
+        (record dict for the checkpoint, [(stage, timestamp), ...])
+    """
+    timeline = [("cache_check", time.perf_counter())]
+    cached = get_cached_topic_content(code, num_questions, validate_with_llm=validate_with_llm)
+    if cached:
+        timeline.append(("end", time.perf_counter()))
+        return {"code": code, "complete": True, "video_status": "found_existing", "quiz_status": "database"}, timeline
+
+    def progress(stage, message):
+        timeline.append((stage, time.perf_counter()))
+
+    result = get_video_transcript_and_quiz(
+        code, num_questions=num_questions, validate_with_llm=validate_with_llm, progress=progress
+    )
+    timeline.append(("end", time.perf_counter()))
+    return {
+        "code": code,
+        "complete": bool(result.get("transcript") and result.get("quiz")),
+        "video_status": result.get("video_status"),
+        "quiz_status": result.get("quiz_status"),
+        "youtube_id": result.get("youtube_id"),
+        "num_questions": result.get("num_questions", 0)
+    }, timeline
+
+
+def prewarm_nodes(subject=None, difficulty_level=None, workers=4, num_questions=10,
+                  validate_with_llm=True, checkpoint_file=CHECKPOINT_FILE, restart=False, limit=None):
+    """
+    Pre-warm every matching node with bounded parallelism, resuming from the checkpoint.
+
+    Returns:
+        (Counter of complete/incomplete nodes, StageStats of this run)
+    """
+    query = {}
+    if subject:
+        query["subject"] = subject.strip().title()
+    if difficulty_level:
+        query["difficulty_level"] = difficulty_level
+    codes = list(KnowledgeGraphNode.objects(**query).order_by("code").scalar("code"))
+
+    if restart and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    checkpoint = Checkpoint(checkpoint_file)
+    todo = [c for c in codes if c and not checkpoint.is_complete(c)]
+    if limit:
+        todo = todo[:limit]
+
+    print(f"[prewarm] {len(codes)} nodes matched, {len(codes) - len(todo)} already complete, {len(todo)} to prepare")
+    stats = StageStats()
+    outcomes = Counter()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(prewarm_node, code, num_questions, validate_with_llm): code for code in todo}
+        for i, future in enumerate(as_completed(futures), start=1):
+            code = futures[future]
+            try:
+                record, timeline = future.result()
+                stats.add_timeline(timeline)
+            except Exception as e:
+                record = {"code": code, "complete": False, "error": str(e)}
+            checkpoint.record(record)
+            outcomes["complete" if record["complete"] else "incomplete"] += 1
+            print(f"[prewarm] ({i}/{len(todo)}) {code}: "
+                  f"{'✅' if record['complete'] else '⚠️'} {record.get('error') or record.get('video_status')}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n[prewarm] Done in {elapsed:.1f}s: {outcomes['complete']} complete, {outcomes['incomplete']} incomplete "
+          f"({len(todo) / elapsed * 60 if elapsed else 0:.1f} nodes/min)")
+    print(stats.report(elapsed or 1.0))
+    print(f"[prewarm] Transcript pre-filter: {PREFILTER_METRICS.snapshot()}")
+    return outcomes, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subject")
+    parser.add_argument("--level", help="difficulty_level, e.g. base or level_1")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--num-questions", type=int, default=10)
+    parser.add_argument("--no-validate", action="store_true", help="skip LLM transcript validation")
+    parser.add_argument("--restart", action="store_true", help="ignore the existing checkpoint")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    prewarm_nodes(
+        subject=args.subject,
+        difficulty_level=args.level,
+        workers=args.workers,
+        num_questions=args.num_questions,
+        validate_with_llm=not args.no_validate,
+        restart=args.restart,
+        limit=args.limit
+    )
@@ -0,0 +1,158 @@
+# app/kg_pipeline/relevance.py
+import os
+import re
+import threading
+from collections import Counter
+
+# Thresholds below which a transcript is rejected without an LLM call
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "true").lower() == "true"
+PREFILTER_MIN_COVERAGE = float(os.getenv("PREFILTER_MIN_COVERAGE", "0.15"))   # weighted share of topic terms found
+PREFILTER_MIN_DENSITY = float(os.getenv("PREFILTER_MIN_DENSITY", "2.0"))      # topic-term hits per 1000 tokens
+PREFILTER_MIN_BM25 = float(os.getenv("PREFILTER_MIN_BM25", "4.0"))            # best-chunk BM25 score
+
+# Weight of each node field in the topic profile
+FIELD_WEIGHTS = {"title": 3.0, "keywords": 2.0, "objectives": 1.0}
+
+CHUNK_TOKENS = 200
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just let like me more most my no nor not now of off on once only or other our ours out
+over own really right same she should so some such than that the their theirs them then there these they this those
+through to too um uh under until up very was we well were what when where which while who whom why will with would
+yeah you your yours understand learn learning students student explain describe identify apply topic basic
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def stem(token):
+    """Very light suffix stripping so 'forces'/'force' and 'reactions'/'reaction' match."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [stem(t) for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def topic_profile(title, keywords=None, objectives=None):
+    """Weighted query vector {term: weight} built from a node's title, keywords and objectives."""
+    profile = Counter()
+    fields = {"title": [title], "keywords": keywords or [], "objectives": objectives or []}
+    for field, values in fields.items():
+        for term in set(tokenize(" ".join(v for v in values if v))):
+            profile[term] = max(profile[term], FIELD_WEIGHTS[field])
+    return profile
+
+
+def chunk_matrix(tokens, chunk_size=CHUNK_TOKENS):
+    """Sparse chunk × term matrix (one Counter per chunk of `chunk_size` tokens)."""
+    return [Counter(tokens[i:i + chunk_size]) for i in range(0, len(tokens), chunk_size)] or [Counter()]
+
+
+def bm25_best_chunk(profile, matrix):
+    """
+    Highest BM25 score of the weighted topic profile against any transcript
+    chunk. The profile weights take the place of IDF: an IDF over the
+    transcript's own chunks is lowest for the terms a lecture keeps coming
+    back to, so an entirely on-topic video would score lowest. Each distinct
+    profile term found once in an average-length chunk adds about its weight.
+    """
+    n = len(matrix)
+    lengths = [sum(c.values()) for c in matrix]
+    avg_len = (sum(lengths) / n) or 1.0
+    best = 0.0
+    for chunk, length in zip(matrix, lengths):
+        score = 0.0
+        for term, weight in profile.items():
+            tf = chunk.get(term, 0)
+            if not tf:
+                continue
+            score += weight * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_len))
+        best = max(best, score)
+    return best
+
+
+class PrefilterMetrics:
+    """How many transcripts the pre-filter checked, rejected (LLM calls avoided) and passed."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.rejected = 0
+
+    def record(self, rejected):
+        with self._lock:
+            self.checked += 1
+            self.rejected += int(rejected)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "llm_calls_avoided": self.rejected,
+                "passed_to_llm": self.checked - self.rejected,
+            }
+
+
+PREFILTER_METRICS = PrefilterMetrics()
+
+
+def score_transcript(transcript_text, title, keywords=None, objectives=None):
+    """
+    Score how much a transcript is about a topic, locally.
+
+    Returns:
+        dict with 'coverage' (weighted share of topic terms present, 0-1),
+        'density' (topic-term occurrences per 1000 tokens) and 'bm25'
+        (best chunk score)
+    """
+    profile = topic_profile(title, keywords, objectives)
+    tokens = tokenize(transcript_text)
+    if not profile or not tokens:
+        return {"coverage": 0.0, "density": 0.0, "bm25": 0.0, "terms": len(profile)}
+
+    counts = Counter(tokens)
+    total_weight = sum(profile.values())
+    coverage = sum(w for term, w in profile.items() if term in counts) / total_weight
+    hits = sum(counts[term] for term in profile)
+    return {
+        "coverage": round(coverage, 3),
+        "density": round(hits / len(tokens) * 1000, 2),
+        "bm25": round(bm25_best_chunk(profile, chunk_matrix(tokens)), 3),
+        "terms": len(profile),
+    }
+
+
+def prefilter_transcript(transcript_text, title, keywords=None, objectives=None,
+                         min_coverage=None, min_density=None, min_bm25=None):
+    """
+    Decide whether a transcript is clearly off-topic without asking the LLM.
+
+    Returns:
+        (passed: bool, scores: dict, reason: str)
+    """
+    min_coverage = PREFILTER_MIN_COVERAGE if min_coverage is None else min_coverage
+    min_density = PREFILTER_MIN_DENSITY if min_density is None else min_density
+    min_bm25 = PREFILTER_MIN_BM25 if min_bm25 is None else min_bm25
+
+    scores = score_transcript(transcript_text, title, keywords, objectives)
+    failures = []
+    if scores["coverage"] < min_coverage:
+        failures.append(f"coverage {scores['coverage']} < {min_coverage}")
+    if scores["density"] < min_density:
+        failures.append(f"density {scores['density']} < {min_density}")
+    if scores["bm25"] < min_bm25:
+        failures.append(f"bm25 {scores['bm25']} < {min_bm25}")
+
+    passed = not failures or scores["terms"] == 0
+    PREFILTER_METRICS.record(rejected=not passed)
+    reason = "Local pre-filter passed" if passed else f"Local pre-filter: off-topic ({', '.join(failures)})"
+    return passed, scores, reason
@@ -4,6 +4,7 @@ from app.kg_pipeline.kg_builder import build_graph
 from app.kg_pipeline.visualizer import visualize_graph
 from app.kg_pipeline.uploader import upsert_topics
 from app.kg_pipeline.video_fetcher import attach_videos_to_nodes
+from app.kg_pipeline.prewarm import prewarm_nodes
 import json
 import networkx as nx
 
@@ -30,5 +31,10 @@ if __name__ == "__main__":
     # nodes is list of dicts returned by build_graph -> attach will update DB documents
     attach_videos_to_nodes(nodes, max_videos=2, search_max_results=6)
     print("Video attachment complete.")
+
+    # 4) Optionally prepare transcript, validation and quiz for every node now
+    if os.getenv("PREWARM_CONTENT", "false").lower() == "true":
+        print("Pre-warming topic content...")
+        prewarm_nodes(workers=int(os.getenv("PREWARM_WORKERS", "4")))
     
 
@@ -4,6 +4,7 @@ from datetime import datetime
 from pymongo import UpdateOne
 from backend.app.models_new import KnowledgeGraphNode
 from app.db import *
+from app.graph_state import bump_graph_version
 
 IN_FILE = os.path.join(os.path.dirname(__file__), "kg_final.json")
 
@@ -50,6 +51,7 @@ def upsert_topics():
         print(f"✅ Upload complete.")
         print(f"Inserted or updated {len(nodes)} nodes.")
         print(f"Upserted: {len(res.upserted_ids)}, Modified: {res.modified_count}")
+        bump_graph_version("upsert_topics")
     else:
         print("⚠️ No valid nodes found to upload.")
 
@@ -3,9 +3,10 @@ import os, time, hashlib
 from datetime import datetime
 from googleapiclient.discovery import build
 from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
-from app.models import KnowledgeGraphNode, VideoTranscript, TranscriptSegment
+from app.models import KnowledgeGraphNode, VideoTranscript
 from dotenv import load_dotenv
 from app.db import *
+from app.graph_state import bump_graph_version
 
 load_dotenv()
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
@@ -104,13 +105,6 @@ def attach_videos_to_nodes(nodes, max_videos=2, search_max_results=6, pause_betw
                 continue
 
             # Save transcript doc
-            segments = []
-            for seg in raw:
-                segments.append(TranscriptSegment(
-                    start=getattr(seg, "start", 0.0),
-                    duration=getattr(seg, "duration", 0.0),
-                    text=getattr(seg, "text", "").strip()
-                ))
             try:
                 vt = VideoTranscript.objects(youtube_id=youtube_id).first()
                 if not vt:
@@ -118,13 +112,13 @@ def attach_videos_to_nodes(nodes, max_videos=2, search_max_results=6, pause_betw
                         youtube_id=youtube_id,
                         kg_node = KnowledgeGraphNode.objects(code=code).first(),  # may be None for now
                         language="en",
-                        segments=segments,
                         fetched_at=datetime.utcnow()
                     )
+                    vt.set_segments(raw)
                     vt.save()
                 else:
                     # update segments if necessary
-                    vt.segments = segments
+                    vt.set_segments(raw)
                     vt.fetched_at = datetime.utcnow()
                     vt.save()
             except Exception as e:
@@ -150,3 +144,5 @@ def attach_videos_to_nodes(nodes, max_videos=2, search_max_results=6, pause_betw
             time.sleep(pause_between)  # be polite with API usage
 
         print(f"[video_fetcher] Added {added} videos for {code}")
+        if added:
+            bump_graph_version(f"attached videos to {code}")
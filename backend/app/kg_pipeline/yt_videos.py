@@ -1,22 +1,97 @@
 # app/kg_pipeline/smart_video_fetcher.py
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from googleapiclient.discovery import build
 from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
-from app.models import KnowledgeGraphNode, VideoTranscript, TranscriptSegment, Quiz, QuizQuestion
-from app.kg_pipeline.llm_client import llm_call
+from app.models import KnowledgeGraphNode, VideoTranscript, TranscriptValidation, Quiz, QuizQuestion
+from app.transcript_store import as_segments
+from app.kg_pipeline.llm_client import llm_call, GROQ_MODEL
+from app.kg_pipeline.relevance import PREFILTER_ENABLED, prefilter_transcript
 from dotenv import load_dotenv
 from app.db import *
+from app.graph_state import bump_graph_version
 
 load_dotenv()
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# How find_video_with_transcript evaluates search results: sequential | first_valid | best
+CANDIDATE_STRATEGIES = ("sequential", "first_valid", "best")
+VIDEO_CANDIDATE_STRATEGY = os.getenv("VIDEO_CANDIDATE_STRATEGY", "sequential")
+
 # Build client if key present
 YOUTUBE = None
 if YOUTUBE_API_KEY:
     YOUTUBE = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
 
 
+def report_progress(progress, stage, message):
+    """Forward a progress event to an optional progress(stage, message) callback."""
+    if progress:
+        progress(stage, message)
+
+
+class NodeResolution:
+    """
+    A code_or_topic resolved to its KG node once per request; the loaded
+    node is then passed down the video, transcript and quiz steps instead
+    of being looked up again by each of them.
+    """
+    __slots__ = ("query", "node", "matched_by")
+
+    def __init__(self, query, node=None, matched_by=None):
+        self.query = query
+        self.node = node
+        self.matched_by = matched_by  # "code" | "title" | "subject" | "created" | None
+
+    @classmethod
+    def resolve(cls, code_or_topic, include_subject=True):
+        """
+        Look the node up by code or title in one indexed query (a code match
+        wins), falling back to the first node of a subject of that name.
+        """
+        resolution = cls.from_matches(
+            code_or_topic, KnowledgeGraphNode.objects(__raw__=cls.match_filter(code_or_topic))
+        )
+        if resolution:
+            return resolution
+        if include_subject:
+            node = KnowledgeGraphNode.objects(subject=code_or_topic).first()
+            if node:
+                return cls(code_or_topic, node, "subject")
+        return cls(code_or_topic)
+
+    @staticmethod
+    def match_filter(code_or_topic):
+        """Query for the nodes whose code or title is code_or_topic."""
+        return {'$or': [{'code': code_or_topic}, {'title': code_or_topic}]}
+
+    @classmethod
+    def from_matches(cls, code_or_topic, nodes):
+        """The resolution among the nodes read with match_filter() (a code match wins), or None."""
+        for field in ("code", "title"):
+            for node in nodes:
+                if getattr(node, field) == code_or_topic:
+                    return cls(code_or_topic, node, field)
+        return None
+
+    def created(self, node):
+        """Record a node created while serving the request."""
+        self.node = node
+        self.matched_by = "code" if node.code == self.query else "title" if node.title == self.query else "created"
+
+    @property
+    def quiz_node(self):
+        """The node quizzes are linked to: only exact code or title matches, never a whole subject."""
+        return self.node if self.matched_by in ("code", "title") else None
+
+    @property
+    def topic_title(self):
+        """Title shown for the requested code (the code itself when it is not a node code)."""
+        return self.node.title if self.matched_by == "code" else self.query
+
+
 def validate_topic_search(query):
     """
     Use LLM to validate if the search query is a valid educational topic.
@@ -61,15 +136,21 @@ Examples of invalid topics: "random stuff", "xyz", "how to hack"
         }
 
 
-def validate_transcript_relevance(transcript_text, topic, youtube_id, min_length=500):
+def validate_transcript_relevance(transcript_text, topic, youtube_id, min_length=500, keywords=None, objectives=None,
+                                  force_revalidate=False):
     """
     Use LLM to check if the transcript is relevant to the topic and of educational quality.
+    Clearly off-topic transcripts are rejected by a local keyword pre-filter
+    (see relevance.py) before any LLM call is made.
     
     Args:
         transcript_text: The full transcript text
         topic: The topic/query we're searching for
         youtube_id: YouTube video ID
         min_length: Minimum transcript length in characters
+        keywords: KG node keywords used by the pre-filter (optional)
+        objectives: KG node learning objectives used by the pre-filter (optional)
+        force_revalidate: Ask the LLM again instead of reusing a cached response
     
     Returns:
         dict with 'is_relevant' (bool), 'confidence' (float 0-1), 'reason' (str)
@@ -83,6 +164,20 @@ def validate_transcript_relevance(transcript_text, topic, youtube_id, min_length
             'youtube_id': youtube_id
         }
     
+    # Cheap local pre-filter: skip the LLM for transcripts that barely mention the topic
+    if PREFILTER_ENABLED:
+        passed, scores, reason = prefilter_transcript(transcript_text, topic, keywords, objectives)
+        if not passed:
+            return {
+                'is_relevant': False,
+                'confidence': 0.0,
+                'reason': reason,
+                'educational_quality': 'low',
+                'youtube_id': youtube_id,
+                'prefilter': True,  # heuristic rejection, not an LLM verdict: never persisted
+                'prefilter_scores': scores
+            }
+    
     # Take first 2000 characters for LLM analysis (to save tokens)
     sample_text = transcript_text[:2000]
     
@@ -116,7 +211,7 @@ A transcript is NOT relevant if it's off-topic, too casual/entertainment-focused
 """
     
     try:
-        result = llm_call(prompt, max_tokens=400, parse_json=True)
+        result = llm_call(prompt, max_tokens=400, parse_json=True, use_cache=not force_revalidate)
         
         is_relevant = result.get('is_relevant', False)
         confidence = float(result.get('confidence', 0.0))
@@ -141,10 +236,67 @@ A transcript is NOT relevant if it's off-topic, too casual/entertainment-focused
             'confidence': 0.5,
             'reason': 'LLM validation failed, proceeding based on length check',
             'educational_quality': 'unknown',
-            'youtube_id': youtube_id
+            'youtube_id': youtube_id,
+            'llm_error': True  # not a real verdict, so never persisted
         }
 
 
+def is_llm_verdict(validation):
+    """Whether a validate_transcript_relevance() result is an LLM verdict worth storing."""
+    return not (validation.get('llm_error') or validation.get('prefilter'))
+
+
+def make_transcript_validation(validation, topic):
+    """Build the TranscriptValidation stored on a VideoTranscript from a validation result."""
+    return TranscriptValidation(
+        is_relevant=bool(validation.get('is_relevant')),
+        confidence=float(validation.get('confidence', 0.0)),
+        educational_quality=validation.get('educational_quality', 'unknown'),
+        reason=validation.get('reason', ''),
+        topic=topic,
+        model=GROQ_MODEL,
+        validated_at=datetime.now(timezone.utc)
+    )
+
+
+def get_transcript_validation(transcript_doc, full_text, topic, force_revalidate=False, keywords=None, objectives=None):
+    """
+    Return the relevance verdict for a stored transcript.
+
+    The verdict stored on the document is reused as long as it was produced
+    by the current model for the same topic; otherwise (or when
+    force_revalidate is set) the transcript is validated with the LLM and
+    the new verdict is persisted. Pre-filter rejections and LLM failures
+    are returned but not stored, so they are re-checked on the next read.
+    """
+    stored = transcript_doc.validation
+    if stored and not force_revalidate and stored.model == GROQ_MODEL and stored.topic == topic:
+        return {
+            'is_relevant': stored.is_relevant,
+            'confidence': stored.confidence,
+            'reason': stored.reason,
+            'educational_quality': stored.educational_quality,
+            'youtube_id': transcript_doc.youtube_id,
+            'validated_at': stored.validated_at,
+            'cached': True
+        }
+
+    validation = validate_transcript_relevance(
+        full_text, topic, transcript_doc.youtube_id, keywords=keywords, objectives=objectives,
+        force_revalidate=force_revalidate
+    )
+    if is_llm_verdict(validation):
+        verdict = make_transcript_validation(validation, topic)
+        VideoTranscript.objects(id=transcript_doc.id).update_one(
+            set__validation=verdict,
+            set__confidence=verdict.confidence
+        )
+        transcript_doc.validation = verdict
+        validation['validated_at'] = verdict.validated_at
+    validation['cached'] = False
+    return validation
+
+
 def search_multiple_videos(query, max_results=5):
     """Search for multiple videos on YouTube"""
     if not YOUTUBE:
@@ -172,121 +324,215 @@ def search_single_video(query, max_results=1):
     return videos[0] if videos else None
 
 
-def fetch_and_save_transcript(youtube_id, kg_node_code=None, topic=None, validate=True):
+def fetch_transcript(youtube_id):
     """
-    Fetch transcript for a video using YouTubeTranscriptApi().fetch(...) and save it to DB.
-    
-    Args:
-        youtube_id: YouTube video ID
-        kg_node_code: Knowledge graph node code (optional)
-        topic: Topic name for validation (optional but recommended)
-        validate: Whether to validate transcript relevance with LLM (default True)
+    Fetch a video's English transcript using YouTubeTranscriptApi().fetch(...).
     
     Returns:
-        dict with 'transcript' (str), 'is_valid' (bool), 'reason' (str) or None if failed
+        tuple: (segments [Segment], full_text str) or None if unavailable
     """
     try:
         # Use .fetch() which returns FetchedTranscriptSnippet objects
         ytt_api = YouTubeTranscriptApi()
         transcript_list = ytt_api.fetch(youtube_id, languages=['en'])
+    except (NoTranscriptFound, TranscriptsDisabled) as e:
+        print(f"[smart_fetcher] No transcript available for {youtube_id}: {e}")
+        return None
+    except Exception as e:
+        print(f"[smart_fetcher] Transcript fetch error for {youtube_id}: {e}")
+        return None
 
-        if not transcript_list:
-            return None
-
-        # Create TranscriptSegment objects and collect text parts
-        segments = []
-        full_text_parts = []
-
-        for item in transcript_list:
-            text = getattr(item, "text", "") or ""
-            start = getattr(item, "start", 0.0) or 0.0
-            duration = getattr(item, "duration", 0.0) or 0.0
+    if not transcript_list:
+        return None
 
-            seg = TranscriptSegment(
-                start=float(start),
-                duration=float(duration),
-                text=text.strip()
-            )
-            segments.append(seg)
-            full_text_parts.append(text.strip())
+    # Plain (start, duration, text) tuples; the document fields are built when saving
+    segments = as_segments(transcript_list)
 
-        # Join all text segments
-        full_transcript_text = " ".join([p for p in full_text_parts if p])
+    # Join all text segments
+    return segments, " ".join([seg.text for seg in segments if seg.text])
 
-        # LLM Validation Check - MUST PASS before saving to DB
-        validation_result = None
-        if validate and topic:
-            print(f"[smart_fetcher] Validating transcript relevance for topic: {topic}")
-            validation_result = validate_transcript_relevance(full_transcript_text, topic, youtube_id)
-            
-            if not validation_result['is_relevant']:
-                print(f"[smart_fetcher] Transcript validation FAILED - NOT saving to DB: {validation_result['reason']}")
-                return {
-                    'transcript': None,
-                    'is_valid': False,
-                    'reason': validation_result['reason'],
-                    'confidence': validation_result.get('confidence', 0.0)
-                }
-            else:
-                print(f"[smart_fetcher] Transcript validation PASSED - proceeding to save in DB")
-        
-        # Save to database ONLY after validation passes (or if validation is disabled)
-        try:
-            existing_transcript = VideoTranscript.objects(youtube_id=youtube_id).first()
 
-            kg_node = None
-            if kg_node_code:
-                kg_node = KnowledgeGraphNode.objects(code=kg_node_code).first()
+def save_transcript(youtube_id, segments, full_transcript_text, kg_node_code=None, topic=None, validation_result=None,
+                    kg_node=None):
+    """
+    Save a fetched (and, if validation_result is given, validated) transcript to DB.
+    The node is looked up by kg_node_code unless the loaded kg_node is passed.
+    
+    Returns:
+        dict with 'transcript', 'is_valid', 'reason', 'confidence', 'educational_quality'
+    """
+    try:
+        # Segments are overwritten, so the stored ones need not be loaded
+        existing_transcript = VideoTranscript.without_segments().filter(youtube_id=youtube_id).first()
 
-            if existing_transcript:
-                existing_transcript.segments = segments
-                existing_transcript.full_text = full_transcript_text
-                if kg_node:
-                    existing_transcript.kg_node = kg_node
-                existing_transcript.fetched_at = datetime.now(timezone.utc)
-                existing_transcript.save()
-                print(f"[smart_fetcher] Updated existing transcript in DB for video {youtube_id}")
-            else:
-                new_transcript = VideoTranscript(
-                    youtube_id=youtube_id,
-                    kg_node=kg_node,
-                    language="en",
-                    segments=segments,
-                    full_text=full_transcript_text,
-                    fetched_at=datetime.now(timezone.utc)
-                )
-                new_transcript.save()
-                print(f"[smart_fetcher] Saved new transcript to DB for video {youtube_id}")
+        if kg_node is None and kg_node_code:
+            kg_node = KnowledgeGraphNode.objects(code=kg_node_code).first()
 
-        except Exception as e:
-            print(f"[smart_fetcher] Database save error: {e}")
-            # Even if DB save fails, return the validated transcript
-            return {
-                'transcript': full_transcript_text,
-                'is_valid': True,
-                'reason': f"Validation passed but DB save failed: {str(e)}",
-                'confidence': validation_result.get('confidence', 1.0) if validation_result else 1.0,
-                'educational_quality': validation_result.get('educational_quality', 'unknown') if validation_result else 'unknown'
-            }
+        verdict = None
+        if validation_result and is_llm_verdict(validation_result):
+            verdict = make_transcript_validation(validation_result, topic)
+
+        if existing_transcript:
+            existing_transcript.set_segments(segments)
+            if kg_node:
+                existing_transcript.kg_node = kg_node
+            if verdict:
+                existing_transcript.validation = verdict
+                existing_transcript.confidence = verdict.confidence
+            existing_transcript.fetched_at = datetime.now(timezone.utc)
+            existing_transcript.save()
+            print(f"[smart_fetcher] Updated existing transcript in DB for video {youtube_id}")
+        else:
+            new_transcript = VideoTranscript(
+                youtube_id=youtube_id,
+                kg_node=kg_node,
+                language="en",
+                validation=verdict,
+                confidence=verdict.confidence if verdict else None,
+                fetched_at=datetime.now(timezone.utc)
+            )
+            new_transcript.set_segments(segments)
+            new_transcript.save()
+            print(f"[smart_fetcher] Saved new transcript to DB for video {youtube_id}")
 
-        # Return success with validation info
+    except Exception as e:
+        print(f"[smart_fetcher] Database save error: {e}")
+        # Even if DB save fails, return the validated transcript
         return {
             'transcript': full_transcript_text,
             'is_valid': True,
-            'reason': validation_result['reason'] if validation_result else 'Transcript fetched successfully (validation disabled)',
+            'reason': f"Validation passed but DB save failed: {str(e)}",
             'confidence': validation_result.get('confidence', 1.0) if validation_result else 1.0,
             'educational_quality': validation_result.get('educational_quality', 'unknown') if validation_result else 'unknown'
         }
 
-    except (NoTranscriptFound, TranscriptsDisabled) as e:
-        print(f"[smart_fetcher] No transcript available for {youtube_id}: {e}")
+    # Return success with validation info
+    return {
+        'transcript': full_transcript_text,
+        'is_valid': True,
+        'reason': validation_result['reason'] if validation_result else 'Transcript fetched successfully (validation disabled)',
+        'confidence': validation_result.get('confidence', 1.0) if validation_result else 1.0,
+        'educational_quality': validation_result.get('educational_quality', 'unknown') if validation_result else 'unknown'
+    }
+
+
+def rejected_transcript(validation_result):
+    """Result returned for a transcript that failed validation (and was not saved)."""
+    return {
+        'transcript': None,
+        'is_valid': False,
+        'reason': validation_result['reason'],
+        'confidence': validation_result.get('confidence', 0.0)
+    }
+
+
+def fetch_and_save_transcript(youtube_id, kg_node_code=None, topic=None, validate=True, keywords=None, objectives=None,
+                              kg_node=None):
+    """
+    Fetch transcript for a video using YouTubeTranscriptApi().fetch(...) and save it to DB.
+    
+    Args:
+        youtube_id: YouTube video ID
+        kg_node_code: Knowledge graph node code (optional)
+        topic: Topic name for validation (optional but recommended)
+        validate: Whether to validate transcript relevance with LLM (default True)
+        keywords, objectives: KG node terms for the relevance pre-filter (optional)
+        kg_node: Already loaded KG node (saves looking it up by kg_node_code)
+    
+    Returns:
+        dict with 'transcript' (str), 'is_valid' (bool), 'reason' (str) or None if failed
+    """
+    fetched = fetch_transcript(youtube_id)
+    if not fetched:
         return None
-    except Exception as e:
-        print(f"[smart_fetcher] Transcript fetch error for {youtube_id}: {e}")
+    segments, full_transcript_text = fetched
+
+    # LLM Validation Check - MUST PASS before saving to DB
+    validation_result = None
+    if validate and topic:
+        print(f"[smart_fetcher] Validating transcript relevance for topic: {topic}")
+        validation_result = validate_transcript_relevance(
+            full_transcript_text, topic, youtube_id, keywords=keywords, objectives=objectives
+        )
+        
+        if not validation_result['is_relevant']:
+            print(f"[smart_fetcher] Transcript validation FAILED - NOT saving to DB: {validation_result['reason']}")
+            return rejected_transcript(validation_result)
+        else:
+            print(f"[smart_fetcher] Transcript validation PASSED - proceeding to save in DB")
+    
+    # Save to database ONLY after validation passes (or if validation is disabled)
+    return save_transcript(youtube_id, segments, full_transcript_text, kg_node_code, topic, validation_result, kg_node)
+
+
+def evaluate_candidate(youtube_id, topic, validate, cancelled, keywords=None, objectives=None):
+    """
+    Fetch and (optionally) validate one candidate video without saving it.
+    Skips remaining work once `cancelled` (a threading.Event) is set.
+    
+    Returns:
+        dict with 'youtube_id', 'segments', 'full_text', 'validation' or None if rejected
+    """
+    if cancelled.is_set():
+        return None
+    fetched = fetch_transcript(youtube_id)
+    if not fetched or cancelled.is_set():
+        return None
+    segments, full_text = fetched
+
+    validation = None
+    if validate and topic:
+        validation = validate_transcript_relevance(full_text, topic, youtube_id, keywords=keywords, objectives=objectives)
+        if not validation['is_relevant']:
+            print(f"[smart_fetcher] Video {youtube_id} rejected: {validation['reason']}")
+            return None
+    return {'youtube_id': youtube_id, 'segments': segments, 'full_text': full_text, 'validation': validation}
+
+
+def evaluate_candidates_concurrently(video_ids, topic, validate, strategy="first_valid", max_workers=None,
+                                     keywords=None, objectives=None):
+    """
+    Fetch and validate candidate videos concurrently.
+    
+    Args:
+        strategy: "first_valid" returns the first candidate to pass and cancels
+                  outstanding work; "best" evaluates all candidates and returns
+                  the one with the highest validation confidence (ties go to the
+                  higher-ranked search result)
+    
+    Returns:
+        dict from evaluate_candidate() or None
+    """
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(video_ids))
+    futures = {
+        executor.submit(evaluate_candidate, youtube_id, topic, validate, cancelled, keywords, objectives): rank
+        for rank, youtube_id in enumerate(video_ids)
+    }
+    passed = []
+    try:
+        for future in as_completed(futures):
+            candidate = future.result()
+            if not candidate:
+                continue
+            if strategy == "first_valid":
+                cancelled.set()
+                return candidate
+            passed.append((futures[future], candidate))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not passed:
         return None
+    rank, best = max(
+        passed,
+        key=lambda item: ((item[1]['validation'] or {}).get('confidence', 0.0), -item[0])
+    )
+    return best
 
 
-def find_video_with_transcript(search_query, max_videos=5, kg_node_code=None, validate_with_llm=True):
+def find_video_with_transcript(search_query, max_videos=5, kg_node_code=None, validate_with_llm=True, progress=None,
+                               strategy=None, keywords=None, objectives=None, kg_node=None, topic=None):
     """
     Search for videos and return the first one that has a valid transcript.
     
@@ -295,12 +541,28 @@ def find_video_with_transcript(search_query, max_videos=5, kg_node_code=None, va
         max_videos: Maximum number of videos to try
         kg_node_code: KG node code (optional)
         validate_with_llm: Whether to validate with LLM (default True)
+        progress: Optional progress(stage, message) callback
+        strategy: How candidates are evaluated (default VIDEO_CANDIDATE_STRATEGY):
+                  "sequential" tries them one after another in search order,
+                  "first_valid" / "best" evaluate them concurrently
+                  (see evaluate_candidates_concurrently)
+        keywords, objectives: KG node terms for the relevance pre-filter (optional)
+        kg_node: Already loaded KG node the transcript is linked to (optional)
+        topic: Topic candidates are validated against and their verdicts are
+               stored under (default: search_query as given). Pass the KG node
+               title, which is what readers compare stored verdicts with.
     
     Returns:
         tuple: (youtube_id, transcript_text, validation_info) or (None, None, None)
     """
+    topic = topic or search_query
+    strategy = strategy or VIDEO_CANDIDATE_STRATEGY
+    if strategy not in CANDIDATE_STRATEGIES:
+        raise ValueError(f"Unknown candidate strategy: {strategy} (expected one of {CANDIDATE_STRATEGIES})")
+
     # First, validate the search query with LLM
     if validate_with_llm:
+        report_progress(progress, 'validating_topic', f"Validating search query: {search_query}")
         print(f"[smart_fetcher] Validating search query: {search_query}")
         topic_validation = validate_topic_search(search_query)
         
@@ -313,19 +575,42 @@ def find_video_with_transcript(search_query, max_videos=5, kg_node_code=None, va
             print(f"[smart_fetcher] Using improved query: {topic_validation['suggested_query']}")
             search_query = topic_validation['suggested_query']
     
+    report_progress(progress, 'searching', f"Searching YouTube for: {search_query}")
     video_ids = search_multiple_videos(search_query, max_results=max_videos)
     
     if not video_ids:
         print(f"[smart_fetcher] No videos found for query: {search_query}")
         return None, None, None
     
-    for youtube_id in video_ids:
+    if strategy != "sequential":
+        report_progress(progress, 'checking_video', f"Checking {len(video_ids)} videos concurrently ({strategy})")
+        candidate = evaluate_candidates_concurrently(
+            video_ids, topic, validate_with_llm, strategy, keywords=keywords, objectives=objectives
+        )
+        if candidate:
+            youtube_id = candidate['youtube_id']
+            result = save_transcript(
+                youtube_id, candidate['segments'], candidate['full_text'],
+                kg_node_code=kg_node_code, topic=topic, validation_result=candidate['validation'],
+                kg_node=kg_node
+            )
+            print(f"[smart_fetcher] Found valid video with transcript: {youtube_id}")
+            print(f"[smart_fetcher] Confidence: {result['confidence']}, Quality: {result.get('educational_quality', 'N/A')}")
+            return youtube_id, result['transcript'], result
+        print(f"[smart_fetcher] No valid video with transcript found after trying {len(video_ids)} videos")
+        return None, None, None
+    
+    for i, youtube_id in enumerate(video_ids, start=1):
         print(f"[smart_fetcher] Trying video: {youtube_id}")
+        report_progress(progress, 'checking_video', f"Checking video {i}/{len(video_ids)}: {youtube_id}")
         result = fetch_and_save_transcript(
             youtube_id, 
             kg_node_code=kg_node_code, 
-            topic=search_query,
-            validate=validate_with_llm
+            topic=topic,
+            validate=validate_with_llm,
+            keywords=keywords,
+            objectives=objectives,
+            kg_node=kg_node
         )
         
         if result and result['is_valid'] and result['transcript']:
@@ -340,13 +625,17 @@ def find_video_with_transcript(search_query, max_videos=5, kg_node_code=None, va
     return None, None, None
 
 
-def get_video_and_transcript(code_or_topic, validate_with_llm=True):
+def get_video_and_transcript(code_or_topic, validate_with_llm=True, force_revalidate=False, progress=None,
+                             resolution=None):
     """
     Main function to get video URL and transcript for a given topic code or name.
     
     Args:
         code_or_topic: Either a KG node code (e.g., "PHY_BASE") or topic name
         validate_with_llm: Whether to use LLM validation (default True)
+        force_revalidate: Re-run LLM validation even if a stored verdict exists
+        progress: Optional progress(stage, message) callback
+        resolution: NodeResolution for code_or_topic, if the caller already resolved it
     
     Returns:
         dict: {
@@ -359,54 +648,46 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
         }
     """
     
-    # Step 1: Search for the node in database
-    # Try to find node by code OR by title/subject (match either field)
-    try:
-        kg_node = KnowledgeGraphNode.objects(__raw__={
-            '$or': [
-                {'code': code_or_topic},
-                {'title': code_or_topic},
-                {'subject': code_or_topic}
-            ]
-        }).first()
-
-    except Exception:
-        # Fallback: try sequential queries if __raw__ isn't supported
-        kg_node = KnowledgeGraphNode.objects(code=code_or_topic).first() \
-                  or KnowledgeGraphNode.objects(title=code_or_topic).first() \
-                  or KnowledgeGraphNode.objects(subject=code_or_topic).first()
-    
-    if not kg_node:
-        kg_node = KnowledgeGraphNode.objects(title=code_or_topic).first()
-        if not kg_node:
-            kg_node = KnowledgeGraphNode.objects(subject=code_or_topic).first()
+    # Step 1: Search for the node in database (by code, title or subject)
+    resolution = resolution or NodeResolution.resolve(code_or_topic)
+    kg_node = resolution.node
     
     # Case 1: Node exists and has videos
     print("\n**********Case 1: Knowledge Graph Node and video exsits...**********")
     if kg_node and kg_node.videos and len(kg_node.videos) > 0:
         # Try each video in the list until we find one with a valid transcript
         for youtube_id in kg_node.videos:
-            existing_transcript = VideoTranscript.objects(youtube_id=youtube_id).first()
+            # Text and verdict only: the stored full_text is the transcript, segments are not needed
+            existing_transcript = VideoTranscript.without_segments().filter(youtube_id=youtube_id).first()
+            full_text = existing_transcript.get_full_text() if existing_transcript else None
             
-            if existing_transcript and existing_transcript.segments:
-                full_text = ' '.join([seg.text for seg in existing_transcript.segments])
-                
-                # Validate existing transcript if requested
+            if full_text:
+                # Validate existing transcript if requested (stored verdicts are reused)
+                validation = None
                 if validate_with_llm:
                     topic = kg_node.title or code_or_topic
-                    validation = validate_transcript_relevance(full_text, topic, youtube_id)
+                    validation = get_transcript_validation(
+                        existing_transcript, full_text, topic, force_revalidate=force_revalidate,
+                        keywords=kg_node.keywords, objectives=kg_node.objectives
+                    )
                     
                     if not validation['is_relevant']:
                         print(f"[smart_fetcher] Existing transcript invalid: {validation['reason']}")
                         continue  # Try next video
+                elif existing_transcript.validation:
+                    # Not validating now: report the last stored verdict as-is
+                    validation = {
+                        'confidence': existing_transcript.validation.confidence,
+                        'educational_quality': existing_transcript.validation.educational_quality
+                    }
                 
                 return {
                     'youtube_id': youtube_id,
                     'youtube_url': f'https://www.youtube.com/watch?v={youtube_id}',
                     'transcript': full_text,
                     'status': 'found_existing',
-                    'confidence': 1.0,
-                    'educational_quality': 'validated'
+                    'confidence': validation['confidence'] if validation else 0.0,
+                    'educational_quality': validation['educational_quality'] if validation else 'unvalidated'
                 }
             else:
                 # Try to fetch transcript
@@ -415,7 +696,10 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
                     youtube_id, 
                     kg_node_code=kg_node.code,
                     topic=topic,
-                    validate=validate_with_llm
+                    validate=validate_with_llm,
+                    keywords=kg_node.keywords,
+                    objectives=kg_node.objectives,
+                    kg_node=kg_node
                 )
                 
                 if result and result['is_valid'] and result['transcript']:
@@ -435,12 +719,18 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
             search_query, 
             max_videos=5, 
             kg_node_code=kg_node.code,
-            validate_with_llm=validate_with_llm
+            validate_with_llm=validate_with_llm,
+            progress=progress,
+            keywords=kg_node.keywords,
+            objectives=kg_node.objectives,
+            kg_node=kg_node,
+            topic=kg_node.title or code_or_topic
         )
         
         if youtube_id:
             kg_node.videos.append(youtube_id)
             kg_node.save()
+            bump_graph_version(f"attached video to {kg_node.code}")
             
             return {
                 'youtube_id': youtube_id,
@@ -468,7 +758,12 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
             search_query, 
             max_videos=5, 
             kg_node_code=kg_node.code,
-            validate_with_llm=validate_with_llm
+            validate_with_llm=validate_with_llm,
+            progress=progress,
+            keywords=kg_node.keywords,
+            objectives=kg_node.objectives,
+            kg_node=kg_node,
+            topic=kg_node.title or code_or_topic
         )
         
         if not youtube_id:
@@ -485,6 +780,7 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
             kg_node.videos = []
         kg_node.videos.append(youtube_id)
         kg_node.save()
+        bump_graph_version(f"attached video to {kg_node.code}")
         
         return {
             'youtube_id': youtube_id,
@@ -509,7 +805,9 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
             topic_name, 
             max_videos=5, 
             kg_node_code=None,
-            validate_with_llm=validate_with_llm
+            validate_with_llm=validate_with_llm,
+            progress=progress,
+            topic=topic_name    # title of the node created below
         )
     
         if not youtube_id:
@@ -534,6 +832,8 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
             )
             new_node.save()
             print(f"[smart_fetcher] Created new KG node for topic: {topic_name}")
+            bump_graph_version(f"created node {new_node.code}")
+            resolution.created(new_node)
         except Exception as e:
             print(f"[smart_fetcher] Error creating new KG node: {e}")
     
@@ -542,7 +842,8 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
             youtube_id,
             kg_node_code=new_node.code if 'new_node' in locals() else None,
             topic=topic_name,
-            validate=validate_with_llm
+            validate=validate_with_llm,
+            kg_node=resolution.node
         )
     
         # Step 5: Return the final response
@@ -556,7 +857,8 @@ def get_video_and_transcript(code_or_topic, validate_with_llm=True):
         }
 
 
-def generate_quiz_from_transcript(transcript_text, topic=None, num_questions=10, kg_node_code=None, youtube_id=None, force_regenerate=False):
+def generate_quiz_from_transcript(transcript_text, topic=None, num_questions=10, kg_node_code=None, youtube_id=None, force_regenerate=False,
+                                  kg_node=None):
     """
     Generate a 10-question multiple-choice quiz from a YouTube video transcript
     using the 5Ws & H principle (Who, What, When, Where, Why, How).
@@ -571,6 +873,7 @@ def generate_quiz_from_transcript(transcript_text, topic=None, num_questions=10,
         kg_node_code (str, optional): Knowledge graph node code for linking
         youtube_id (str, optional): YouTube video ID for tracking
         force_regenerate (bool): If True, regenerate quiz even if exists (default: False)
+        kg_node (KnowledgeGraphNode, optional): Already loaded node (skips the lookup by code / youtube_id)
 
     Returns:
         dict: {
@@ -599,14 +902,13 @@ def generate_quiz_from_transcript(transcript_text, topic=None, num_questions=10,
         }
 
     # Step 1: Check if quiz already exists in database (unless force_regenerate)
-    if not force_regenerate and (kg_node_code or youtube_id):
+    if not force_regenerate and (kg_node or kg_node_code or youtube_id):
         print(f"[quiz_generator] Checking database for existing quiz...")
         
-        # Find KG node
-        kg_node = None
-        if kg_node_code:
+        # Find KG node (unless the caller already loaded it)
+        if kg_node is None and kg_node_code:
             kg_node = KnowledgeGraphNode.objects(code=kg_node_code).first()
-        elif youtube_id:
+        elif kg_node is None and youtube_id:
             video_transcript = VideoTranscript.objects(youtube_id=youtube_id).first()
             if video_transcript and video_transcript.kg_node:
                 kg_node = video_transcript.kg_node
@@ -736,22 +1038,22 @@ Generate {num_questions} high-quality questions about the SCIENTIFIC CONTENT now
 """
 
     try:
-        result = llm_call(prompt, max_tokens=2000, parse_json=True)
+        # A forced regeneration must reach the LLM, not the response cache
+        result = llm_call(prompt, max_tokens=2000, parse_json=True, use_cache=not force_regenerate)
         if not result or "quiz" not in result:
             raise ValueError("Invalid LLM response")
 
         quiz = result["quiz"][:num_questions]
         
         # Step 3: Save quiz to database
-        if kg_node_code or youtube_id:
+        if kg_node or kg_node_code or youtube_id:
             try:
                 print(f"[quiz_generator] 💾 Saving quiz to database...")
         
-                # Get or determine KG node
-                kg_node = None
-                if kg_node_code:
+                # Get or determine KG node (unless already loaded)
+                if kg_node is None and kg_node_code:
                     kg_node = KnowledgeGraphNode.objects(code=kg_node_code).first()
-                elif youtube_id:
+                elif kg_node is None and youtube_id:
                     video_transcript = VideoTranscript.objects(youtube_id=youtube_id).first()
                     if video_transcript and video_transcript.kg_node:
                         kg_node = video_transcript.kg_node
@@ -809,6 +1111,7 @@ Generate {num_questions} high-quality questions about the SCIENTIFIC CONTENT now
                     )
                     new_quiz.save()
                     print(f"[quiz_generator] ✅ Created new quiz with ID: {new_quiz.id}")
+                    bump_graph_version(f"created quiz {new_quiz.id}")
         
                 return {
                     "quiz": quiz,
@@ -849,7 +1152,7 @@ Generate {num_questions} high-quality questions about the SCIENTIFIC CONTENT now
         }
 
 
-def get_video_transcript_and_quiz(code_or_topic, num_questions=10, validate_with_llm=True, force_regenerate_quiz=False):
+def get_video_transcript_and_quiz(code_or_topic, num_questions=10, validate_with_llm=True, force_regenerate_quiz=False, force_revalidate=False, progress=None):
     """
     Comprehensive function that returns video, transcript, and quiz for a topic.
     
@@ -860,6 +1163,8 @@ def get_video_transcript_and_quiz(code_or_topic, num_questions=10, validate_with
         num_questions: Number of quiz questions (default: 10)
         validate_with_llm: Whether to validate transcript with LLM (default: True)
         force_regenerate_quiz: Force regenerate quiz even if exists (default: False)
+        force_revalidate: Re-validate stored transcripts with the LLM (default: False)
+        progress: Optional progress(stage, message) callback, e.g. for content jobs
     
     Returns:
         dict: {
@@ -878,8 +1183,15 @@ def get_video_transcript_and_quiz(code_or_topic, num_questions=10, validate_with
         }
     """
     
+    # Resolve the node once; every step below reuses it
+    resolution = NodeResolution.resolve(code_or_topic)
+    
     # Step 1: Get video and transcript
-    video_result = get_video_and_transcript(code_or_topic, validate_with_llm=validate_with_llm)
+    report_progress(progress, 'video', f"Finding video and transcript for: {code_or_topic}")
+    video_result = get_video_and_transcript(
+        code_or_topic, validate_with_llm=validate_with_llm, force_revalidate=force_revalidate, progress=progress,
+        resolution=resolution
+    )
     
     # Ensure all keys exist to avoid KeyErrors
     video_result.setdefault('youtube_id', None)
@@ -897,24 +1209,24 @@ def get_video_transcript_and_quiz(code_or_topic, num_questions=10, validate_with
             'quiz_status': 'no_transcript_for_quiz',
             'num_questions': 0,
             'quiz_id': None,
-            'topic': code_or_topic
+            'topic': code_or_topic,
+            'topic_title': resolution.topic_title
         }
     
     # Step 2: Get or generate quiz
-    kg_node = KnowledgeGraphNode.objects(code=code_or_topic).first()
-    if not kg_node:
-        kg_node = KnowledgeGraphNode.objects(title=code_or_topic).first()
-    
+    kg_node = resolution.quiz_node
     kg_node_code = kg_node.code if kg_node else None
     topic = kg_node.title if kg_node else code_or_topic
     
+    report_progress(progress, 'quiz', f"Preparing quiz for: {topic}")
     quiz_result = generate_quiz_from_transcript(
         transcript_text=video_result['transcript'],
         topic=topic,
         num_questions=num_questions,
         kg_node_code=kg_node_code,
         youtube_id=video_result['youtube_id'],
-        force_regenerate=force_regenerate_quiz
+        force_regenerate=force_regenerate_quiz,
+        kg_node=kg_node
     )
     
     # Ensure quiz_result has safe defaults
@@ -936,11 +1248,97 @@ def get_video_transcript_and_quiz(code_or_topic, num_questions=10, validate_with
         'num_questions': quiz_result['num_questions'],
         'quiz_id': quiz_result.get('quiz_id'),
         'topic': quiz_result.get('topic'),
+        'topic_title': resolution.topic_title,
         'status': 'ok'
     }
 
 
 
+# Transcript fields read to serve stored content
+STORED_TRANSCRIPT_FIELDS = ('youtube_id', 'full_text', 'validation')
+
+
+def has_current_verdict(transcript_doc, topic):
+    """Whether the transcript's stored verdict is a relevant one from the current model for `topic`."""
+    verdict = transcript_doc.validation
+    return bool(verdict and verdict.is_relevant and verdict.model == GROQ_MODEL and verdict.topic == topic)
+
+
+def stored_transcript_candidates(kg_node, transcript_docs, topic, validate_with_llm=True):
+    """
+    The transcripts (loaded with STORED_TRANSCRIPT_FIELDS) of kg_node's
+    videos that may be served as stored content, in the node's video order.
+    The caller takes the first one that has text.
+    """
+    by_video = {doc.youtube_id: doc for doc in transcript_docs}
+    for youtube_id in kg_node.videos:
+        doc = by_video.get(youtube_id)
+        if doc and (not validate_with_llm or has_current_verdict(doc, topic)):
+            yield doc
+
+
+def stored_content_result(resolution, transcript_doc, full_text, quiz_id, questions):
+    """The get_video_transcript_and_quiz() result for content served from the store."""
+    verdict = transcript_doc.validation
+    quiz = [
+        {
+            "question": q.question_text,
+            "options": q.options or [],
+            "correct_answer": q.correct_answer,
+            "category": "mixed",
+            "explanation": q.explanation or ""
+        }
+        for q in questions
+    ]
+    return {
+        'youtube_id': transcript_doc.youtube_id,
+        'youtube_url': f'https://www.youtube.com/watch?v={transcript_doc.youtube_id}',
+        'transcript': full_text,
+        'quiz': quiz,
+        'video_status': 'found_existing',
+        'quiz_status': 'database',
+        'confidence': verdict.confidence if verdict else 0.0,
+        'educational_quality': verdict.educational_quality if verdict else 'unvalidated',
+        'num_questions': len(quiz),
+        'quiz_id': str(quiz_id),
+        'topic': resolution.node.title or resolution.query,
+        'topic_title': resolution.topic_title,
+        'status': 'ok'
+    }
+
+
+def get_cached_topic_content(code_or_topic, num_questions=10, validate_with_llm=True):
+    """
+    Return the content get_video_transcript_and_quiz() would return, using
+    only what is already stored (no LLM, YouTube or transcript API calls).
+
+    Returns None when anything is missing: no node, no stored transcript
+    (with a current, relevant verdict when validate_with_llm is set) or no
+    stored progress quiz.
+    """
+    resolution = NodeResolution.resolve(code_or_topic, include_subject=False)
+    kg_node = resolution.node
+    if not kg_node or not kg_node.videos:
+        return None
+
+    topic = kg_node.title or code_or_topic
+    docs = VideoTranscript.objects(youtube_id__in=kg_node.videos).only(*STORED_TRANSCRIPT_FIELDS)
+    transcript_doc = full_text = None
+    for doc in stored_transcript_candidates(kg_node, docs, topic, validate_with_llm):
+        full_text = doc.get_full_text()
+        if full_text:
+            transcript_doc = doc
+            break
+    if not transcript_doc:
+        return None
+
+    quiz = Quiz.objects(KG_Node_ID=kg_node, quiz_type="progress").first()
+    if not quiz or not quiz.question_IDs:
+        return None
+    return stored_content_result(resolution, transcript_doc, full_text, quiz.id, quiz.question_IDs[:num_questions])
+
+
+
 # Example usage:
 if __name__ == "__main__":
     print("=== Testing Smart Video Fetcher with LLM Validation ===\n")
@@ -0,0 +1,370 @@
+# app/learning_api.py
+"""
+Request parsing, query specs and response bodies of the learning API,
+shared by the Flask blueprint (app/routes/learning_routes.py) and the ASGI
+app (app/asgi.py). Everything here takes its data as parameters; each app
+only does the database reads (pymongo or Motor) and wraps the results in
+its own response type.
+"""
+import base64
+import json
+from bson import ObjectId
+from app.transcript_api import parse_include_transcript, transcript_fields
+
+# Topic listing output fields -> serializer(node, quiz_node_ids) and the model fields it reads
+TOPIC_FIELDS = {
+    "code": (lambda node, quiz_ids: node.code, ('code',)),
+    "title": (lambda node, quiz_ids: node.title, ('title',)),
+    "description": (lambda node, quiz_ids: node.description or "", ('description',)),
+    "difficulty_level": (lambda node, quiz_ids: node.difficulty_level, ('difficulty_level',)),
+    "has_video": (lambda node, quiz_ids: bool(node.videos and len(node.videos) > 0), ('videos',)),
+    "has_quiz": (lambda node, quiz_ids: node.id in quiz_ids, ('id',)),
+    "video_count": (lambda node, quiz_ids: len(node.videos) if node.videos else 0, ('videos',)),
+    "keywords": (lambda node, quiz_ids: node.keywords or [], ('keywords',)),
+    "objectives": (lambda node, quiz_ids: node.objectives or [], ('objectives',)),
+    "estimated_hours": (lambda node, quiz_ids: node.estimated_hours or 0, ('estimated_hours',)),
+    "prerequisites": (lambda node, quiz_ids: node.prerequisites or [], ('prerequisites',)),
+    "next_topics": (lambda node, quiz_ids: node.next_topics or [], ('next_topics',)),
+}
+
+# Compact field set for list views (?view=summary)
+TOPIC_SUMMARY_FIELDS = ('code', 'title', 'difficulty_level', 'has_video', 'has_quiz', 'estimated_hours')
+
+MAX_TOPIC_PAGE_SIZE = 200
+# Topic listing order; the cursor encodes a position in it
+TOPIC_ORDER = [('title', 1), ('_id', 1)]
+
+
+def invalid_parameters(error):
+    """400 body for a ValueError raised while parsing query parameters."""
+    return {
+        "success": False,
+        "error": str(error),
+        "message": "Invalid request parameters"
+    }
+
+
+def quiz_node_filter(node_ids):
+    """Filter for distinct('KG_Node_ID') on quizzes: which of `node_ids` have at least one quiz."""
+    return {'KG_Node_ID': {'$in': list(node_ids)}}
+
+
+# ================================================================
+# TOPIC LISTING
+# ================================================================
+
+def parse_topic_fields(fields_param, view):
+    """Output fields requested with ?fields=a,b or ?view=summary|full (default: full)."""
+    if fields_param:
+        fields = tuple(dict.fromkeys(f.strip() for f in fields_param.split(',') if f.strip()))
+        unknown = [f for f in fields if f not in TOPIC_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(TOPIC_FIELDS)})")
+        return fields
+    if view == 'summary':
+        return TOPIC_SUMMARY_FIELDS
+    if view in ('', 'full'):
+        return tuple(TOPIC_FIELDS)
+    raise ValueError(f"Unknown view: {view} (expected 'summary' or 'full')")
+
+
+def encode_topic_cursor(node):
+    """Opaque cursor pointing just after `node` in (title, _id) order."""
+    raw = json.dumps([node.title, str(node.id)]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_topic_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        title, node_id = json.loads(raw)
+        return title, ObjectId(node_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def topics_cache_key(subject_name, args):
+    """Normalised topic listing parameters for the response cache."""
+    return (
+        subject_name.strip().title(),
+        args.get('fields', '').replace(' ', ''),
+        args.get('view', '').strip().lower(),
+        args.get('limit', '').strip(),
+        args.get('cursor', '').strip()
+    )
+
+
+def parse_topic_listing(args):
+    """
+    ?fields / ?view, ?limit and ?cursor of the topic listing.
+
+    Returns:
+        (fields, limit, after): limit is None without pagination; after is
+        the (title, _id) position decoded from the cursor, or None
+
+    Raises:
+        ValueError: on unknown fields or views and malformed limits or cursors
+    """
+    fields = parse_topic_fields(args.get('fields', '').strip(), args.get('view', '').strip().lower())
+    limit = args.get('limit', '').strip()
+    limit = min(max(int(limit), 1), MAX_TOPIC_PAGE_SIZE) if limit else None
+    cursor = args.get('cursor', '').strip()
+    after = decode_topic_cursor(cursor) if cursor else None
+    return fields, limit, after
+
+
+def topic_listing_find(subject_name, fields, limit, after):
+    """
+    Arguments of the nodes collection's find() for one listing page: only
+    the model fields the requested output fields are built from (id and
+    title are always needed for the cursor), one extra node to tell
+    whether another page follows.
+    """
+    model_fields = {'id', 'title'}
+    for field in fields:
+        model_fields.update(TOPIC_FIELDS[field][1])
+    query = {"subject": subject_name}
+    if after:
+        title, node_id = after
+        query["$or"] = [{"title": {"$gt": title}}, {"title": title, "_id": {"$gt": node_id}}]
+    return {
+        "filter": query,
+        "projection": {'_id' if f == 'id' else f: 1 for f in model_fields},
+        "sort": TOPIC_ORDER,
+        "limit": limit + 1 if limit else 0
+    }
+
+
+def split_topic_page(nodes, limit):
+    """(page, has_more) from the nodes read with topic_listing_find()."""
+    if not limit:
+        return nodes, False
+    return nodes[:limit], len(nodes) > limit
+
+
+def no_topics_payload(subject_name):
+    return {
+        "success": False,
+        "message": f"No topics found for subject: {subject_name}",
+        "subject": subject_name,
+        "topics": [],
+        "total_topics": 0
+    }
+
+
+def topic_listing_payload(subject_name, nodes, fields, quiz_node_ids, limit=None, has_more=False, total=None):
+    """
+    The listing response for one page of nodes.
+
+    Args:
+        quiz_node_ids: ids of the page's nodes that have a quiz (needed for has_quiz)
+        total: number of topics of the subject (paginated listings only)
+    """
+    serializers = [(field, TOPIC_FIELDS[field][0]) for field in fields]
+    topics_list = [
+        {field: serialize(node, quiz_node_ids) for field, serialize in serializers}
+        for node in nodes
+    ]
+    payload = {
+        "success": True,
+        "subject": subject_name,
+        "topics": topics_list,
+        "total_topics": len(topics_list)
+    }
+    if limit:
+        payload["total_topics"] = total
+        payload["limit"] = limit
+        payload["next_cursor"] = encode_topic_cursor(nodes[-1]) if has_more else None
+    return payload
+
+
+# ================================================================
+# TOPIC CONTENT AND JOBS
+# ================================================================
+
+def parse_content_request(topic_code, args):
+    """
+    Query parameters of GET /api/topics/<code>/content.
+
+    Returns:
+        (params, include_transcript, wait): params are the keyword
+        arguments of get_video_transcript_and_quiz() / submit_content_job()
+
+    Raises:
+        ValueError: on a malformed num_questions or include_transcript
+    """
+    params = dict(
+        code_or_topic=topic_code,
+        num_questions=int(args.get('num_questions', 10)),
+        validate_with_llm=args.get('validate_llm', 'true').lower() == 'true',
+        force_regenerate_quiz=args.get('force_regenerate', 'false').lower() == 'true',
+        force_revalidate=args.get('revalidate', 'false').lower() == 'true'
+    )
+    include_transcript = parse_include_transcript(args.get('include_transcript'))
+    wait = args.get('wait', 'false').lower() == 'true'
+    return params, include_transcript, wait
+
+
+def format_topic_content(topic_code, result, include_transcript="full"):
+    """Shape a get_video_transcript_and_quiz() result into the content API response."""
+    youtube_id = result.get('youtube_id')
+    return {
+        "success": True,
+        "topic_code": topic_code,
+        # Topic title (resolved with the node by the content pipeline)
+        "topic_title": result.get('topic_title') or topic_code,
+        "youtube_url": result.get('youtube_url'),
+        "youtube_id": youtube_id,
+        **transcript_fields(result.get('transcript', ''), include_transcript),
+        "transcript_url": f"/api/videos/{youtube_id}/transcript" if youtube_id else None,
+        "quiz": result.get('quiz', []),
+        "video_status": result.get('video_status', 'unknown'),
+        "quiz_status": result.get('quiz_status', 'unknown'),
+        "confidence": result.get('confidence', 0.0),
+        "educational_quality": result.get('educational_quality', 'unknown'),
+        "num_questions": result.get('num_questions', 0),
+        "quiz_id": result.get('quiz_id'),
+        "topic": result.get('topic')
+    }
+
+
+def content_error(topic_code, result):
+    return {
+        "success": False,
+        "error": result.get('error', 'Unknown error'),
+        "message": "Failed to fetch topic content",
+        "topic_code": topic_code
+    }
+
+
+def pending_job(topic_code, job, include_transcript="full"):
+    """
+    The 202 response for a queued job. include_transcript is carried on the
+    status and stream URLs, since identical requests share one job whatever
+    transcript they asked for.
+    """
+    query = "" if include_transcript == "full" else f"?include_transcript={include_transcript}"
+    return {
+        "success": True,
+        "status": "pending",
+        "topic_code": topic_code,
+        "job_id": job.id,
+        "status_url": f"/api/jobs/{job.id}{query}",
+        "stream_url": f"/api/jobs/{job.id}/stream{query}"
+    }
+
+
+def job_payload(job, include_transcript="full"):
+    """Job status, plus the formatted content (or error) once it has finished."""
+    payload = {"success": job.status != "error", **job.to_dict()}
+    if job.status == "done":
+        result = job.result
+        topic_code = job.params["code_or_topic"]
+        if result.get('status') == 'error':
+            payload.update(content_error(topic_code, result))
+        else:
+            payload["content"] = format_topic_content(topic_code, result, include_transcript)
+    return payload
+
+
+def unknown_job(job_id):
+    return {"success": False, "message": f"Unknown job: {job_id}"}
+
+
+def job_events(job, include_transcript="full"):
+    """
+    Server-Sent Events of a job: "progress" per pipeline stage, a keep-alive
+    comment while nothing happens, then "done" with the job payload. A
+    generator: each app drives it (the ASGI app off the event loop, since
+    waiting for events blocks).
+    """
+    sent = 0
+    while True:
+        new_events = job.wait_for_events(sent)
+        for event in new_events:
+            yield f"event: progress\ndata: {json.dumps(event)}\n\n"
+        sent += len(new_events)
+        if job.finished and sent >= len(job.events):
+            break
+        if not new_events:
+            yield ": keep-alive\n\n"
+    yield f"event: done\ndata: {json.dumps(job_payload(job, include_transcript), default=str)}\n\n"
+
+
+# ================================================================
+# SEARCH AND AUTOCOMPLETE
+# ================================================================
+
+def search_cache_key(args):
+    """Normalised search parameters, so equivalent queries share one cached response."""
+    return (
+        ' '.join(args.get('q', '').lower().split()),
+        args.get('subject', '').strip().title(),
+        args.get('limit', '20').strip(),
+        args.get('offset', '0').strip()
+    )
+
+
+def parse_search(args):
+    """
+    (query, subject, limit, offset) of GET /api/topics/search.
+
+    Raises:
+        ValueError: on a malformed limit or offset
+    """
+    limit = min(max(int(args.get('limit', 20)), 1), 100)
+    offset = max(int(args.get('offset', 0)), 0)
+    return args.get('q', '').strip(), args.get('subject', '').strip() or None, limit, offset
+
+
+def search_query_required():
+    return {"success": False, "message": "Search query is required"}
+
+
+def search_payload(query, total, hits, quiz_node_ids, limit, offset):
+    """The search response for the index hits [(node row, score), ...] of one page."""
+    results = [
+        {
+            "code": node["code"],
+            "title": node["title"],
+            "subject": node["subject"],
+            "description": node["description"] or "",
+            "difficulty_level": node["difficulty_level"],
+            "has_video": bool(node["videos"]),
+            "has_quiz": node["_id"] in quiz_node_ids,
+            "keywords": node["keywords"] or [],
+            "score": score
+        }
+        for node, score in hits
+    ]
+    return {
+        "success": True,
+        "query": query,
+        "results": results,
+        "total_results": total,
+        "limit": limit,
+        "offset": offset
+    }
+
+
+def parse_suggest(args):
+    """
+    (query, subject, limit) of GET /api/topics/suggest.
+
+    Raises:
+        ValueError: on a malformed limit
+    """
+    limit = min(max(int(args.get('limit', 8)), 1), 20)
+    return args.get('q', ''), args.get('subject', '').strip() or None, limit
+
+
+def suggest_payload(query, suggestions):
+    return {"success": True, "query": query, "suggestions": suggestions}
+
+
+# ================================================================
+# SUBJECTS
+# ================================================================
+
+def subjects_payload(subjects_list):
+    return {"success": True, "subjects": subjects_list, "total_subjects": len(subjects_list)}
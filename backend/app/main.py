@@ -1,4 +1,5 @@
 # app/__init__.py or app/main.py
+import os
 from flask import Flask
 from flask_cors import CORS
 from app.routes.learning_routes import learning_bp
@@ -22,6 +23,12 @@ def create_app():
     
     return app
 
+# Development server only; in production run `gunicorn -c gunicorn.conf.py app.wsgi:app`
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(
+        debug=os.getenv('FLASK_DEBUG', 'false').lower() == 'true',
+        host=os.getenv('HOST', '0.0.0.0'),
+        port=int(os.getenv('PORT', '5000')),
+        threaded=True
+    )
\ No newline at end of file
@@ -0,0 +1,213 @@
+# app/manage_indexes.py
+"""
+Create and reconcile the MongoDB indexes declared in app/models.py, and
+check that the API's hot-path queries are served by an index.
+
+Usage (from backend/):
+    python -m app.manage_indexes [--dry-run] [--drop-extra] [--explain]
+
+    --dry-run     only report what would change
+    --drop-extra  also drop indexes that no model declares
+    --explain     explain() every hot-path query and exit 1 if any plan uses COLLSCAN
+
+Running it repeatedly is safe: existing indexes are left alone, and an
+index whose options changed (e.g. became unique) is dropped and recreated.
+"""
+import argparse
+import sys
+from mongoengine.connection import get_db
+from pymongo.errors import OperationFailure
+from app.db import *
+from app.models import (
+    KnowledgeGraphNode, VideoTranscript, Quiz, QuizQuestion, Student,
+    GraphState, SubjectCatalogue, LLMCacheEntry, ContentJobRecord
+)
+from app.graph_state import GRAPH_STATE_KEY
+
+MODELS = (
+    KnowledgeGraphNode, VideoTranscript, Quiz, QuizQuestion, Student,
+    GraphState, SubjectCatalogue, LLMCacheEntry, ContentJobRecord
+)
+
+# create_index error codes for "an index with this key/name already exists with other options"
+INDEX_CONFLICT_CODES = (85, 86)
+
+
+def _collection(model):
+    # Not model._get_collection(): with auto_create_index that would try to
+    # build the declared indexes before we get a chance to reconcile them
+    return get_db()[model._get_collection_name()]
+
+
+def declared_indexes(model):
+    """[(key tuple, options dict)] declared by the model (fields, meta['indexes'], unique=True)."""
+    specs = []
+    for spec in model._meta["index_specs"]:
+        spec = dict(spec)
+        fields = tuple(tuple(f) for f in spec.pop("fields"))
+        spec.pop("cls", None)
+        options = dict(model._meta.get("index_opts") or {})
+        options.update(spec)
+        specs.append((fields, options))
+    return specs
+
+
+def reconcile_indexes(model, drop_extra=False, dry_run=False):
+    """
+    Make the collection's indexes match the model's declaration.
+
+    Returns:
+        dict with 'created', 'recreated', 'dropped' and 'extra' index names/keys
+    """
+    collection = _collection(model)
+    existing = {tuple(tuple(f) for f in info["key"]): name for name, info in collection.index_information().items()}
+    report = {"created": [], "recreated": [], "dropped": [], "extra": []}
+
+    declared_keys = {(("_id", 1),)}
+    for fields, options in declared_indexes(model):
+        declared_keys.add(fields)
+        if dry_run:
+            if fields not in existing:
+                report["created"].append(fields)
+            continue
+        try:
+            name = collection.create_index(list(fields), **options)
+            if fields not in existing:
+                report["created"].append(name)
+        except OperationFailure as e:
+            if e.code not in INDEX_CONFLICT_CODES or fields not in existing:
+                raise
+            collection.drop_index(existing[fields])
+            report["recreated"].append(collection.create_index(list(fields), **options))
+
+    for fields, name in existing.items():
+        if fields in declared_keys:
+            continue
+        if drop_extra and not dry_run:
+            collection.drop_index(name)
+            report["dropped"].append(name)
+        else:
+            report["extra"].append(name)
+    return report
+
+
+# ================================================================
+# Query-plan check
+# ================================================================
+
+def hot_path_queries():
+    """
+    The filters the API runs on every request (learning_routes,
+    graph_traversal and the content pipeline), filled in with values from
+    a real node so the planner sees realistic selectivity. Topic search
+    is served from the in-memory index (app/topic_search.py) and issues no
+    per-request query.
+
+    Returns:
+        list of dicts: name, model, filter, and optionally sort, limit,
+        distinct (key) or allow_collscan (reason the scan is expected)
+    """
+    node = _collection(KnowledgeGraphNode).find_one(
+        {"keywords.0": {"$exists": True}},
+        {"code": 1, "title": 1, "subject": 1, "difficulty_level": 1, "keywords": 1, "prerequisites": 1, "videos": 1}
+    ) or {}
+    subject = node.get("subject", "Physics")
+    title = node.get("title", "Newton's Laws of Motion")
+    code = node.get("code", "PHY_BASE")
+    keyword = (node.get("keywords") or ["force"])[0]
+    return [
+        {"name": "subject topic listing", "model": KnowledgeGraphNode,
+         "filter": {"subject": subject}, "sort": [("title", 1), ("_id", 1)]},
+        {"name": "topics by subject and level", "model": KnowledgeGraphNode,
+         "filter": {"subject": subject, "difficulty_level": node.get("difficulty_level", "base")}},
+        {"name": "node by code", "model": KnowledgeGraphNode, "filter": {"code": code}, "limit": 1},
+        {"name": "node resolution by code or title", "model": KnowledgeGraphNode,
+         "filter": {"$or": [{"code": title}, {"title": title}]}},
+        {"name": "node resolution by subject", "model": KnowledgeGraphNode,
+         "filter": {"subject": subject}, "limit": 1},
+        {"name": "nodes by code list", "model": KnowledgeGraphNode,
+         "filter": {"code": {"$in": node.get("prerequisites") or [code]}}},
+        {"name": "keyword lookup", "model": KnowledgeGraphNode, "filter": {"keywords": keyword}},
+        {"name": "has_quiz lookup", "model": Quiz, "distinct": "KG_Node_ID",
+         "filter": {"KG_Node_ID": {"$in": [node.get("_id")]}}},
+        {"name": "progress quiz by node", "model": Quiz,
+         "filter": {"KG_Node_ID": node.get("_id"), "quiz_type": "progress"}, "limit": 1},
+        {"name": "transcript by video", "model": VideoTranscript,
+         "filter": {"youtube_id": (node.get("videos") or ["dQw4w9WgXcQ"])[0]}, "limit": 1},
+        {"name": "graph version", "model": GraphState, "filter": {"key": GRAPH_STATE_KEY}, "limit": 1},
+    ]
+
+
+def plan_stages(plan):
+    """All stage names in an explain() plan tree (classic and slot-based engine layouts)."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+def explain_query(query):
+    collection = _collection(query["model"])
+    if "distinct" in query:
+        explained = get_db().command({
+            "explain": {"distinct": collection.name, "key": query["distinct"], "query": query["filter"]},
+            "verbosity": "queryPlanner"
+        })
+    else:
+        cursor = collection.find(query["filter"])
+        if query.get("sort"):
+            cursor = cursor.sort(query["sort"])
+        if query.get("limit"):
+            cursor = cursor.limit(query["limit"])
+        explained = cursor.explain()
+    return plan_stages(explained["queryPlanner"]["winningPlan"])
+
+
+def check_query_plans(queries=None):
+    """
+    explain() each hot-path query.
+
+    Returns:
+        list of (name, stages) for queries whose winning plan contains a
+        COLLSCAN they are not allowed to have
+    """
+    failures = []
+    for query in queries or hot_path_queries():
+        stages = explain_query(query)
+        collscan = "COLLSCAN" in stages
+        if collscan and query.get("allow_collscan"):
+            status = f"COLLSCAN (expected: {query['allow_collscan']})"
+        elif collscan:
+            status = "COLLSCAN ❌"
+            failures.append((query["name"], stages))
+        else:
+            status = "ok"
+        print(f"  {query['name']:<36}{' > '.join(stages):<48}{status}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--drop-extra", action="store_true", help="drop indexes no model declares")
+    parser.add_argument("--explain", action="store_true", help="fail if a hot-path query uses COLLSCAN")
+    args = parser.parse_args()
+
+    for model in MODELS:
+        report = reconcile_indexes(model, drop_extra=args.drop_extra, dry_run=args.dry_run)
+        changes = ", ".join(f"{k}: {v}" for k, v in report.items() if v) or "up to date"
+        print(f"[indexes] {model._get_collection_name()}: {changes}")
+
+    if args.explain:
+        print("\n[indexes] Query plans:")
+        failures = check_query_plans()
+        if failures:
+            print(f"\n[indexes] {len(failures)} hot-path queries fall back to COLLSCAN")
+            sys.exit(1)
+        print("\n[indexes] All hot-path queries use an index")
@@ -0,0 +1,94 @@
+# app/migrate_transcripts.py
+"""
+Convert stored VideoTranscript segments between the legacy embedded list
+and the compact columnar fields (see app/transcript_store.py).
+
+Usage (from backend/):
+    python -m app.migrate_transcripts [--dry-run] [--batch 200] [--revert]
+
+    --dry-run   only report how many documents would change and their sizes
+    --batch     documents per bulk write (default 200)
+    --revert    rewrite compact documents back to embedded segments
+
+Running it repeatedly is safe: documents already in the target format are
+skipped. full_text is rebuilt from the segments, since the offsets index it.
+"""
+import argparse
+import bson
+from mongoengine.connection import get_db
+from pymongo import UpdateOne
+from app.db import *
+from app.models import VideoTranscript
+from app.transcript_store import PackedSegments, pack_segments
+
+COMPACT_FIELDS = ("segment_count", "segment_starts", "segment_durations", "segment_offsets")
+
+
+def _collection():
+    return get_db()[VideoTranscript._get_collection_name()]
+
+
+def to_compact(doc):
+    full_text, packed = pack_segments(doc.get("segments") or [])
+    return {"$set": {"full_text": full_text, **packed}, "$unset": {"segments": ""}}
+
+
+def to_embedded(doc):
+    segments = PackedSegments(doc.get("full_text"), doc.get("segment_starts"),
+                              doc.get("segment_durations"), doc.get("segment_offsets"))
+    return {
+        "$set": {"segments": [{"start": s.start, "duration": s.duration, "text": s.text} for s in segments]},
+        "$unset": dict.fromkeys(COMPACT_FIELDS, "")
+    }
+
+
+def _apply(doc, update):
+    """The document as it will be stored after `update` (for size reporting)."""
+    new = {k: v for k, v in doc.items() if k not in update.get("$unset", {})}
+    new.update(update["$set"])
+    return new
+
+
+def migrate(revert=False, dry_run=False, batch_size=200):
+    """
+    Returns:
+        dict with 'migrated' document count and total BSON 'bytes_before'/'bytes_after'
+    """
+    collection = _collection()
+    if revert:
+        query, convert = {"segment_count": {"$exists": True}}, to_embedded
+    else:
+        query, convert = {"segment_count": {"$exists": False}, "segments.0": {"$exists": True}}, to_compact
+
+    report = {"migrated": 0, "bytes_before": 0, "bytes_after": 0}
+    ops = []
+    for doc in collection.find(query):
+        update = convert(doc)
+        report["migrated"] += 1
+        report["bytes_before"] += len(bson.encode(doc))
+        report["bytes_after"] += len(bson.encode(_apply(doc, update)))
+        if dry_run:
+            continue
+        ops.append(UpdateOne({"_id": doc["_id"]}, update))
+        if len(ops) >= batch_size:
+            collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--batch", type=int, default=200, help="documents per bulk write")
+    parser.add_argument("--revert", action="store_true", help="convert compact documents back to embedded segments")
+    args = parser.parse_args()
+
+    report = migrate(revert=args.revert, dry_run=args.dry_run, batch_size=args.batch)
+    target = "embedded" if args.revert else "compact"
+    verb = "Would convert" if args.dry_run else "Converted"
+    print(f"[migrate_transcripts] {verb} {report['migrated']} documents to {target} segments")
+    if report["migrated"]:
+        print(f"[migrate_transcripts] {report['bytes_before'] / 1024:.1f} KiB -> {report['bytes_after'] / 1024:.1f} KiB "
+              f"({report['bytes_after'] / report['bytes_before']:.0%})")
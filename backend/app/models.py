@@ -1,8 +1,12 @@
 from mongoengine import (
 Document, StringField, IntField, ListField, ReferenceField,
-FloatField, DateTimeField, EmbeddedDocument,EmbeddedDocumentField, BooleanField
+FloatField, DateTimeField, EmbeddedDocument,EmbeddedDocumentField, BooleanField,
+DictField, BinaryField
 )
 from datetime import datetime
+from app.transcript_store import (
+    TRANSCRIPT_SEGMENT_STORAGE, SEGMENT_FIELDS, PackedSegments, pack_segments, as_segments, joined_text
+)
 
 # stores a list of transcript segments for a video
 class TranscriptSegment(EmbeddedDocument):
@@ -10,15 +14,84 @@ class TranscriptSegment(EmbeddedDocument):
     duration = FloatField()     # seconds
     text = StringField()
 
+# LLM relevance verdict for a transcript, reused until the model or topic changes
+class TranscriptValidation(EmbeddedDocument):
+    is_relevant = BooleanField()
+    confidence = FloatField()
+    educational_quality = StringField()
+    reason = StringField()
+    topic = StringField()       # topic the transcript was judged against
+    model = StringField()       # LLM model that produced the verdict
+    validated_at = DateTimeField(default=datetime.utcnow)
+
 # stores video transcripts linked to KG nodes
 class VideoTranscript(Document):
     youtube_id = StringField(required=True, unique=True)
     kg_node = ReferenceField('KnowledgeGraphNode')   # link back to KG node (optional)
     language = StringField(default="en")
     full_text = StringField()
-    segments = ListField(EmbeddedDocumentField(TranscriptSegment))
+    segments = ListField(EmbeddedDocumentField(TranscriptSegment))   # legacy (embedded) storage
+    # compact segment storage, see app/transcript_store.py
+    segment_count = IntField()
+    segment_starts = BinaryField()
+    segment_durations = BinaryField()
+    segment_offsets = BinaryField()
     confidence = FloatField()
+    validation = EmbeddedDocumentField(TranscriptValidation)
     fetched_at = DateTimeField(default=datetime.utcnow)
+    meta = {
+        'indexes': [
+            'kg_node'
+        ]
+    }
+
+    @classmethod
+    def without_segments(cls):
+        """Queryset that loads transcripts without any segment field (text and metadata only)."""
+        return cls.objects.exclude(*SEGMENT_FIELDS)
+
+    def get_full_text(self):
+        """
+        The stored full_text. Legacy documents saved without one are joined
+        from their segment texts (python -m app.backfill_transcript_text
+        stores it for them).
+        """
+        if self.full_text is not None:
+            return self.full_text
+        raw = type(self)._get_collection().find_one({'_id': self.id}, {'segments.text': 1}) or {}
+        return joined_text(raw.get('segments') or [])
+
+    @property
+    def is_compact(self):
+        return self.segment_count is not None
+
+    @property
+    def has_segments(self):
+        return bool(self.segment_count) if self.is_compact else bool(self.segments)
+
+    def get_segments(self):
+        """Segments with .start/.duration/.text, decoded lazily from whichever storage the document uses."""
+        if self.is_compact:
+            return PackedSegments(self.full_text, self.segment_starts, self.segment_durations, self.segment_offsets)
+        return self.segments or []
+
+    def set_segments(self, segments):
+        """Store `segments` (and the full_text built from them) in TRANSCRIPT_SEGMENT_STORAGE format."""
+        full_text, packed = pack_segments(segments)
+        self.full_text = full_text
+        if TRANSCRIPT_SEGMENT_STORAGE == "embedded":
+            self.segments = [TranscriptSegment(start=s.start, duration=s.duration, text=s.text)
+                             for s in as_segments(segments)]
+            packed = dict.fromkeys(packed)
+        else:
+            self.segments = []
+        for field, value in packed.items():
+            setattr(self, field, value)
+        # A document loaded by without_segments() holds defaults for these, so
+        # assigning the same value would not count as a change; mark them all
+        # so save() $sets this format and $unsets the other
+        for field in SEGMENT_FIELDS + ("segment_count",):
+            self._mark_as_changed(field)
 
 # ======================
 # Knowledge Graph Node
@@ -38,6 +111,15 @@ class KnowledgeGraphNode(Document):
 	code = StringField(unique=True)
 	createdAt = DateTimeField(default=datetime.utcnow)
 	videos = ListField(StringField()) # URLs to videos
+	# created/reconciled by `python -m app.manage_indexes`
+	meta = {
+		'indexes': [
+			('subject', 'title', 'id'),        # subject topic listing (title, _id cursor order)
+			('subject', 'difficulty_level'),   # topics by subject and level
+			'title',                           # node resolution by title
+			'keywords'                         # keyword search (multikey)
+		]
+	}
 	
 
 # ======================
@@ -76,6 +158,11 @@ class QuizQuestion(Document):
 	student_ID = ReferenceField(Student)
 	response_time_expected = FloatField() # in seconds
 	category = StringField(choices=["why", "what", "when", "where", "who", "how"])
+	meta = {
+		'indexes': [
+			'KG_Node_ID'
+		]
+	}
 	
 # ======================
 # Quiz
@@ -92,6 +179,11 @@ class Quiz(Document):
 	quiz_type = StringField(choices=["final", "progress"], required=True)
 	level = StringField(choices=["base", "level_1", "level_2"], required=True)
 	created_at = DateTimeField(default=datetime.utcnow)
+	meta = {
+		'indexes': [
+			('KG_Node_ID', 'quiz_type')        # progress quiz lookup and has_quiz checks
+		]
+	}
 
 # ======================
 # Study Material
@@ -151,4 +243,69 @@ class CognitiveProfile(Document):
 	response_time_avg = FloatField()
 	review_recall_rate = FloatField()
 	createdAt = DateTimeField(default=datetime.utcnow)
-	updatedAt = DateTimeField(default=datetime.utcnow)
\ No newline at end of file
+	updatedAt = DateTimeField(default=datetime.utcnow)
+
+# ======================
+# Graph State
+# ======================
+
+# single document holding a version counter that is bumped whenever the
+# knowledge graph (nodes, attached videos or quizzes) changes
+class GraphState(Document):
+	key = StringField(required=True, unique=True)
+	version = IntField(default=0)
+	updatedAt = DateTimeField(default=datetime.utcnow)
+
+# ======================
+# Subject Catalogue
+# ======================
+
+# precomputed GET /api/subjects payload, valid while graph_version matches
+class SubjectCatalogue(Document):
+	key = StringField(required=True, unique=True)
+	graph_version = IntField(required=True)
+	subjects = ListField(DictField())
+	computedAt = DateTimeField(default=datetime.utcnow)
+
+# ======================
+# LLM Response Cache
+# ======================
+
+# content-addressed LLM responses (see app/kg_pipeline/llm_cache.py);
+# the TTL index lets MongoDB drop expired entries
+class LLMCacheEntry(Document):
+	key = StringField(required=True, unique=True)
+	value = DictField()
+	expires_at = DateTimeField(required=True)
+	last_used = DateTimeField(default=datetime.utcnow)
+	meta = {
+		'indexes': [
+			{'fields': ['expires_at'], 'expireAfterSeconds': 0},
+			'last_used'
+		]
+	}
+
+# ======================
+# Content Jobs
+# ======================
+
+# background content-preparation jobs (app/content_jobs.py), readable by every
+# server process; the TTL index drops them once they are past retention
+class ContentJobRecord(Document):
+	job_id = StringField(required=True, unique=True)
+	key = StringField(required=True)   # request parameters; identical requests share a job
+	params = DictField()
+	status = StringField(choices=["queued", "running", "done", "error"], required=True, default="queued")
+	events = ListField(DictField())    # [{"stage", "message", "at"}]
+	result = DictField()
+	error = StringField()
+	created_at = FloatField()
+	finished_at = FloatField()
+	expires_at = DateTimeField(required=True)
+	meta = {
+		'collection': 'content_jobs',
+		'indexes': [
+			('key', 'status'),             # joining an identical queued/running job
+			{'fields': ['expires_at'], 'expireAfterSeconds': 0}
+		]
+	}
@@ -0,0 +1,19 @@
+# app/preload.py
+import time
+from app.graph_snapshot import get_snapshot
+from app.topic_search import get_search_index
+from app.topic_suggest import get_suggest_index
+
+
+def preload():
+    """Build the graph snapshot, search and suggestion indexes up front."""
+    start = time.perf_counter()
+    for name, build in (("graph snapshot", get_snapshot),
+                        ("search index", get_search_index),
+                        ("suggest index", get_suggest_index)):
+        try:
+            build()
+        except Exception as e:
+            # The server still starts; the view is built on first use instead
+            print(f"[preload] Could not preload {name}: {e}")
+    print(f"[preload] Preloaded graph views in {time.perf_counter() - start:.2f}s")
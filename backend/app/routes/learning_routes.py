@@ -1,21 +1,55 @@
 # app/routes/learning_routes.py
-from flask import Blueprint, jsonify, request
-from app.models import KnowledgeGraphNode, VideoTranscript, Quiz, QuizQuestion
-from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz
-from bson import ObjectId
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from app.models import KnowledgeGraphNode, VideoTranscript, Quiz
+from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz, get_cached_topic_content
+from app.content_jobs import submit_content_job, get_content_job
+from app.catalogue import get_subject_catalogue
+from app.topic_search import search_topics as search_topic_index
+from app.topic_suggest import suggest_topics
+from app.http_cache import cached_response
+from app.db_metrics import db_metrics
+from app.learning_api import (
+    invalid_parameters, quiz_node_filter, topics_cache_key, parse_topic_listing, topic_listing_find,
+    split_topic_page, no_topics_payload, topic_listing_payload, parse_content_request, format_topic_content,
+    content_error, pending_job, job_payload, unknown_job, job_events, search_cache_key, parse_search,
+    search_query_required, search_payload, parse_suggest, suggest_payload, subjects_payload
+)
+from app.transcript_api import (
+    TRANSCRIPT_PROJECTION, parse_include_transcript, parse_transcript_query, transcript_response
+)
 
 learning_bp = Blueprint('learning', __name__)
 
+
+def get_quiz_node_ids(node_ids):
+    """
+    Return the set of KG node ids (ObjectId) that have at least one quiz.
+    
+    Resolves every node in a single `distinct` query instead of one
+    `Quiz.objects(...).first()` round-trip per node.
+    """
+    if not node_ids:
+        return set()
+    return set(Quiz._get_collection().distinct('KG_Node_ID', quiz_node_filter(node_ids)))
+
 # ================================================================
 # TASK 1: GET ALL SUBTOPICS FOR A SUBJECT
 # ================================================================
 
 @learning_bp.route('/api/subjects/<subject_name>/topics', methods=['GET'])
+@cached_response(lambda subject_name: topics_cache_key(subject_name, request.args))
 def get_subject_topics(subject_name):
     """
-    Get all topics/nodes for a specific subject.
+    Get all topics/nodes for a specific subject, ordered by title.
+    
+    Query Parameters:
+        - fields: Comma-separated output fields to return (optional), e.g. code,title,has_quiz
+        - view: "summary" for a compact list-view field set, "full" (default) for everything
+        - limit: Page size (optional, max 200); without it every topic is returned
+        - cursor: next_cursor from the previous page
     
     Example: GET /api/subjects/Physics/topics
+             GET /api/subjects/Physics/topics?view=summary&limit=50
     
     Returns:
         {
@@ -34,7 +68,8 @@ def get_subject_topics(subject_name):
                 },
                 ...
             ],
-            "total_topics": 15
+            "total_topics": 15,
+            "next_cursor": "..."   # only when paginating; null on the last page
         }
     """
     try:
@@ -42,49 +77,30 @@ def get_subject_topics(subject_name):
         # Normalize subject name (case-insensitive)
         subject_name = subject_name.strip().title()
         
-        # Query all nodes for this subject
-        nodes = KnowledgeGraphNode.objects(subject=subject_name).order_by('title')
-        
-        if not nodes:
+        try:
+            fields, limit, after = parse_topic_listing(request.args)
+        except ValueError as e:
             return jsonify({
                 "success": False,
-                "message": f"No topics found for subject: {subject_name}",
-                "subject": subject_name,
-                "topics": [],
-                "total_topics": 0
-            }), 404
+                "message": str(e),
+                "subject": subject_name
+            }), 400
         
-        # Format topics data
-        topics_list = []
-        for node in nodes:
-            # Check if node has videos
-            has_video = bool(node.videos and len(node.videos) > 0)
-            
-            # Check if node has quiz
-            has_quiz = Quiz.objects(KG_Node_ID=node).first() is not None
-            
-            topic_data = {
-                "code": node.code,
-                "title": node.title,
-                "description": node.description or "",
-                "difficulty_level": node.difficulty_level,
-                "has_video": has_video,
-                "has_quiz": has_quiz,
-                "video_count": len(node.videos) if node.videos else 0,
-                "keywords": node.keywords or [],
-                "objectives": node.objectives or [],
-                "estimated_hours": node.estimated_hours or 0,
-                "prerequisites": node.prerequisites or [],
-                "next_topics": node.next_topics or []
-            }
-            topics_list.append(topic_data)
+        # Load only the model fields the requested output fields are built from
+        nodes_collection = KnowledgeGraphNode._get_collection()
+        page = topic_listing_find(subject_name, fields, limit, after)
+        nodes, has_more = split_topic_page(
+            [KnowledgeGraphNode._from_son(doc) for doc in nodes_collection.find(**page)], limit
+        )
         
-        return jsonify({
-            "success": True,
-            "subject": subject_name,
-            "topics": topics_list,
-            "total_topics": len(topics_list)
-        }), 200
+        if not nodes and not after:
+            return jsonify(no_topics_payload(subject_name)), 404
+        
+        # Resolve has_quiz for the whole page in one query (only if requested)
+        quiz_node_ids = get_quiz_node_ids([node.id for node in nodes]) if 'has_quiz' in fields else set()
+        total = nodes_collection.count_documents({"subject": subject_name}) if limit else None
+        
+        return jsonify(topic_listing_payload(subject_name, nodes, fields, quiz_node_ids, limit, has_more, total)), 200
         
     except Exception as e:
         return jsonify({
@@ -102,60 +118,49 @@ def get_subject_topics(subject_name):
 def get_topic_content(topic_code):
     """
     Get video and quiz for a specific topic.
-    Uses the smart_video_fetcher to fetch/generate content.
+    
+    Content that is already stored is returned immediately (200). Otherwise
+    a background job is queued to fetch/generate it and the response is
+    202 with a job id; poll GET /api/jobs/<job_id> or stream
+    GET /api/jobs/<job_id>/stream until it is done.
+    
+    Query Parameters:
+        - num_questions, force_regenerate, validate_llm, revalidate
+        - wait: "true" to prepare content synchronously in this request
+        - include_transcript: "full" (default), "preview" (first
+          TRANSCRIPT_PREVIEW_CHARS characters) or "none"; the segments are
+          served by GET /api/videos/<youtube_id>/transcript
     """
     try:
-        # Query parameters
-        num_questions = int(request.args.get('num_questions', 10))
-        force_regenerate = request.args.get('force_regenerate', 'false').lower() == 'true'
-        validate_llm = request.args.get('validate_llm', 'true').lower() == 'true'
+        job_params, include_transcript, wait = parse_content_request(topic_code, request.args)
         
         print(f"[API] Fetching content for topic: {topic_code}")
         
-        # Fetch video and quiz
-        result = get_video_transcript_and_quiz(
-            code_or_topic=topic_code,
-            num_questions=num_questions,
-            validate_with_llm=validate_llm,
-            force_regenerate_quiz=force_regenerate
-        )
+        # Fast path: everything is already stored
+        if not (job_params['force_regenerate_quiz'] or job_params['force_revalidate']):
+            cached = get_cached_topic_content(
+                topic_code, job_params['num_questions'], validate_with_llm=job_params['validate_with_llm']
+            )
+            if cached:
+                return jsonify(format_topic_content(topic_code, cached, include_transcript)), 200
         
-        # Handle error from fetcher
-        if result.get('status') == 'error':
-            return jsonify({
-                "success": False,
-                "error": result.get('error', 'Unknown error'),
-                "message": "Failed to fetch topic content",
-                "topic_code": topic_code
-            }), 404
+        if wait:
+            # Fetch video and quiz in this request
+            result = get_video_transcript_and_quiz(**job_params)
+            
+            # Handle error from fetcher
+            if result.get('status') == 'error':
+                return jsonify(content_error(topic_code, result)), 404
+            return jsonify(format_topic_content(topic_code, result, include_transcript)), 200
         
-        # Topic title
-        node = KnowledgeGraphNode.objects(code=topic_code).first()
-        topic_title = node.title if node else topic_code
-        
-        return jsonify({
-            "success": True,
-            "topic_code": topic_code,
-            "topic_title": topic_title,
-            "youtube_url": result.get('youtube_url'),
-            "youtube_id": result.get('youtube_id'),
-            "transcript": result.get('transcript', ''),
-            "quiz": result.get('quiz', []),
-            "video_status": result.get('video_status', 'unknown'),
-            "quiz_status": result.get('quiz_status', 'unknown'),
-            "confidence": result.get('confidence', 0.0),
-            "educational_quality": result.get('educational_quality', 'unknown'),
-            "num_questions": result.get('num_questions', 0),
-            "quiz_id": result.get('quiz_id'),
-            "topic": result.get('topic')
-        }), 200
+        job = submit_content_job(**job_params)
+        pending = pending_job(topic_code, job, include_transcript)
+        response = jsonify(pending)
+        response.headers['Location'] = pending["status_url"]
+        return response, 202
         
     except ValueError as ve:
-        return jsonify({
-            "success": False,
-            "error": str(ve),
-            "message": "Invalid request parameters"
-        }), 400
+        return jsonify(invalid_parameters(ve)), 400
     except Exception as e:
         print(f"[API ERROR] Failed to fetch content for {topic_code}: {e}")
         return jsonify({
@@ -165,12 +170,100 @@ def get_topic_content(topic_code):
         }), 500
 
 
+@learning_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """
+    Poll a content-preparation job.
+    
+    Returns:
+        {
+            "success": true,
+            "job_id": "...",
+            "status": "queued" | "running" | "done" | "error",
+            "events": [{"stage": "searching", "message": "...", "at": 1700000000.0}, ...],
+            "content": {...}   # same shape as /api/topics/<code>/content, once done
+        }
+    
+    Query Parameters:
+        - include_transcript: as for /api/topics/<code>/content (the
+          status_url of a 202 response already carries it)
+    """
+    try:
+        include_transcript = parse_include_transcript(request.args.get('include_transcript'))
+    except ValueError as ve:
+        return jsonify(invalid_parameters(ve)), 400
+    job = get_content_job(job_id)
+    if not job:
+        return jsonify(unknown_job(job_id)), 404
+    return jsonify(job_payload(job, include_transcript)), 200
+
+
+@learning_bp.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """
+    Stream a job's progress as Server-Sent Events: one "progress" event per
+    pipeline stage, then a final "done" event carrying the job payload
+    (include_transcript as for GET /api/jobs/<job_id>).
+    """
+    try:
+        include_transcript = parse_include_transcript(request.args.get('include_transcript'))
+    except ValueError as ve:
+        return jsonify(invalid_parameters(ve)), 400
+    job = get_content_job(job_id)
+    if not job:
+        return jsonify(unknown_job(job_id)), 404
+    
+    return Response(stream_with_context(job_events(job, include_transcript)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# ================================================================
+# TRANSCRIPT SEGMENTS
+# ================================================================
+
+@learning_bp.route('/api/videos/<youtube_id>/transcript', methods=['GET'])
+def get_video_transcript(youtube_id):
+    """
+    Timed transcript segments of a video, paged by index or selected by time.
+    Responses are gzip/brotli-compressed per Accept-Encoding; format=ndjson
+    streams them in chunks.
+    
+    Query Parameters:
+        - start, end: time window in seconds (segments overlapping it)
+        - offset, limit: first segment index and page size
+        - format: "json" (default) or "ndjson"
+    
+    Returns:
+        {
+            "success": true,
+            "youtube_id": "...",
+            "total_segments": 412,
+            "offset": 0,
+            "count": 50,
+            "next_offset": 50,     # null on the last page
+            "segments": [{"index": 0, "start": 0.0, "duration": 3.2, "text": "..."}, ...]
+        }
+        ndjson: the same object without "segments" on the first line, then one
+        segment per line.
+    """
+    try:
+        query = parse_transcript_query(request.args)
+    except ValueError as ve:
+        return jsonify(invalid_parameters(ve)), 400
+    
+    doc = VideoTranscript._get_collection().find_one({'youtube_id': youtube_id}, TRANSCRIPT_PROJECTION)
+    status, body, mimetype, headers = transcript_response(
+        youtube_id, doc, query, request.headers.get('Accept-Encoding')
+    )
+    return Response(body, status=status, mimetype=mimetype, headers=headers)
+
 
 # ================================================================
 # BONUS: GET ALL AVAILABLE SUBJECTS
 # ================================================================
 
 @learning_bp.route('/api/subjects', methods=['GET'])
+@cached_response()
 def get_all_subjects():
     """
     Get list of all available subjects.
@@ -191,39 +284,8 @@ def get_all_subjects():
     """
     try:
         print("[API] Fetching all subjects")
-        # Get all unique subjects
-        pipeline = [
-            {"$group": {
-                "_id": "$subject",
-                "topic_count": {"$sum": 1},
-                "total_videos": {"$sum": {"$size": {"$ifNull": ["$videos", []]}}
-                }
-            }},
-            {"$sort": {"_id": 1}}
-        ]
-        
-        subjects_data = list(KnowledgeGraphNode.objects.aggregate(pipeline))
-        
-        subjects_list = []
-        for subj in subjects_data:
-            subject_name = subj['_id']
-            
-            # Count quizzes for this subject
-            subject_nodes = KnowledgeGraphNode.objects(subject=subject_name)
-            quiz_count = Quiz.objects(KG_Node_ID__in=subject_nodes).count()
-            
-            subjects_list.append({
-                "name": subject_name,
-                "topic_count": subj['topic_count'],
-                "total_videos": subj['total_videos'],
-                "total_quizzes": quiz_count
-            })
-        
-        return jsonify({
-            "success": True,
-            "subjects": subjects_list,
-            "total_subjects": len(subjects_list)
-        }), 200
+        # Counts come from one aggregation, cached until the graph changes
+        return jsonify(subjects_payload(get_subject_catalogue())), 200
         
     except Exception as e:
         return jsonify({
@@ -238,13 +300,19 @@ def get_all_subjects():
 # ================================================================
 
 @learning_bp.route('/api/topics/search', methods=['GET'])
+@cached_response(lambda: search_cache_key(request.args))
 def search_topics():
     """
     Search for topics across all subjects.
     
+    Results come from the in-memory search index (app/topic_search.py),
+    ranked by relevance; partial words and small typos still match.
+    
     Query Parameters:
         - q: Search query (required)
         - subject: Filter by subject (optional)
+        - limit: Page size (default: 20, max: 100)
+        - offset: Number of results to skip (default: 0)
     
     Example: GET /api/topics/search?q=newton&subject=Physics
     
@@ -258,63 +326,111 @@ def search_topics():
                     "title": "Newton's Laws of Motion",
                     "subject": "Physics",
                     "description": "...",
+                    "score": 2.43,
                     ...
                 }
             ],
-            "total_results": 3
+            "total_results": 3,
+            "limit": 20,
+            "offset": 0
         }
     """
     try:
-        query = request.args.get('q', '').strip()
-        subject_filter = request.args.get('subject', '').strip()
+        try:
+            query, subject_filter, limit, offset = parse_search(request.args)
+        except ValueError as ve:
+            return jsonify(invalid_parameters(ve)), 400
         
         if not query:
-            return jsonify({
-                "success": False,
-                "message": "Search query is required"
-            }), 400
-        
-        # Build search filter
-        search_filter = {
-            "$or": [
-                {"title": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"keywords": {"$regex": query, "$options": "i"}}
-            ]
-        }
-        
-        if subject_filter:
-            search_filter["subject"] = subject_filter.title()
+            return jsonify(search_query_required()), 400
         
         # Search nodes
-        nodes = KnowledgeGraphNode.objects(__raw__=search_filter).limit(20)
+        total, hits = search_topic_index(query, subject=subject_filter, limit=limit, offset=offset)
+        quiz_node_ids = get_quiz_node_ids([node["_id"] for node, _ in hits])
         
-        results = []
-        for node in nodes:
-            has_video = bool(node.videos and len(node.videos) > 0)
-            has_quiz = Quiz.objects(KG_Node_ID=node).first() is not None
-            
-            results.append({
-                "code": node.code,
-                "title": node.title,
-                "subject": node.subject,
-                "description": node.description or "",
-                "difficulty_level": node.difficulty_level,
-                "has_video": has_video,
-                "has_quiz": has_quiz,
-                "keywords": node.keywords or []
-            })
+        return jsonify(search_payload(query, total, hits, quiz_node_ids, limit, offset)), 200
         
+    except Exception as e:
         return jsonify({
-            "success": True,
-            "query": query,
-            "results": results,
-            "total_results": len(results)
-        }), 200
+            "success": False,
+            "error": str(e),
+            "message": "Search failed"
+        }), 500
+
+
+# ================================================================
+# HELPER ENDPOINT: AUTOCOMPLETE
+# ================================================================
+
+@learning_bp.route('/api/topics/suggest', methods=['GET'])
+def suggest_topic_titles():
+    """
+    Autocomplete topic titles and keywords as the user types.
+    
+    Served from the in-memory prefix index (app/topic_suggest.py), so no
+    database query is made per keystroke.
+    
+    Query Parameters:
+        - q: What the user has typed so far
+        - subject: Filter by subject (optional)
+        - limit: Number of suggestions (default: 8, max: 20)
+    
+    Example: GET /api/topics/suggest?q=newt
+    
+    Returns:
+        {
+            "success": true,
+            "query": "newt",
+            "suggestions": [
+                {"text": "Newton's Laws of Motion", "type": "topic", "code": "PHY_NEWTON_LAWS", "subject": "Physics", "score": 21.0},
+                {"text": "Newton's laws", "type": "keyword", "code": null, "subject": null, "score": 10.0}
+            ]
+        }
+    """
+    try:
+        try:
+            query, subject_filter, limit = parse_suggest(request.args)
+        except ValueError as ve:
+            return jsonify(invalid_parameters(ve)), 400
+        
+        return jsonify(suggest_payload(query, suggest_topics(query, limit=limit, subject=subject_filter))), 200
         
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e),
-            "message": "Search failed"
-        }), 500
\ No newline at end of file
+            "message": "Suggestions failed"
+        }), 500
+
+
+# ================================================================
+# OPERATIONS: DATABASE METRICS
+# ================================================================
+
+@learning_bp.route('/api/metrics/db', methods=['GET'])
+def get_db_metrics():
+    """
+    MongoDB command and connection-pool metrics for this process, collected
+    by the pymongo listeners in app/db_metrics.py.
+    
+    Query Parameters:
+        - reset: "true" to start a new measurement window after reading
+    
+    Returns:
+        {
+            "success": true,
+            "since": 1700000000.0,
+            "collections": {
+                "knowledge_graph_node": {
+                    "find": {"count": 120, "failures": 0, "avg_ms": 1.2, "max_ms": 9.8,
+                             "p50_ms": 1, "p95_ms": 5, "p99_ms": 10}
+                }
+            },
+            "pools": {
+                "localhost:27017": {"open": 4, "checked_out": 1, "created": 4, "closed": 0, "cleared": 0,
+                                    "checkout_failures": {}, "checkout_wait": {...}}
+            }
+        }
+    """
+    reset = request.args.get('reset', 'false').lower() == 'true'
+    return jsonify({"success": True, **db_metrics(reset=reset)}), 200
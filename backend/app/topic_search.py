@@ -0,0 +1,223 @@
+# app/topic_search.py
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from app.models import KnowledgeGraphNode
+from app.graph_state import get_graph_version
+from app.graph_snapshot import SNAPSHOT_MAX_AGE
+from app.kg_pipeline.relevance import stem
+
+# BM25F field weights and length normalisation
+FIELD_WEIGHTS = {"title": 3.0, "keywords": 2.0, "description": 1.0}
+FIELD_B = {"title": 0.5, "keywords": 0.3, "description": 0.75}
+BM25_K1 = 1.2
+
+# Score multipliers for query terms that only match approximately
+PREFIX_WEIGHT = 0.6
+FUZZY_WEIGHT = 0.5
+MAX_EXPANSIONS = 20        # vocabulary terms a single prefix/typo may expand to
+MIN_PREFIX_LEN = 2
+MIN_FUZZY_LEN = 4          # shorter tokens are too ambiguous to correct
+
+# Node fields kept in the index (enough to render search results)
+DOC_FIELDS = ("_id", "code", "title", "subject", "description", "difficulty_level", "keywords", "videos")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the to what when where which who why with".split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return [stem(t) for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def _deletes(term):
+    """The term with each single character removed (for typo lookups)."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment distance, or max_distance + 1 once it is exceeded."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class TopicSearchIndex:
+    """
+    In-memory inverted index over node titles, keywords and descriptions,
+    ranked with BM25F.
+
+    Query terms match exactly, by prefix (so "newt" finds "newton") or
+    within one edit (so "newtn" does too); approximate matches score less.
+    """
+
+    def __init__(self, docs, version=0):
+        self.version = version
+        self.docs = []
+        self.postings = defaultdict(dict)       # term -> {doc index: {field: tf}}
+        self.lengths = {f: [] for f in FIELD_WEIGHTS}
+        for doc in docs:
+            if not doc.get("code"):
+                continue
+            i = len(self.docs)
+            self.docs.append({f: doc.get(f) for f in DOC_FIELDS})
+            for field in FIELD_WEIGHTS:
+                value = doc.get(field)
+                tokens = tokenize(" ".join(value) if isinstance(value, list) else value)
+                self.lengths[field].append(len(tokens))
+                for term in tokens:
+                    fields = self.postings[term].setdefault(i, {})
+                    fields[field] = fields.get(field, 0) + 1
+        self.avg_lengths = {f: (sum(v) / len(v) if v else 0.0) or 1.0 for f, v in self.lengths.items()}
+        self.vocabulary = sorted(self.postings)
+        self.delete_index = defaultdict(set)
+        for term in self.vocabulary:
+            if len(term) >= MIN_FUZZY_LEN - 1:
+                self.delete_index[term].add(term)
+                for variant in _deletes(term):
+                    self.delete_index[variant].add(term)
+
+    @classmethod
+    def load(cls, version=None):
+        """Index every KnowledgeGraphNode with one projected query."""
+        if version is None:
+            version = get_graph_version()
+        cursor = KnowledgeGraphNode._get_collection().find({}, {f: 1 for f in DOC_FIELDS})
+        return cls(cursor, version=version)
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ---------------- query expansion ----------------
+
+    def _prefix_terms(self, token):
+        start = bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:start + MAX_EXPANSIONS + 1]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                terms.append(term)
+        return terms[:MAX_EXPANSIONS]
+
+    def _fuzzy_terms(self, token):
+        if len(token) < MIN_FUZZY_LEN:
+            return []
+        candidates = set(self.delete_index.get(token, ()))
+        for variant in _deletes(token):
+            candidates |= self.delete_index.get(variant, set())
+        candidates.discard(token)
+        return sorted(t for t in candidates if edit_distance(token, t, 1) <= 1)[:MAX_EXPANSIONS]
+
+    def expand(self, token):
+        """
+        [(term, weight)] a query token matches: itself and longer terms it
+        prefixes, or, when neither exists, terms one edit away (typos).
+        """
+        expansions = {}
+        if token in self.postings:
+            expansions[token] = 1.0
+        if len(token) >= MIN_PREFIX_LEN:
+            for term in self._prefix_terms(token):
+                expansions.setdefault(term, PREFIX_WEIGHT)
+        if not expansions:
+            for term in self._fuzzy_terms(token):
+                expansions.setdefault(term, FUZZY_WEIGHT)
+        return list(expansions.items())
+
+    # ---------------- scoring ----------------
+
+    def _term_scores(self, term):
+        """BM25F score of `term` for every document containing it."""
+        postings = self.postings[term]
+        idf = math.log(1 + (len(self.docs) - len(postings) + 0.5) / (len(postings) + 0.5))
+        scores = {}
+        for i, fields in postings.items():
+            tf = sum(
+                FIELD_WEIGHTS[f] * n / (1 - FIELD_B[f] + FIELD_B[f] * self.lengths[f][i] / self.avg_lengths[f])
+                for f, n in fields.items()
+            )
+            scores[i] = idf * tf / (BM25_K1 + tf)
+        return scores
+
+    def search(self, query, subject=None, limit=20, offset=0):
+        """
+        Rank nodes for a free-text query.
+
+        Every query token must match (exactly, by prefix or by typo) for a
+        node to be returned; a token's contribution is its best match.
+
+        Returns:
+            (total matches, [(doc dict, score), ...] for the requested page)
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return 0, []
+
+        scores = None
+        for token in tokens:
+            token_scores = {}
+            for term, weight in self.expand(token):
+                for i, s in self._term_scores(term).items():
+                    if weight * s > token_scores.get(i, 0.0):
+                        token_scores[i] = weight * s
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {i: s + token_scores[i] for i, s in scores.items() if i in token_scores}
+            if not scores:
+                return 0, []
+
+        if subject:
+            subject = subject.strip().lower()
+            scores = {i: s for i, s in scores.items() if (self.docs[i]["subject"] or "").lower() == subject}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.docs[item[0]]["title"] or ""))
+        page = ranked[offset:offset + limit] if limit else ranked[offset:]
+        return len(ranked), [(self.docs[i], round(s, 4)) for i, s in page]
+
+
+_index = None
+_build_lock = threading.Lock()
+
+
+def get_search_index(max_age=SNAPSHOT_MAX_AGE):
+    """
+    Return the process-wide search index, rebuilding it (off to the side,
+    then swapped in) when the graph version has moved on.
+    """
+    global _index
+
+    version = get_graph_version(max_age=max_age)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _build_lock:
+        index = _index
+        if index is None or index.version != version:
+            index = TopicSearchIndex.load(version=version)
+            _index = index
+            print(f"[topic_search] Indexed graph v{version}: {len(index)} nodes, {len(index.vocabulary)} terms")
+    return index
+
+
+def search_topics(query, subject=None, limit=20, offset=0):
+    """Search the current graph; see TopicSearchIndex.search."""
+    return get_search_index().search(query, subject=subject, limit=limit, offset=offset)
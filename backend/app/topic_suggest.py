@@ -0,0 +1,245 @@
+# app/topic_suggest.py
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from app.models import KnowledgeGraphNode
+from app.graph_state import get_graph_version
+from app.graph_snapshot import SNAPSHOT_MAX_AGE
+
+# Node fields needed to build suggestions
+SUGGEST_FIELDS = ("code", "title", "subject", "keywords", "next_topics", "videos")
+
+MAX_KEY_WORDS = 6          # a title is also suggested from each of its first words onward
+START_BONUS = 2.0          # typing the start of a title/keyword beats matching a later word
+TOPIC_BONUS = 1.5          # topics (navigable) rank above bare keywords of equal popularity
+CACHED_PREFIX_LEN = 2      # top-k results for prefixes this short are memoised
+
+_NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+_END = "\uffff"
+
+
+def normalize(text):
+    return _NORMALIZE_RE.sub(" ", (text or "").lower()).strip()
+
+
+def prefix_keys(text):
+    """Normalised text from each of its first MAX_KEY_WORDS words onward: [(key, starts_text)]."""
+    words = normalize(text).split()
+    return [(" ".join(words[i:]), i == 0) for i in range(min(len(words), MAX_KEY_WORDS))]
+
+
+def node_keywords(node):
+    """{normalised keyword: display text} for a node, without duplicates."""
+    keywords = {}
+    for display in node.get("keywords") or []:
+        kw = normalize(display)
+        if kw:
+            keywords.setdefault(kw, display)
+    return keywords
+
+
+def node_popularity(node):
+    """How central a topic is: more dependents and attached videos rank it higher."""
+    return 1.0 + len(node.get("next_topics") or []) + 2.0 * len(node.get("videos") or [])
+
+
+def _fingerprint(node):
+    return (node.get("title"), node.get("subject"), tuple(node.get("keywords") or ()),
+            len(node.get("next_topics") or ()), len(node.get("videos") or ()))
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index over topic titles and keywords.
+
+    `entries` is a sorted list of (key, kind, ref, starts_text) tuples, where
+    kind is "topic" (ref = node code) or "keyword" (ref = normalised
+    keyword); all entries matching a prefix form one contiguous slice found
+    with two bisections. Updates re-tokenise only the nodes that changed and
+    merge their entries into the existing array.
+    """
+
+    def __init__(self, version=0):
+        self.version = version
+        self.nodes = {}                  # code -> summary dict
+        self.fingerprints = {}           # code -> fingerprint of the indexed fields
+        self.keywords = {}               # normalised keyword -> display text
+        self.keyword_subjects = {}       # normalised keyword -> Counter(subject)
+        self.entries = []
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @classmethod
+    def build(cls, nodes, version=0):
+        return cls().updated(nodes, version=version, complete=True)
+
+    @classmethod
+    def load(cls, version=None):
+        if version is None:
+            version = get_graph_version()
+        cursor = KnowledgeGraphNode._get_collection().find({}, {"_id": 0, **{f: 1 for f in SUGGEST_FIELDS}})
+        return cls.build(cursor, version=version)
+
+    # ---------------- updates ----------------
+
+    def _node_entries(self, node):
+        return [(key, "topic", node["code"], start) for key, start in prefix_keys(node["title"])]
+
+    def _keyword_entries(self, keyword):
+        return [(key, "keyword", keyword, start) for key, start in prefix_keys(keyword)]
+
+    def updated(self, nodes, version, complete=True):
+        """
+        Return a new index with `nodes` applied; the current one is left
+        untouched for readers still using it.
+
+        Args:
+            nodes: node dicts with SUGGEST_FIELDS
+            complete: `nodes` is the whole graph, so codes missing from it
+                      are removed (otherwise only upserts are applied)
+        """
+        new = SuggestIndex(version)
+        new.nodes = dict(self.nodes)
+        new.fingerprints = dict(self.fingerprints)
+        new.keywords = dict(self.keywords)
+        new.keyword_subjects = {k: Counter(v) for k, v in self.keyword_subjects.items()}
+
+        removed, added = set(), []
+        seen = set()
+
+        def drop(code):
+            old = new.nodes.pop(code)
+            del new.fingerprints[code]
+            removed.update(self._node_entries(old))
+            for kw in node_keywords(old):
+                counts = new.keyword_subjects[kw]
+                counts[old.get("subject")] -= 1
+                if sum(counts.values()) <= 0:
+                    removed.update(self._keyword_entries(kw))
+                    del new.keyword_subjects[kw]
+                    del new.keywords[kw]
+
+        for node in nodes:
+            code = node.get("code")
+            if not code or not node.get("title") or code in seen:
+                continue
+            seen.add(code)
+            fingerprint = _fingerprint(node)
+            if new.fingerprints.get(code) == fingerprint:
+                continue
+            if code in new.nodes:
+                drop(code)
+            summary = {f: node.get(f) for f in SUGGEST_FIELDS}
+            summary["popularity"] = node_popularity(node)
+            new.nodes[code] = summary
+            new.fingerprints[code] = fingerprint
+            added.extend(self._node_entries(summary))
+            for kw, display in node_keywords(node).items():
+                if kw not in new.keyword_subjects:
+                    new.keyword_subjects[kw] = Counter()
+                    new.keywords[kw] = display
+                    added.extend(self._keyword_entries(kw))
+                new.keyword_subjects[kw][node.get("subject")] += 1
+
+        if complete:
+            for code in [c for c in new.nodes if c not in seen]:
+                drop(code)
+
+        # Entries dropped and re-added in the same update (e.g. a keyword
+        # still used by other nodes) cancel out
+        added_set = set(added)
+        removed -= added_set
+        kept = (e for e in self.entries if e not in removed and e not in added_set)
+        new.entries = list(heapq.merge(kept, sorted(added_set)))
+        return new
+
+    # ---------------- queries ----------------
+
+    def _score(self, entry, subject):
+        key, kind, ref, start = entry
+        if kind == "topic":
+            node = self.nodes[ref]
+            if subject and (node["subject"] or "").lower() != subject:
+                return 0.0
+            score = node["popularity"] * TOPIC_BONUS
+        else:
+            counts = self.keyword_subjects[ref]
+            score = float(sum(c for s, c in counts.items() if (s or "").lower() == subject) if subject
+                          else sum(counts.values()))
+        return score * (START_BONUS if start else 1.0)
+
+    def suggest(self, prefix, limit=8, subject=None):
+        """
+        Top `limit` suggestions whose title/keyword (or one of its words)
+        starts with `prefix`, by popularity.
+
+        Returns:
+            [{"text", "type": "topic"|"keyword", "code", "subject", "score"}]
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        subject = subject.strip().lower() if subject else None
+        cache_key = (prefix, limit, subject)
+        if len(prefix) <= CACHED_PREFIX_LEN and cache_key in self._cache:
+            return self._cache[cache_key]
+
+        lo = bisect_left(self.entries, (prefix,))
+        hi = bisect_left(self.entries, (prefix + _END,), lo)
+        best = {}   # (kind, ref) -> best score among that item's matching keys
+        for entry in self.entries[lo:hi]:
+            score = self._score(entry, subject)
+            item = (entry[1], entry[2])
+            if score > best.get(item, 0.0):
+                best[item] = score
+
+        # nlargest keeps entry order (alphabetical) among equal scores
+        top = heapq.nlargest(limit, best.items(), key=lambda kv: kv[1])
+        results = []
+        for (kind, ref), score in top:
+            if kind == "topic":
+                node = self.nodes[ref]
+                results.append({"text": node["title"], "type": "topic", "code": ref,
+                                "subject": node["subject"], "score": score})
+            else:
+                results.append({"text": self.keywords[ref], "type": "keyword", "code": None,
+                                "subject": subject.title() if subject else None, "score": score})
+        if len(prefix) <= CACHED_PREFIX_LEN:
+            self._cache[cache_key] = results
+        return results
+
+
+_index = None
+_build_lock = threading.Lock()
+
+
+def get_suggest_index(max_age=SNAPSHOT_MAX_AGE):
+    """
+    Return the process-wide suggestion index. When the graph version moves
+    on (e.g. after the uploader upserts nodes) the current nodes are
+    re-read and only the ones that changed are re-indexed.
+    """
+    global _index
+
+    version = get_graph_version(max_age=max_age)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _build_lock:
+        index = _index
+        if index is None:
+            index = SuggestIndex.load(version=version)
+        elif index.version != version:
+            cursor = KnowledgeGraphNode._get_collection().find({}, {"_id": 0, **{f: 1 for f in SUGGEST_FIELDS}})
+            index = index.updated(cursor, version=version)
+        _index = index
+    return index
+
+
+def suggest_topics(prefix, limit=8, subject=None):
+    return get_suggest_index().suggest(prefix, limit=limit, subject=subject)
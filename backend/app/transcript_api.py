@@ -0,0 +1,169 @@
+# app/transcript_api.py
+"""
+Request parsing and response bodies for GET /api/videos/<youtube_id>/transcript,
+shared by the Flask blueprint and the ASGI app, plus the transcript
+preview used by the content endpoint.
+"""
+import json
+import os
+from app.http_compression import choose_encoding, compress_body, compress_chunks
+from app.transcript_store import SEGMENT_FIELDS, PackedSegments
+
+# Characters of transcript embedded by /content?include_transcript=preview
+TRANSCRIPT_PREVIEW_CHARS = int(os.getenv("TRANSCRIPT_PREVIEW_CHARS", "600"))
+# Segments per chunk when streaming NDJSON
+TRANSCRIPT_STREAM_CHUNK = int(os.getenv("TRANSCRIPT_STREAM_CHUNK", "50"))
+
+INCLUDE_TRANSCRIPT = ("none", "preview", "full")
+TRANSCRIPT_FORMATS = ("json", "ndjson")
+
+# Fields needed to rebuild the segments of either storage format
+TRANSCRIPT_PROJECTION = {"_id": 0, "youtube_id": 1, "full_text": 1, "segment_count": 1,
+                         **dict.fromkeys(SEGMENT_FIELDS, 1)}
+
+
+def parse_include_transcript(value):
+    value = (value or "full").strip().lower()
+    if value not in INCLUDE_TRANSCRIPT:
+        raise ValueError(f"Unknown include_transcript: {value} (expected one of {', '.join(INCLUDE_TRANSCRIPT)})")
+    return value
+
+
+def transcript_fields(text, include="full"):
+    """Transcript keys of the content response for ?include_transcript=none|preview|full."""
+    text = text or ""
+    if include == "none":
+        shown = ""
+    elif include == "preview" and len(text) > TRANSCRIPT_PREVIEW_CHARS:
+        # Cut at the last word boundary inside the limit
+        cut = text.rfind(" ", 0, TRANSCRIPT_PREVIEW_CHARS + 1)
+        shown = text[:cut if cut > 0 else TRANSCRIPT_PREVIEW_CHARS]
+    else:
+        shown = text
+    return {
+        "transcript": shown,
+        "transcript_length": len(text),
+        "transcript_truncated": len(shown) < len(text),
+    }
+
+
+def parse_transcript_query(args):
+    """
+    Segment selection from query parameters:
+        - start, end: time window in seconds (segments overlapping it)
+        - offset, limit: first segment index and page size; with a window,
+          paging continues from next_offset inside it
+        - format: "json" (default) or "ndjson" (streamed)
+
+    Raises:
+        ValueError: on malformed or out-of-range values
+    """
+    def number(name, cast):
+        value = args.get(name, "").strip()
+        if not value:
+            return None
+        try:
+            value = cast(value)
+        except ValueError:
+            raise ValueError(f"Invalid {name}: {args.get(name)}")
+        if value < 0:
+            raise ValueError(f"{name} must not be negative")
+        return value
+
+    query = {
+        "start": number("start", float),
+        "end": number("end", float),
+        "offset": number("offset", int) or 0,
+        "limit": number("limit", int),
+        "format": args.get("format", "json").strip().lower() or "json",
+    }
+    if query["limit"] is not None and query["limit"] < 1:
+        # An empty page would hand back next_offset == offset forever
+        raise ValueError("limit must be at least 1")
+    if query["format"] not in TRANSCRIPT_FORMATS:
+        raise ValueError(f"Unknown format: {query['format']} (expected one of {', '.join(TRANSCRIPT_FORMATS)})")
+    if query["start"] is not None and query["end"] is not None and query["end"] < query["start"]:
+        raise ValueError("end must not be before start")
+    return query
+
+
+def select_segments(segments, query):
+    """
+    Segments selected by a parsed query.
+
+    Returns:
+        (lo, hi, end): the page is segments[lo:hi]; the selection continues up to `end`
+    """
+    lo, end = 0, len(segments)
+    if query["start"] is not None or query["end"] is not None:
+        lo, end = segments.window(query["start"] or 0.0, float("inf") if query["end"] is None else query["end"])
+    lo = min(max(lo, query["offset"]), end)
+    hi = end if query["limit"] is None else min(end, lo + query["limit"])
+    return lo, hi, end
+
+
+def segment_dict(segments, i):
+    seg = segments[i]
+    return {"index": i, "start": round(seg.start, 3), "duration": round(seg.duration, 3), "text": seg.text}
+
+
+def _page_meta(youtube_id, segments, lo, hi, end):
+    return {
+        "success": True,
+        "youtube_id": youtube_id,
+        "total_segments": len(segments),
+        "offset": lo,
+        "count": hi - lo,
+        "next_offset": hi if hi < end else None,
+    }
+
+
+def transcript_payload(youtube_id, segments, lo, hi, end):
+    return {
+        **_page_meta(youtube_id, segments, lo, hi, end),
+        "segments": [segment_dict(segments, i) for i in range(lo, hi)],
+    }
+
+
+def transcript_ndjson(youtube_id, segments, lo, hi, end):
+    """
+    NDJSON body in chunks: a header line (the payload without segments),
+    then one line per segment, TRANSCRIPT_STREAM_CHUNK lines per chunk.
+    """
+    yield (json.dumps(_page_meta(youtube_id, segments, lo, hi, end)) + "\n").encode("utf-8")
+    for chunk_start in range(lo, hi, TRANSCRIPT_STREAM_CHUNK):
+        chunk_end = min(chunk_start + TRANSCRIPT_STREAM_CHUNK, hi)
+        lines = (json.dumps(segment_dict(segments, i)) for i in range(chunk_start, chunk_end))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def transcript_response(youtube_id, doc, query, accept_encoding):
+    """
+    The transcript endpoint's response for a parsed query and the document
+    read with TRANSCRIPT_PROJECTION (None when there is none).
+
+    Returns:
+        (status, body, mimetype, headers): body is bytes, or an iterator of
+        compressed chunks for format=ndjson
+    """
+    segments = PackedSegments.from_son(doc) if doc else None
+    if not segments:
+        body = json.dumps({"success": False, "message": f"No transcript segments for video: {youtube_id}"})
+        return 404, body.encode("utf-8"), "application/json", {}
+
+    lo, hi, end = select_segments(segments, query)
+    encoding = choose_encoding(accept_encoding)
+    headers = {"Vary": "Accept-Encoding"}
+
+    if query["format"] == "ndjson":
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        headers["X-Accel-Buffering"] = "no"
+        chunks = compress_chunks(transcript_ndjson(youtube_id, segments, lo, hi, end), encoding)
+        return 200, chunks, "application/x-ndjson", headers
+
+    body, applied = compress_body(json.dumps(transcript_payload(youtube_id, segments, lo, hi, end)).encode("utf-8"),
+                                  encoding)
+    if applied:
+        headers["Content-Encoding"] = applied
+    return 200, body, "application/json", headers
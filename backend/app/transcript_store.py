@@ -0,0 +1,162 @@
+# app/transcript_store.py
+"""
+Compact columnar storage for transcript segments.
+
+Instead of one embedded document per caption line, a VideoTranscript keeps
+
+    full_text           the segment texts joined with single spaces
+    segment_starts      float32 start times (seconds), little-endian bytes
+    segment_durations   float32 durations (seconds), little-endian bytes
+    segment_offsets     uint32 offset of each segment's text in full_text,
+                        plus one final offset (= len(full_text))
+
+so a 400-line transcript is three small binaries next to the text it
+already stores, and reading it decodes nothing until a segment is asked for.
+"""
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from collections.abc import Sequence
+
+# "compact" writes the columnar fields above, "embedded" the legacy
+# list of TranscriptSegment documents
+TRANSCRIPT_SEGMENT_STORAGE = os.getenv("TRANSCRIPT_SEGMENT_STORAGE", "compact")
+
+Segment = namedtuple("Segment", "start duration text")
+
+# Every VideoTranscript field holding segments, in either format
+SEGMENT_FIELDS = ("segments", "segment_starts", "segment_durations", "segment_offsets")
+
+
+def _field(segment, name, default):
+    if isinstance(segment, dict):
+        value = segment.get(name, default)
+    else:
+        value = getattr(segment, name, default)
+    return default if value is None else value
+
+
+def _to_bytes(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode, raw):
+    values = array(typecode)
+    values.frombytes(bytes(raw or b""))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def as_segments(raw_segments):
+    """Normalise caption snippets, dicts or TranscriptSegment documents to Segment tuples."""
+    return [
+        Segment(float(_field(s, "start", 0.0)), float(_field(s, "duration", 0.0)),
+                str(_field(s, "text", "")).strip())
+        for s in raw_segments
+    ]
+
+
+def joined_text(raw_segments):
+    """full_text for segments: their stripped, non-empty texts joined with spaces."""
+    return " ".join(seg.text for seg in as_segments(raw_segments) if seg.text)
+
+
+def pack_segments(segments):
+    """
+    Returns:
+        (full_text, {"segment_count", "segment_starts", "segment_durations", "segment_offsets"})
+    """
+    segments = as_segments(segments)
+    starts, durations, offsets = array("f"), array("f"), array("I")
+    parts = []
+    length = 0
+    for seg in segments:
+        if seg.text and parts:
+            length += 1                    # the space joining it to the previous text
+        offsets.append(length)
+        starts.append(seg.start)
+        durations.append(seg.duration)
+        if seg.text:
+            parts.append(seg.text)
+            length += len(seg.text)
+    offsets.append(length)
+    return " ".join(parts), {
+        "segment_count": len(segments),
+        "segment_starts": _to_bytes(starts),
+        "segment_durations": _to_bytes(durations),
+        "segment_offsets": _to_bytes(offsets),
+    }
+
+
+class PackedSegments(Sequence):
+    """
+    Read-only sequence of Segment tuples over the compact fields. The
+    arrays are decoded on first access and texts are sliced out of
+    full_text per segment.
+    """
+
+    def __init__(self, full_text, starts, durations, offsets):
+        self.full_text = full_text or ""
+        self._raw = (starts, durations, offsets)
+        self._arrays = None
+
+    @classmethod
+    def from_segments(cls, segments):
+        """Pack legacy (embedded) segments in memory to get the same accessors."""
+        full_text, packed = pack_segments(segments)
+        return cls(full_text, packed["segment_starts"], packed["segment_durations"], packed["segment_offsets"])
+
+    @classmethod
+    def from_son(cls, doc):
+        """Segments of a raw VideoTranscript document in either storage format."""
+        if doc.get("segment_count") is not None:
+            return cls(doc.get("full_text"), doc.get("segment_starts"),
+                       doc.get("segment_durations"), doc.get("segment_offsets"))
+        return cls.from_segments(doc.get("segments") or [])
+
+    def _columns(self):
+        if self._arrays is None:
+            starts, durations, offsets = self._raw
+            self._arrays = (_from_bytes("f", starts), _from_bytes("f", durations), _from_bytes("I", offsets))
+        return self._arrays
+
+    @property
+    def starts(self):
+        return self._columns()[0]
+
+    def __len__(self):
+        return len(self._columns()[0])
+
+    def text(self, i):
+        offsets = self._columns()[2]
+        # Texts are stripped when packed, so trailing spaces are the separator
+        return self.full_text[offsets[i]:offsets[i + 1]].rstrip(" ")
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        starts, durations, _ = self._columns()
+        if i < 0:
+            i += len(starts)
+        if not 0 <= i < len(starts):
+            raise IndexError("segment index out of range")
+        return Segment(starts[i], durations[i], self.text(i))
+
+    def window(self, start_time, end_time):
+        """
+        Index range (lo, hi) of the segments overlapping [start_time, end_time)
+        seconds; starts are in caption order so this is two bisections.
+        """
+        starts, durations, _ = self._columns()
+        hi = bisect_left(starts, end_time)
+        # Only segments starting before start_time can still be running at it;
+        # captions are short, so step back from the first one starting after it
+        lo = bisect_right(starts, start_time)
+        while lo > 0 and starts[lo - 1] + durations[lo - 1] > start_time:
+            lo -= 1
+        return lo, max(lo, hi)
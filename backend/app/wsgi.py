@@ -0,0 +1,20 @@
+# app/wsgi.py
+"""
+Production WSGI entry point.
+
+Run (from backend/):
+    gunicorn -c gunicorn.conf.py app.wsgi:app
+
+Importing this module builds the Flask app and warms the in-memory views of
+the knowledge graph, so with preload_app they are built once in the master
+and shared copy-on-write by every forked worker.
+"""
+from app.main import create_app
+from app.models import (  # noqa: F401  (register every document class before fork)
+    KnowledgeGraphNode, VideoTranscript, TranscriptSegment, Quiz, QuizQuestion,
+    GraphState, SubjectCatalogue, LLMCacheEntry
+)
+from app.preload import preload
+
+app = create_app()
+preload()
@@ -0,0 +1,87 @@
+# benchmarks/candidates.py
+"""
+Latency of find_video_with_transcript's candidate strategies under simulated
+network and LLM delays, and which candidate each strategy picks.
+
+YouTube search, transcript fetches, LLM validation and DB writes are replaced
+by in-process stand-ins that sleep for random (seeded) durations.
+
+Usage (from backend/):
+    python -m benchmarks.candidates [--trials 5] [--valid 0,0,1,1,0]
+"""
+import argparse
+import random
+import statistics
+import time
+import app.kg_pipeline.yt_videos as yt
+
+
+def install_standins(valid, rng, fetch_delay, validate_delay):
+    video_ids = [f"vid{i}" for i in range(len(valid))]
+    confidence = {vid: round(rng.uniform(0.6, 0.95), 2) for vid in video_ids}
+    delays = {
+        vid: (rng.uniform(*fetch_delay), rng.uniform(*validate_delay))
+        for vid in video_ids
+    }
+
+    def search_multiple_videos(query, max_results=5):
+        return video_ids[:max_results]
+
+    def fetch_transcript(youtube_id):
+        time.sleep(delays[youtube_id][0])
+        return [], "transcript " * 100
+
+    def validate_transcript_relevance(transcript_text, topic, youtube_id, min_length=500, keywords=None, objectives=None):
+        time.sleep(delays[youtube_id][1])
+        ok = valid[video_ids.index(youtube_id)]
+        return {"is_relevant": ok, "confidence": confidence[youtube_id] if ok else 0.1,
+                "reason": "stand-in", "educational_quality": "high" if ok else "low", "youtube_id": youtube_id}
+
+    def save_transcript(youtube_id, segments, full_text, kg_node_code=None, topic=None, validation_result=None,
+                        kg_node=None):
+        return {"transcript": full_text, "is_valid": True, "reason": "stand-in",
+                "confidence": (validation_result or {}).get("confidence", 1.0), "educational_quality": "high"}
+
+    def validate_topic_search(query):
+        return {"is_valid": True, "reason": "stand-in", "suggested_query": query}
+
+    yt.search_multiple_videos = search_multiple_videos
+    yt.fetch_transcript = fetch_transcript
+    yt.validate_transcript_relevance = validate_transcript_relevance
+    yt.validate_topic_search = validate_topic_search
+    yt.save_transcript = save_transcript
+    return confidence
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--valid", default="0,0,1,1,0", help="comma-separated validity of each search result")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    valid = [v.strip() == "1" for v in args.valid.split(",")]
+
+    latencies = {s: [] for s in yt.CANDIDATE_STRATEGIES}
+    picks = {s: [] for s in yt.CANDIDATE_STRATEGIES}
+    for trial in range(args.trials):
+        confidence = install_standins(valid, random.Random(args.seed + trial),
+                                      fetch_delay=(0.2, 0.8), validate_delay=(0.4, 1.2))
+        sequential_pick = None
+        for strategy in yt.CANDIDATE_STRATEGIES:
+            start = time.perf_counter()
+            youtube_id, _, _ = yt.find_video_with_transcript(
+                "stand-in topic", max_videos=len(valid), validate_with_llm=True, strategy=strategy
+            )
+            latencies[strategy].append(time.perf_counter() - start)
+            if strategy == "sequential":
+                sequential_pick = youtube_id
+            picks[strategy].append((youtube_id, youtube_id == sequential_pick, confidence.get(youtube_id)))
+
+    print(f"\nCandidates validity: {valid}, {args.trials} trials")
+    print(f"{'strategy':<12}{'mean s':>8}{'p50 s':>8}{'max s':>8}{'same pick as sequential':>26}{'mean conf':>11}")
+    for strategy in yt.CANDIDATE_STRATEGIES:
+        lat = latencies[strategy]
+        same = sum(1 for _, agrees, _ in picks[strategy] if agrees)
+        confs = [c for _, _, c in picks[strategy] if c is not None]
+        print(f"{strategy:<12}{statistics.mean(lat):>8.2f}{statistics.median(lat):>8.2f}{max(lat):>8.2f}"
+              f"{f'{same}/{len(lat)}':>26}{(statistics.mean(confs) if confs else 0):>11.2f}")
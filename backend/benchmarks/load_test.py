@@ -0,0 +1,110 @@
+# benchmarks/load_test.py
+"""
+Closed-loop load test of the catalogue endpoints against a running server.
+
+Start the server against a local MongoDB holding the uploaded graph, e.g.
+    MONGODB_URI=mongodb://localhost:27017 DATABASE_NAME=smartlearn \\
+        gunicorn -c gunicorn.conf.py app.wsgi:app
+then (from backend/):
+    python -m benchmarks.load_test [--url http://localhost:5000] [--concurrency 32] [--duration 10]
+                                   [--revalidate]
+
+--revalidate sends If-None-Match with the ETag of the first response, which
+measures the 304 path of the HTTP cache instead of full responses.
+
+To compare the Flask (WSGI) and FastAPI (ASGI) servers, start both, e.g.
+    gunicorn -c gunicorn.conf.py app.wsgi:app                  # :5000
+    uvicorn app.asgi:app --port 8000 --workers 4               # :8000
+and run
+    python -m benchmarks.load_test --url http://localhost:5000 --compare http://localhost:8000 \
+                                   [--topic PHY_NEWTON_LAWS]
+--topic adds the content endpoint for a topic whose content is already stored.
+"""
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+ENDPOINTS = [
+    "/api/subjects",
+    "/api/subjects/Physics/topics",
+    "/api/subjects/Biology/topics?view=summary&limit=50",
+    "/api/topics/search?q=newton",
+    "/api/topics/suggest?q=cel",
+]
+
+
+def run_endpoint(base_url, path, concurrency, duration, revalidate):
+    url = base_url.rstrip("/") + path
+    headers = {}
+    if revalidate:
+        etag = requests.get(url, timeout=30).headers.get("ETag")
+        if etag:
+            headers["If-None-Match"] = etag
+
+    deadline = time.perf_counter() + duration
+    latencies, statuses = [], Counter()
+    lock = threading.Lock()
+
+    def worker():
+        session = requests.Session()
+        local_latencies, local_statuses = [], Counter()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = session.get(url, headers=headers, timeout=30).status_code
+            except requests.RequestException:
+                status = "error"
+            local_latencies.append((time.perf_counter() - start) * 1000)
+            local_statuses[status] += 1
+        with lock:
+            latencies.extend(local_latencies)
+            statuses.update(local_statuses)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "mean": statistics.mean(latencies),
+        "statuses": dict(statuses),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--revalidate", action="store_true", help="send If-None-Match (304 path)")
+    parser.add_argument("--endpoint", action="append", help="path to test (repeatable; default: catalogue endpoints)")
+    parser.add_argument("--compare", help="base URL of a second server to run the same load against")
+    parser.add_argument("--topic", help="also load /api/topics/<topic>/content (content must be stored)")
+    args = parser.parse_args()
+
+    endpoints = args.endpoint or list(ENDPOINTS)
+    if args.topic:
+        endpoints.append(f"/api/topics/{args.topic}/content")
+    servers = [args.url] + ([args.compare] if args.compare else [])
+
+    print(f"{', '.join(servers)}: {args.concurrency} concurrent clients, {args.duration:.0f}s per endpoint"
+          f"{', revalidating' if args.revalidate else ''}\n")
+    print(f"{'endpoint':<52}{'server':<24}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  statuses")
+    for path in endpoints:
+        rps = []
+        for url in servers:
+            r = run_endpoint(url, path, args.concurrency, args.duration, args.revalidate)
+            rps.append(r["rps"])
+            print(f"{path:<52}{url:<24}{r['rps']:>9.1f}{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}  {r['statuses']}")
+        if len(rps) == 2 and rps[0]:
+            print(f"{'':<52}{'ratio':<24}{rps[1] / rps[0]:>8.2f}x")
@@ -0,0 +1,68 @@
+# benchmarks/node_queries.py
+"""
+Count the MongoDB commands issued per content request, broken down by
+collection, for nodes whose content is already prepared (so no YouTube or
+LLM calls are made).
+
+Usage (from backend/):
+    python -m benchmarks.node_queries [--subject Physics] [--limit 20]
+"""
+import argparse
+import statistics
+from collections import Counter
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = Counter()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self.commands[(event.command_name, collection if isinstance(collection, str) else "")] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Must be registered before app.db creates the client
+COUNTER = CommandCounter()
+monitoring.register(COUNTER)
+
+from app.db import *  # noqa: E402
+from app.models import KnowledgeGraphNode  # noqa: E402
+from app.kg_pipeline.yt_videos import get_cached_topic_content, get_video_transcript_and_quiz  # noqa: E402
+
+
+def count_commands(fn, *args, **kwargs):
+    COUNTER.commands.clear()
+    fn(*args, **kwargs)
+    return Counter(COUNTER.commands)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subject")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    query = {"videos__0__exists": True}
+    if args.subject:
+        query["subject"] = args.subject.strip().title()
+    codes = [c for c in KnowledgeGraphNode.objects(**query).scalar("code") if get_cached_topic_content(c)]
+    codes = codes[:args.limit]
+    if not codes:
+        raise SystemExit("No nodes with prepared content; run python -m app.kg_pipeline.prewarm first")
+
+    for name, fn in [("get_cached_topic_content", get_cached_topic_content),
+                     ("get_video_transcript_and_quiz", get_video_transcript_and_quiz)]:
+        per_request = [count_commands(fn, code) for code in codes]
+        totals = [sum(c.values()) for c in per_request]
+        merged = sum(per_request, Counter())
+        print(f"\n{name} over {len(codes)} prepared nodes: "
+              f"{statistics.mean(totals):.1f} commands/request (min {min(totals)}, max {max(totals)})")
+        for (command, collection), n in merged.most_common():
+            print(f"  {command:<10}{collection:<28}{n / len(codes):>6.1f}/request")
@@ -0,0 +1,76 @@
+# benchmarks/suggest.py
+"""
+Latency of /api/topics/suggest's prefix index over a knowledge-graph file,
+and the cost of an incremental update versus a full rebuild.
+
+Runs entirely in memory (no database needed).
+
+Usage (from backend/):
+    python -m benchmarks.suggest [--file kg_final_depth3.json] [--limit 8]
+"""
+import argparse
+import copy
+import json
+import os
+import statistics
+import time
+from app.topic_suggest import SuggestIndex, normalize
+
+KG_DIR = os.path.join(os.path.dirname(__file__), "..", "app", "kg_pipeline")
+
+
+def typed_prefixes(nodes, max_len=8):
+    """Every prefix a user would type on the way to each title and keyword (1..max_len chars)."""
+    prefixes = []
+    for node in nodes:
+        for text in [node["title"]] + (node.get("keywords") or []):
+            text = normalize(text)
+            prefixes.extend(text[:n] for n in range(1, min(len(text), max_len) + 1))
+    return prefixes
+
+
+def timed_ms(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="kg_final_depth3.json")
+    parser.add_argument("--limit", type=int, default=8)
+    args = parser.parse_args()
+
+    with open(os.path.join(KG_DIR, args.file), "r", encoding="utf-8") as f:
+        nodes = json.load(f)
+
+    build_ms = timed_ms(lambda: SuggestIndex.build(nodes))
+    index = SuggestIndex.build(nodes)
+    print(f"{len(index)} nodes, {len(index.keywords)} keywords, {len(index.entries)} prefix entries; "
+          f"full build {build_ms:.2f} ms")
+
+    prefixes = typed_prefixes(nodes)
+    latencies = []
+    for prefix in prefixes:
+        index._cache.clear()  # measure the uncached path
+        start = time.perf_counter()
+        index.suggest(prefix, limit=args.limit)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    print(f"\nsuggest() over {len(prefixes)} typed prefixes (uncached):")
+    print(f"  mean {statistics.mean(latencies):7.1f} µs   p50 {latencies[len(latencies) // 2]:7.1f} µs   "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:7.1f} µs   max {latencies[-1]:7.1f} µs")
+
+    # Incremental update: one node retitled, one gains a keyword, one removed
+    changed = copy.deepcopy(nodes)
+    changed[0]["title"] = changed[0]["title"] + " Revisited"
+    changed[1]["keywords"] = (changed[1].get("keywords") or []) + ["benchmark keyword"]
+    del changed[2]
+    update_ms = timed_ms(lambda: index.updated(changed, version=1))
+    rebuilt = SuggestIndex.build(changed)
+    same = index.updated(changed, version=1).entries == rebuilt.entries
+    print(f"\nincremental update (3 changed nodes): {update_ms:.2f} ms vs full rebuild "
+          f"{timed_ms(lambda: SuggestIndex.build(changed)):.2f} ms; identical entries: {same}")
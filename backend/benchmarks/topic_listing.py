@@ -0,0 +1,72 @@
+# benchmarks/topic_listing.py
+"""
+Payload size and latency of GET /api/subjects/<subject>/topics in its
+full form versus summary, field-projected and paginated requests.
+
+Assumes the graph in kg_final_depth3.json has been upserted into the
+configured database. The HTTP response cache is cleared before every
+request so each one runs the view.
+
+Usage (from backend/):
+    python -m benchmarks.topic_listing [--subject Physics] [--repeat 20] [--page-size 25]
+"""
+import argparse
+import statistics
+import time
+from app.main import create_app
+from app.http_cache import RESPONSE_CACHE
+
+
+def measure(client, url, repeat):
+    times, size = [], 0
+    for _ in range(repeat):
+        RESPONSE_CACHE.clear()
+        start = time.perf_counter()
+        response = client.get(url)
+        times.append((time.perf_counter() - start) * 1000)
+        size = len(response.get_data())
+    return size, statistics.median(times), response.get_json()
+
+
+def walk_pages(client, url, page_size):
+    """Fetch every page; returns (pages, total bytes, total ms)."""
+    pages, total_bytes, total_ms, cursor = 0, 0, 0.0, None
+    while True:
+        RESPONSE_CACHE.clear()
+        page_url = f"{url}&limit={page_size}" + (f"&cursor={cursor}" if cursor else "")
+        start = time.perf_counter()
+        response = client.get(page_url)
+        total_ms += (time.perf_counter() - start) * 1000
+        total_bytes += len(response.get_data())
+        pages += 1
+        cursor = response.get_json().get("next_cursor")
+        if not cursor:
+            return pages, total_bytes, total_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subject", default="Physics")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=25)
+    args = parser.parse_args()
+
+    client = create_app().test_client()
+    base = f"/api/subjects/{args.subject}/topics"
+    cases = [
+        ("full (previous behaviour)", base),
+        ("view=summary", f"{base}?view=summary"),
+        ("fields=code,title", f"{base}?fields=code,title"),
+        (f"view=summary, first page of {args.page_size}", f"{base}?view=summary&limit={args.page_size}"),
+        (f"full, first page of {args.page_size}", f"{base}?limit={args.page_size}"),
+    ]
+
+    print(f"{'request':<40}{'topics':>8}{'bytes':>10}{'median ms':>11}")
+    baseline = None
+    for name, url in cases:
+        size, ms, body = measure(client, url, args.repeat)
+        baseline = baseline or size
+        print(f"{name:<40}{len(body.get('topics', [])):>8}{size:>10}{ms:>11.2f}   ({size / baseline:.0%} of full)")
+
+    pages, total_bytes, total_ms = walk_pages(client, f"{base}?view=summary", args.page_size)
+    print(f"\nAll {pages} summary pages of {args.page_size}: {total_bytes} bytes, {total_ms:.1f} ms in total")
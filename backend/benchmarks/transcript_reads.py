@@ -0,0 +1,58 @@
+# benchmarks/transcript_reads.py
+"""
+Bytes transferred and time per transcript read: the whole document (what
+content requests used to load before joining the segment texts) versus the
+projection without segments that they now use.
+
+Assumes transcripts are stored in the configured database.
+
+Usage (from backend/):
+    python -m benchmarks.transcript_reads [--limit 100] [--repeat 3]
+"""
+import argparse
+import time
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from app.db import *
+from app.models import VideoTranscript
+from app.transcript_store import SEGMENT_FIELDS
+
+
+def measure(collection, youtube_ids, projection, repeat):
+    """(total document bytes, best-of-`repeat` seconds) to read every transcript once."""
+    raw = collection.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+    total_bytes, best = 0, float("inf")
+    for _ in range(repeat):
+        total_bytes = 0
+        start = time.perf_counter()
+        for youtube_id in youtube_ids:
+            doc = raw.find_one({"youtube_id": youtube_id}, projection)
+            total_bytes += len(doc.raw) if doc else 0
+        best = min(best, time.perf_counter() - start)
+    return total_bytes, best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=100, help="transcripts to read")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    collection = VideoTranscript._get_collection()
+    youtube_ids = collection.distinct("youtube_id")[:args.limit]
+    if not youtube_ids:
+        raise SystemExit("No stored transcripts")
+
+    legacy = sum(1 for _ in collection.find({"full_text": None}, {"_id": 1}))
+    if legacy:
+        print(f"Note: {legacy} transcripts lack full_text; run python -m app.backfill_transcript_text\n")
+
+    full_bytes, full_time = measure(collection, youtube_ids, None, args.repeat)
+    text_bytes, text_time = measure(collection, youtube_ids, dict.fromkeys(SEGMENT_FIELDS, 0), args.repeat)
+
+    n = len(youtube_ids)
+    print(f"{n} transcripts")
+    print(f"{'read':<28}{'KiB/request':>12}{'ms/request':>12}")
+    print(f"{'whole document':<28}{full_bytes / n / 1024:>12.1f}{full_time / n * 1000:>12.2f}")
+    print(f"{'without segments':<28}{text_bytes / n / 1024:>12.1f}{text_time / n * 1000:>12.2f}")
+    print(f"\nBytes per request: -{1 - text_bytes / full_bytes:.0%}")
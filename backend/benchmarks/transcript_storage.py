@@ -0,0 +1,94 @@
+# benchmarks/transcript_storage.py
+"""
+Document size and load time of VideoTranscript with embedded segments
+versus the compact columnar fields (app/transcript_store.py).
+
+By default runs on synthetic transcripts (no database needed); --from-db
+uses the segments of transcripts already stored in the configured database.
+
+Usage (from backend/):
+    python -m benchmarks.transcript_storage [--segments 400] [--docs 50] [--from-db]
+"""
+import argparse
+import random
+import time
+import bson
+from app.db import *
+from app.models import VideoTranscript
+from app.transcript_store import as_segments, pack_segments
+
+WORDS = ("the force acts on mass so acceleration equals net force divided by mass which "
+         "explains why heavier objects need more push to reach the same speed in a given time").split()
+
+
+def synthetic_segments(n, rng):
+    """Caption-like lines: ~8 words, each a few seconds long."""
+    segments, t = [], 0.0
+    for _ in range(n):
+        duration = round(rng.uniform(1.5, 5.0), 3)
+        segments.append({"start": round(t, 3), "duration": duration,
+                         "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))})
+        t += duration
+    return segments
+
+
+def embedded_son(youtube_id, segments):
+    segments = as_segments(segments)
+    return {"youtube_id": youtube_id, "language": "en",
+            "full_text": " ".join(s.text for s in segments if s.text),
+            "segments": [{"start": s.start, "duration": s.duration, "text": s.text} for s in segments]}
+
+
+def compact_son(youtube_id, segments):
+    full_text, packed = pack_segments(segments)
+    return {"youtube_id": youtube_id, "language": "en", "full_text": full_text, **packed}
+
+
+def load_ms(raw_docs, read, repeat=5):
+    """Best-of-`repeat` ms to decode every BSON document, hydrate it and run `read` on it."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in raw_docs:
+            read(VideoTranscript._from_son(bson.decode(raw)))
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+READS = {
+    "full text": lambda doc: doc.full_text,
+    "all segments": lambda doc: [(s.start, s.duration, s.text) for s in doc.get_segments()],
+    "one segment": lambda doc: doc.get_segments()[len(doc.get_segments()) // 2],
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=400, help="segments per synthetic transcript")
+    parser.add_argument("--docs", type=int, default=50, help="synthetic transcripts")
+    parser.add_argument("--from-db", action="store_true", help="use stored transcripts instead")
+    args = parser.parse_args()
+
+    if args.from_db:
+        sources = [(vt.youtube_id, list(vt.get_segments()))
+                   for vt in VideoTranscript.objects() if vt.has_segments]
+        if not sources:
+            raise SystemExit("No stored transcripts with segments")
+    else:
+        rng = random.Random(7)
+        sources = [(f"vid{i:08d}", synthetic_segments(args.segments, rng)) for i in range(args.docs)]
+
+    embedded = [bson.encode(embedded_son(vid, segs)) for vid, segs in sources]
+    compact = [bson.encode(compact_son(vid, segs)) for vid, segs in sources]
+    n_segments = sum(len(segs) for _, segs in sources)
+
+    size_e, size_c = sum(map(len, embedded)), sum(map(len, compact))
+    print(f"{len(sources)} transcripts, {n_segments / len(sources):.0f} segments each on average\n")
+    print(f"{'document size':<24}{'embedded':>12}{'compact':>12}{'ratio':>9}")
+    print(f"{'  per transcript (KiB)':<24}{size_e / len(sources) / 1024:>12.1f}"
+          f"{size_c / len(sources) / 1024:>12.1f}{size_c / size_e:>9.0%}")
+
+    print(f"\n{'load + read (ms, all)':<24}{'embedded':>12}{'compact':>12}{'speedup':>9}")
+    for name, read in READS.items():
+        t_e, t_c = load_ms(embedded, read), load_ms(compact, read)
+        print(f"{'  ' + name:<24}{t_e:>12.1f}{t_c:>12.1f}{t_e / t_c:>8.1f}x")
@@ -0,0 +1,54 @@
+# benchmarks/traversal.py
+"""
+Compare the in-memory snapshot DFS against the $graphLookup backend for
+prerequisite chains and subtopics.
+
+Assumes the graph in KG_FILE has been upserted into the configured database.
+
+Usage (from backend/):
+    python -m benchmarks.traversal [--file kg_final_depth3.json] [--depth 2]
+"""
+import argparse
+import json
+import os
+import time
+from app.db import *
+from app.graph_snapshot import refresh_snapshot
+from app.graph_traversal import get_full_prerequisite_chain, get_all_subtopics
+
+KG_DIR = os.path.join(os.path.dirname(__file__), "..", "app", "kg_pipeline")
+
+
+def timed(fn, codes):
+    start = time.perf_counter()
+    results = [fn(code) for code in codes]
+    return time.perf_counter() - start, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="kg_final_depth3.json")
+    parser.add_argument("--depth", type=int, default=2, help="depth_limit for subtopics")
+    args = parser.parse_args()
+
+    with open(os.path.join(KG_DIR, args.file), "r", encoding="utf-8") as f:
+        codes = [n["code"] for n in json.load(f)]
+
+    start = time.perf_counter()
+    snap = refresh_snapshot()
+    print(f"Snapshot load: {len(snap)} nodes in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    cases = [
+        ("prerequisite chain", lambda backend: lambda c: get_full_prerequisite_chain(c, backend=backend)),
+        ("subtopics", lambda backend: lambda c: [
+            n.code for n in get_all_subtopics(None, c, args.depth, backend=backend)
+        ]),
+    ]
+    for name, make in cases:
+        t_snap, r_snap = timed(make("snapshot"), codes)
+        t_gl, r_gl = timed(make("graphlookup"), codes)
+        mismatches = sum(1 for a, b in zip(r_snap, r_gl) if a != b)
+        print(f"\n{name} over {len(codes)} nodes")
+        print(f"  snapshot:    {t_snap * 1000:9.1f} ms total, {t_snap / len(codes) * 1e6:8.1f} µs/call")
+        print(f"  graphlookup: {t_gl * 1000:9.1f} ms total, {t_gl / len(codes) * 1e6:8.1f} µs/call")
+        print(f"  mismatched results: {mismatches}")
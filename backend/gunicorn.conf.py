@@ -0,0 +1,50 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the production server (see app/wsgi.py).
+
+    gunicorn -c gunicorn.conf.py app.wsgi:app
+
+Environment:
+    HOST / PORT             bind address (default 0.0.0.0:5000)
+    WEB_WORKERS             worker processes (default 2 x CPUs + 1)
+    WEB_THREADS             threads per worker (default 4); routes block on
+                            MongoDB, YouTube and the LLM, so threads keep a
+                            worker busy while one request waits
+    WEB_TIMEOUT             seconds before a silent worker is restarted (default 120)
+    WEB_GRACEFUL_TIMEOUT    seconds workers get to finish requests on shutdown (default 30)
+
+Content jobs run in the worker that queued them, but their state is stored
+in the content_jobs collection (app/content_jobs.py), so GET /api/jobs/<id>
+and /api/jobs/<id>/stream can be answered by any worker.
+"""
+import multiprocessing
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("WEB_THREADS", "4"))
+worker_class = "gthread"
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Import the app (and warm the graph snapshot and search indexes) once in
+# the master; workers inherit them copy-on-write
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # The MongoClient created in the master must not be shared across processes
+    from app.db import reconnect_db
+    reconnect_db()
+
+
+def worker_exit(server, worker):
+    # SIGTERM: gunicorn stops accepting connections and lets in-flight
+    # requests finish within graceful_timeout; background content jobs
+    # are cancelled if queued and awaited if running
+    from app.content_jobs import shutdown_content_jobs
+    shutdown_content_jobs(wait=True)
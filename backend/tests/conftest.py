@@ -0,0 +1,224 @@
+# tests/conftest.py
+"""
+Shared fixtures: an in-memory MongoDB (mongomock) behind mongoengine, a
+counter of the database operations a block of code issues, and local
+stand-ins for YouTube search, the transcript API and the LLM
+(app/kg_pipeline/llm_stub_server.py). The async_db fixture serves the ASGI
+app's Motor reads from the same in-memory database.
+
+Run (from backend/):
+    pip install -r requirements-dev.txt
+    python -m pytest tests
+"""
+import hashlib
+import os
+import threading
+from collections import Counter
+
+# Configure the app before it is imported: no YouTube client, no LLM cache
+# (the llm_cache fixture installs one), no pymongo listeners (mongomock does
+# not emit command events)
+os.environ["YOUTUBE_API_KEY"] = ""
+os.environ["GROQ_API_KEY"] = "stub"
+os.environ["GROQ_MODEL"] = "stub-model"
+os.environ["LLM_CACHE_BACKEND"] = "none"
+os.environ["DB_METRICS_ENABLED"] = "false"
+os.environ.setdefault("DATABASE_NAME", "smartlearn_test")
+
+import mongomock
+import pytest
+from mongoengine import connect, disconnect
+from mongoengine.connection import get_db
+from app import async_db as async_db_module, graph_snapshot, graph_state, topic_search, topic_suggest
+from app.http_cache import RESPONSE_CACHE
+from app.kg_pipeline import llm_client, yt_videos
+from app.kg_pipeline.llm_cache import make_llm_cache
+from app.kg_pipeline.llm_stub_server import make_server
+from app.transcript_store import Segment
+
+# Collection methods that are one round trip each against a real server, by
+# operation name. find() is lazy (as in pymongo): a query is counted when a
+# cursor first reads its results (_get_dataset), not when it is created.
+COUNTED_OPERATIONS = {
+    "_get_dataset": "find", "find_one": "find_one", "aggregate": "aggregate", "distinct": "distinct",
+    "count_documents": "count_documents", "estimated_document_count": "estimated_document_count",
+    "insert_one": "insert_one", "insert_many": "insert_many", "update_one": "update_one",
+    "update_many": "update_many", "replace_one": "replace_one", "delete_one": "delete_one",
+    "delete_many": "delete_many", "find_one_and_update": "find_one_and_update", "bulk_write": "bulk_write",
+}
+
+
+class OperationCounter:
+    """
+    Counts calls to COUNTED_OPERATIONS per (collection, operation). Calls
+    mongomock makes to itself (count_documents -> _get_dataset) are not
+    counted again.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def wrap(self, name, method):
+        counter = self
+
+        def counted(collection, *args, **kwargs):
+            depth = getattr(counter._local, "depth", 0)
+            if depth == 0:
+                with counter._lock:
+                    counter.calls[(collection.name, name)] += 1
+            counter._local.depth = depth + 1
+            try:
+                return method(collection, *args, **kwargs)
+            finally:
+                counter._local.depth = depth
+        return counted
+
+    @property
+    def total(self):
+        return sum(self.calls.values())
+
+    def on(self, collection):
+        return sum(n for (name, _), n in self.calls.items() if name == collection)
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+
+
+@pytest.fixture
+def db():
+    """Fresh in-memory database; process-wide graph caches are dropped."""
+    disconnect()
+    connect(db=os.environ["DATABASE_NAME"], host="mongodb://localhost", mongo_client_class=mongomock.MongoClient,
+            uuidRepresentation="standard")
+    graph_state._cached_version = None
+    graph_snapshot._snapshot = None
+    topic_search._index = None
+    topic_suggest._index = None
+    RESPONSE_CACHE.clear()
+    yield
+    disconnect()
+
+
+@pytest.fixture
+def db_ops(db, monkeypatch):
+    """OperationCounter over every collection of the test database."""
+    counter = OperationCounter()
+    for method, name in COUNTED_OPERATIONS.items():
+        monkeypatch.setattr(mongomock.collection.Collection, method,
+                            counter.wrap(name, getattr(mongomock.collection.Collection, method)))
+    return counter
+
+
+class AsyncCursor:
+    """Motor cursor over a mongomock one: async iteration and to_list()."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    async def _iterate(self):
+        for doc in self._cursor:
+            yield doc
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def to_list(self, length=None):
+        return list(self._cursor)
+
+
+class AsyncCollection:
+    """The part of Motor's collection API the ASGI app uses, over a mongomock collection."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+    def aggregate(self, pipeline, **kwargs):
+        return AsyncCursor(self._collection.aggregate(pipeline, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+@pytest.fixture
+def async_db(db, monkeypatch):
+    """Motor reads of the ASGI app served from the mongomock database of `db`."""
+    database = get_db()
+
+    class AsyncDatabase:
+        def __getitem__(self, name):
+            return AsyncCollection(database[name])
+
+    monkeypatch.setattr(async_db_module, "get_async_db", AsyncDatabase)
+
+
+@pytest.fixture
+def llm_stub(monkeypatch):
+    """Chat-completions stand-in on a free local port; yields its StubState (request count)."""
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(llm_client, "GROQ_API_URL",
+                        f"http://127.0.0.1:{server.server_address[1]}/openai/v1/chat/completions")
+    yield server.RequestHandlerClass.state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def llm_cache(monkeypatch):
+    """A fresh in-memory LLM response cache in place of the disabled one."""
+    cache = make_llm_cache("memory")
+    monkeypatch.setattr(llm_client, "LLM_CACHE", cache)
+    return cache
+
+
+class YouTubeStub:
+    """
+    Every search returns `videos_per_search` ids derived from the query;
+    their transcripts are lectures repeating the query's words, long enough
+    to pass the length check and the relevance pre-filter.
+    """
+
+    def __init__(self, videos_per_search=2):
+        self.videos_per_search = videos_per_search
+        self.queries = {}       # youtube id -> search query
+        self.searches = []
+        self.fetches = []
+        self._lock = threading.Lock()
+
+    def search_multiple_videos(self, query, max_results=5):
+        digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+        ids = [f"v{digest}{i}" for i in range(min(self.videos_per_search, max_results))]
+        with self._lock:
+            self.searches.append(query)
+            self.queries.update(dict.fromkeys(ids, query))
+        return ids
+
+    def fetch_transcript(self, youtube_id):
+        with self._lock:
+            self.fetches.append(youtube_id)
+            query = self.queries.get(youtube_id)
+        if query is None:
+            return None
+        segments = [Segment(i * 4.0, 4.0, f"In this lesson on {query} we look at part {i} of {query}.")
+                    for i in range(40)]
+        return segments, " ".join(seg.text for seg in segments)
+
+
+@pytest.fixture
+def youtube_stub(monkeypatch):
+    """YouTubeStub patched over yt_videos' search and transcript fetches."""
+    stub = YouTubeStub()
+    monkeypatch.setattr(yt_videos, "search_multiple_videos", stub.search_multiple_videos)
+    monkeypatch.setattr(yt_videos, "fetch_transcript", stub.fetch_transcript)
+    return stub
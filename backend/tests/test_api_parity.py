@@ -0,0 +1,72 @@
+# tests/test_api_parity.py
+"""The Flask blueprint and the ASGI app answer the same requests with the same bodies."""
+import pytest
+from fastapi.testclient import TestClient
+from app.asgi import app as asgi_app
+from app.http_cache import RESPONSE_CACHE
+from app.main import create_app
+from app.models import KnowledgeGraphNode, Quiz
+from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz
+
+
+@pytest.fixture
+def clients(async_db, youtube_stub, llm_stub):
+    for i, (title, keywords) in enumerate([
+        ("Forces and Motion", ["force", "friction"]),
+        ("Momentum and Collisions", ["momentum", "impulse"]),
+        ("Waves and Sound", ["wavelength", "frequency"]),
+    ]):
+        KnowledgeGraphNode(subject="Physics", title=title, code=f"PHY_T{i}", difficulty_level="base",
+                           keywords=keywords).save()
+    KnowledgeGraphNode(subject="Chemistry", title="Chemical Bonds", code="CHE_BONDS", difficulty_level="base").save()
+    content = get_video_transcript_and_quiz("PHY_T0")
+    Quiz(KG_Node_ID=KnowledgeGraphNode.objects.get(code="PHY_T2"), quiz_type="progress", level="base").save()
+    # Not entered as a context manager: the lifespan (graph preload) is not needed
+    return create_app().test_client(), TestClient(asgi_app), content["youtube_id"]
+
+
+def both(clients, url):
+    flask_client, asgi_client, _ = clients
+    RESPONSE_CACHE.clear()
+    flask_response = flask_client.get(url)
+    RESPONSE_CACHE.clear()
+    asgi_response = asgi_client.get(url)
+    assert flask_response.status_code == asgi_response.status_code, url
+    return flask_response.get_json(), asgi_response.json()
+
+
+@pytest.mark.parametrize("url", [
+    "/api/subjects/physics/topics",
+    "/api/subjects/Physics/topics?view=summary&limit=2",
+    "/api/subjects/Physics/topics?fields=code,has_quiz,video_count",
+    "/api/subjects/Biology/topics",
+    "/api/subjects/Physics/topics?view=tiny",
+    "/api/topics/search?q=force",
+    "/api/topics/search?q=",
+    "/api/topics/suggest?q=mom",
+    "/api/topics/PHY_T0/content?include_transcript=preview",
+    "/api/jobs/unknown",
+    "/api/subjects",
+])
+def test_same_response_from_both_apps(clients, url):
+    flask_payload, asgi_payload = both(clients, url)
+
+    assert flask_payload == asgi_payload
+
+
+def test_topic_pages_follow_the_same_cursor(clients):
+    flask_page, asgi_page = both(clients, "/api/subjects/Physics/topics?view=summary&limit=2")
+    cursor = flask_page["next_cursor"]
+    assert cursor and asgi_page["next_cursor"] == cursor
+
+    flask_next, asgi_next = both(clients, f"/api/subjects/Physics/topics?view=summary&limit=2&cursor={cursor}")
+
+    assert flask_next == asgi_next and [t["code"] for t in flask_next["topics"]] == ["PHY_T2"]
+
+
+def test_transcript_pages_match(clients):
+    youtube_id = clients[2]
+
+    flask_payload, asgi_payload = both(clients, f"/api/videos/{youtube_id}/transcript?offset=5&limit=10")
+
+    assert flask_payload == asgi_payload and flask_payload["count"] == 10
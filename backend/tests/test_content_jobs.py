@@ -0,0 +1,97 @@
+# tests/test_content_jobs.py
+import json
+import time
+import pytest
+from app import content_jobs
+from app.content_jobs import ContentJob, submit_content_job, get_content_job
+from app.main import create_app
+from app.models import ContentJobRecord, KnowledgeGraphNode
+
+
+@pytest.fixture
+def node(db):
+    return KnowledgeGraphNode(subject="Physics", title="Waves and Sound", code="PHY_WAVES",
+                              difficulty_level="base", keywords=["wavelength", "frequency"]).save()
+
+
+@pytest.fixture(autouse=True)
+def other_worker(monkeypatch):
+    """
+    Empty job registries for each test; calling the fixture's value empties
+    them again, to act as a server process that did not queue the jobs.
+    """
+    def forget():
+        monkeypatch.setattr(content_jobs, "_jobs", {})
+        monkeypatch.setattr(content_jobs, "_active", {})
+    forget()
+    return forget
+
+
+def wait_until_finished(job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    job = get_content_job(job_id)
+    while not job.finished and time.monotonic() < deadline:
+        job.wait_for_events(len(job.events), timeout=0.5)
+    return job
+
+
+def test_finished_job_is_served_by_any_worker(node, youtube_stub, llm_stub, other_worker):
+    job = submit_content_job(node.code)
+    assert wait_until_finished(job.id).status == "done"
+    other_worker()
+
+    response = create_app().test_client().get(f"/api/jobs/{job.id}")
+
+    payload = response.get_json()
+    assert response.status_code == 200 and payload["status"] == "done"
+    assert payload["content"]["youtube_id"] and payload["content"]["quiz"]
+    assert [e["stage"] for e in payload["events"]][0] == "started"
+
+
+def test_waiting_worker_sees_progress_written_by_the_running_one(db, other_worker, monkeypatch):
+    monkeypatch.setattr(content_jobs, "CONTENT_JOB_POLL_INTERVAL", 0.05)
+    running = ContentJob("key", {"code_or_topic": "PHY_WAVES"})
+    running.save_new()
+    other_worker()
+    waiting = get_content_job(running.id)
+    assert waiting is not running and not waiting.local
+
+    running.report("searching", "Searching YouTube")
+    assert [e["stage"] for e in waiting.wait_for_events(0, timeout=2.0)] == ["searching"]
+    running._finish("error", error="no video")
+    waiting.wait_for_events(1, timeout=2.0)
+    assert waiting.status == "error" and waiting.error == "no video"
+
+
+def test_identical_request_joins_a_job_running_in_another_worker(db, other_worker, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(content_jobs._executor, "submit", lambda fn, job: submitted.append(job))
+    first = submit_content_job("PHY_WAVES")
+    other_worker()
+
+    second = submit_content_job("PHY_WAVES")
+
+    assert second.id == first.id and len(submitted) == 1
+    assert ContentJobRecord.objects.count() == 1
+    # a job left queued by a process that died is not joined forever
+    ContentJobRecord.objects(job_id=first.id).update_one(set__created_at=time.time() - 2 * content_jobs.CONTENT_JOB_TIMEOUT)
+    assert submit_content_job("PHY_WAVES").id != first.id
+
+
+def test_job_responses_keep_the_requested_transcript_form(node, youtube_stub, llm_stub):
+    client = create_app().test_client()
+
+    pending = client.get(f"/api/topics/{node.code}/content?include_transcript=none")
+    assert pending.status_code == 202
+    status_url, stream_url = pending.get_json()["status_url"], pending.get_json()["stream_url"]
+    assert pending.headers["Location"] == status_url
+    job_id = pending.get_json()["job_id"]
+    wait_until_finished(job_id)
+
+    content = client.get(status_url).get_json()["content"]
+    assert content["transcript"] == "" and content["transcript_length"] > 0
+    done = client.get(stream_url).get_data(as_text=True).split("event: done\ndata: ")[1]
+    assert json.loads(done)["content"]["transcript"] == ""
+    # the same job, polled without the parameter, still gets the full text
+    full = client.get(f"/api/jobs/{job_id}").get_json()["content"]
+    assert len(full["transcript"]) == content["transcript_length"]
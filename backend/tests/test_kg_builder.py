@@ -0,0 +1,77 @@
+# tests/test_kg_builder.py
+import threading
+import time
+import pytest
+from app.kg_pipeline import kg_builder
+
+
+class SlowExpansions:
+    """expand_topic stand-in: every topic gets `fanout` new subtopics after `delay` seconds."""
+
+    def __init__(self, fanout=3, delay=0.05):
+        self.fanout = fanout
+        self.delay = delay
+        self.started = []
+        self.running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, topic_name, subject, current_level="base", max_retries=2, depth=1):
+        with self.lock:
+            self.started.append(topic_name)
+            self.running += 1
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return {"subtopics": [f"{topic_name} part {i}" for i in range(self.fanout)],
+                "prerequisites": [], "difficulty_level": current_level}
+
+
+@pytest.fixture
+def expansions(monkeypatch, tmp_path):
+    stub = SlowExpansions()
+    monkeypatch.setattr(kg_builder, "expand_topic", stub)
+    monkeypatch.setattr(kg_builder, "OUT_FILE", str(tmp_path / "kg_final.json"))
+    return stub
+
+
+SEEDS = [{"subject": "Physics", "title": "Mechanics"}]
+
+
+def test_build_stops_expanding_at_the_node_cap(expansions):
+    _, nodes = kg_builder.build_graph(SEEDS, recursive_depth=5, max_nodes=10, concurrency=8)
+
+    assert len(nodes) == 10
+    # seed (4 nodes) + 2 children (10 nodes) are needed; prefetching may run
+    # ahead by the nodes still missing, never by the whole pool
+    assert len(expansions.started) <= 3 + 2
+
+
+def test_no_expansion_runs_after_build_returns(expansions):
+    kg_builder.build_graph(SEEDS, recursive_depth=5, max_nodes=10, concurrency=8)
+    started = len(expansions.started)
+
+    assert expansions.running == 0
+    time.sleep(3 * expansions.delay)
+    assert len(expansions.started) == started
+
+
+def test_concurrent_build_matches_sequential(expansions):
+    _, sequential = kg_builder.build_graph(SEEDS, recursive_depth=3, max_nodes=30, concurrency=1)
+    _, concurrent = kg_builder.build_graph(SEEDS, recursive_depth=3, max_nodes=30, concurrency=4)
+
+    assert [n["code"] for n in concurrent] == [n["code"] for n in sequential]
+
+
+def test_zero_rate_bucket_does_not_limit():
+    bucket = kg_builder.TokenBucket(0)
+    start = time.monotonic()
+
+    for _ in range(100):
+        bucket.acquire()
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_negative_rate_is_rejected():
+    with pytest.raises(ValueError):
+        kg_builder.TokenBucket(-1)
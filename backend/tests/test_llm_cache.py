@@ -0,0 +1,25 @@
+# tests/test_llm_cache.py
+from app.models import KnowledgeGraphNode
+from app.kg_pipeline.llm_client import llm_call
+from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz
+
+
+def test_identical_requests_are_answered_from_the_cache(llm_stub, llm_cache):
+    first = llm_call("Explain inertia", max_tokens=100)
+    second = llm_call("Explain inertia", max_tokens=100)
+
+    assert second == first
+    assert llm_stub.requests == 1
+    assert llm_call("Explain inertia", max_tokens=100, use_cache=False) and llm_stub.requests == 2
+
+
+def test_forced_quiz_regeneration_reaches_the_llm(db, youtube_stub, llm_stub, llm_cache):
+    node = KnowledgeGraphNode(subject="Physics", title="Projectile Motion", code="PHY_PROJECTILES",
+                              difficulty_level="base", keywords=["trajectory", "range", "velocity"]).save()
+    get_video_transcript_and_quiz(node.code)
+    requests = llm_stub.requests
+
+    result = get_video_transcript_and_quiz(node.code, force_regenerate_quiz=True)
+
+    assert result['quiz_status'] == 'generated' and result['quiz']
+    assert llm_stub.requests == requests + 1
@@ -0,0 +1,46 @@
+# tests/test_node_resolution.py
+import pytest
+from app.models import KnowledgeGraphNode
+from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz, get_cached_topic_content
+
+
+@pytest.fixture
+def node(db):
+    return KnowledgeGraphNode(
+        subject="Physics", title="Work and Energy", code="PHY_WORK_ENERGY", difficulty_level="base",
+        keywords=["work", "energy", "power"]
+    ).save()
+
+
+def node_lookups(db_ops):
+    return db_ops.calls[("knowledge_graph_node", "find")] + db_ops.calls[("knowledge_graph_node", "find_one")]
+
+
+@pytest.mark.parametrize("by", ["code", "title"])
+def test_new_content_resolves_the_node_once(node, db_ops, youtube_stub, llm_stub, by):
+    result = get_video_transcript_and_quiz(getattr(node, by))
+
+    assert result['quiz'] and result['video_status'] == 'fetched_new'
+    assert node_lookups(db_ops) == 1
+
+
+@pytest.mark.parametrize("by", ["code", "title"])
+def test_stored_content_round_trips(node, db_ops, youtube_stub, llm_stub, by):
+    get_video_transcript_and_quiz(node.code)
+    db_ops.reset()
+
+    result = get_video_transcript_and_quiz(getattr(node, by))
+
+    assert result['video_status'] == 'found_existing' and result['quiz_status'] == 'database'
+    assert node_lookups(db_ops) == 1
+    # node, transcript, quiz, its questions: no writes and nothing looked up twice
+    assert db_ops.total == 4, db_ops.calls
+
+
+def test_cached_read_round_trips(node, db_ops, youtube_stub, llm_stub):
+    get_video_transcript_and_quiz(node.code)
+    db_ops.reset()
+
+    assert get_cached_topic_content(node.code)
+    assert node_lookups(db_ops) == 1
+    assert db_ops.total == 4, db_ops.calls
@@ -0,0 +1,71 @@
+# tests/test_prewarm.py
+import json
+import pytest
+from app.models import KnowledgeGraphNode
+from app.kg_pipeline.prewarm import Checkpoint, prewarm_nodes
+from app.kg_pipeline.yt_videos import get_cached_topic_content
+
+PHYSICS = ["PHY_FORCES", "PHY_MOMENTUM", "PHY_WAVES"]
+
+
+@pytest.fixture
+def graph(db):
+    for code, title, keywords in [
+        ("PHY_FORCES", "Forces and Motion", ["force", "friction"]),
+        ("PHY_MOMENTUM", "Momentum and Collisions", ["momentum", "impulse"]),
+        ("PHY_WAVES", "Waves and Sound", ["wavelength", "frequency"]),
+        ("CHE_BONDS", "Chemical Bonds", ["ionic", "covalent"]),
+    ]:
+        KnowledgeGraphNode(subject="Chemistry" if code.startswith("CHE") else "Physics", title=title, code=code,
+                           difficulty_level="base", keywords=keywords).save()
+
+
+def run(tmp_path, **kwargs):
+    return prewarm_nodes(subject="Physics", workers=2, checkpoint_file=str(tmp_path / "checkpoint.jsonl"), **kwargs)
+
+
+def test_prewarm_prepares_video_transcript_and_quiz(graph, tmp_path, youtube_stub, llm_stub):
+    outcomes, stats = run(tmp_path)
+
+    assert outcomes == {"complete": len(PHYSICS)}
+    for stage in ("cache_check", "video", "searching", "checking_video", "quiz"):
+        assert stats.count[stage] == len(PHYSICS), stage
+    assert sorted(set(youtube_stub.searches)) == sorted(youtube_stub.searches)    # one search per node
+    assert all(get_cached_topic_content(code) for code in PHYSICS)
+    assert get_cached_topic_content("CHE_BONDS") is None
+
+
+def test_resumed_run_skips_checkpointed_nodes(graph, tmp_path, youtube_stub, llm_stub):
+    first, _ = run(tmp_path, limit=2)
+    searches = len(youtube_stub.searches)
+
+    second, stats = run(tmp_path)
+
+    assert first == {"complete": 2} and second == {"complete": 1}
+    assert stats.count["cache_check"] == 1
+    assert len(youtube_stub.searches) == searches + 1
+    with open(tmp_path / "checkpoint.jsonl", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert sorted(r["code"] for r in records) == PHYSICS
+
+
+def test_incomplete_nodes_are_retried(graph, tmp_path, youtube_stub, llm_stub):
+    youtube_stub.videos_per_search = 0        # search finds nothing
+    first, _ = run(tmp_path)
+    youtube_stub.videos_per_search = 2
+
+    second, _ = run(tmp_path)
+
+    assert first == {"incomplete": len(PHYSICS)}
+    assert second == {"complete": len(PHYSICS)}
+
+
+def test_checkpoint_appends_after_a_partial_line(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text('{"code": "PHY_A", "complete": true}\n{"code": "PHY_B", "comp', encoding="utf-8")
+
+    Checkpoint(str(path)).record({"code": "PHY_C", "complete": True})
+
+    reloaded = Checkpoint(str(path))
+    assert reloaded.is_complete("PHY_A") and reloaded.is_complete("PHY_C")
+    assert not reloaded.is_complete("PHY_B")
@@ -0,0 +1,44 @@
+# tests/test_query_parameters.py
+import pytest
+from fastapi.testclient import TestClient
+from app.asgi import app as asgi_app
+from app.main import create_app
+from app.models import KnowledgeGraphNode
+
+BAD_REQUESTS = [
+    "/api/topics/search?q=force&limit=abc",
+    "/api/topics/search?q=force&offset=x",
+    "/api/topics/suggest?q=for&limit=abc",
+    "/api/jobs/0123abcd?include_transcript=some",
+    "/api/jobs/0123abcd/stream?include_transcript=some",
+]
+
+
+@pytest.fixture
+def graph(db):
+    KnowledgeGraphNode(subject="Physics", title="Forces and Motion", code="PHY_FORCES", difficulty_level="base",
+                       keywords=["force"]).save()
+
+
+@pytest.mark.parametrize("url", BAD_REQUESTS)
+def test_malformed_parameters_are_rejected_by_flask(graph, url):
+    response = create_app().test_client().get(url)
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Invalid request parameters"
+
+
+@pytest.mark.parametrize("url", BAD_REQUESTS)
+def test_malformed_parameters_are_rejected_by_asgi(graph, url):
+    # Not entered as a context manager: the lifespan (graph preload) is not needed
+    response = TestClient(asgi_app).get(url)
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid request parameters"
+
+
+def test_valid_search_still_succeeds(graph):
+    response = create_app().test_client().get("/api/topics/search?q=force&limit=5")
+
+    assert response.status_code == 200
+    assert [r["code"] for r in response.get_json()["results"]] == ["PHY_FORCES"]
@@ -0,0 +1,46 @@
+# tests/test_topic_listing.py
+import pytest
+from app.main import create_app
+from app.models import KnowledgeGraphNode, Quiz
+
+
+@pytest.fixture
+def client(db):
+    return create_app().test_client()
+
+
+def seed_subject(n, subject="Physics"):
+    """n topics of `subject`; every third one has a quiz."""
+    for i in range(n):
+        node = KnowledgeGraphNode(subject=subject, title=f"Topic {i:04d}", code=f"PHY_T{i:04d}",
+                                  difficulty_level="base", videos=[f"vid{i}"] if i % 2 else []).save()
+        if i % 3 == 0:
+            Quiz(KG_Node_ID=node, quiz_type="progress", level="base").save()
+
+
+def listing_operations(client, db_ops, n, query=""):
+    seed_subject(n)
+    db_ops.reset()
+    response = client.get(f"/api/subjects/Physics/topics{query}")
+    assert response.status_code == 200
+    return response.get_json(), db_ops.total
+
+
+@pytest.mark.parametrize("n", [5, 300])
+def test_listing_issues_a_bounded_number_of_queries(client, db_ops, n):
+    payload, operations = listing_operations(client, db_ops, n)
+
+    assert payload["total_topics"] == n
+    assert sum(t["has_quiz"] for t in payload["topics"]) == len(range(0, n, 3))
+    # graph version + nodes + one batched quiz lookup, whatever the subject size
+    assert operations <= 3
+    assert db_ops.on("quiz") == 1
+
+
+@pytest.mark.parametrize("n", [5, 300])
+def test_paged_listing_issues_a_bounded_number_of_queries(client, db_ops, n):
+    payload, operations = listing_operations(client, db_ops, n, "?view=summary&limit=50")
+
+    assert len(payload["topics"]) == min(n, 50)
+    # ... plus the total count
+    assert operations <= 4
@@ -0,0 +1,64 @@
+# tests/test_transcript_api.py
+import gzip
+import json
+import pytest
+from app.main import create_app
+from app.kg_pipeline.yt_videos import save_transcript
+from app.transcript_api import parse_transcript_query
+from app.transcript_store import Segment
+
+SEGMENTS = [Segment(i * 2.0, 2.0, f"caption line {i}") for i in range(120)]
+
+
+@pytest.fixture
+def client(db):
+    save_transcript("abc123", SEGMENTS, " ".join(s.text for s in SEGMENTS))
+    return create_app().test_client()
+
+
+@pytest.mark.parametrize("limit", ["0", "-3"])
+def test_limit_below_one_is_rejected(limit):
+    with pytest.raises(ValueError):
+        parse_transcript_query({"limit": limit})
+
+
+@pytest.mark.parametrize("query", ["limit=0", "start=later", "start=10&end=5", "format=xml"])
+def test_malformed_queries_are_rejected(client, query):
+    response = client.get(f"/api/videos/abc123/transcript?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Invalid request parameters"
+
+
+@pytest.mark.parametrize("window", ["", "&start=30&end=150"])
+def test_following_next_offset_visits_every_segment_once(client, window):
+    seen, offset = [], 0
+    while offset is not None:
+        page = client.get(f"/api/videos/abc123/transcript?limit=25&offset={offset}{window}").get_json()
+        seen += [s["index"] for s in page["segments"]]
+        offset = page["next_offset"]
+
+    expected = list(range(120)) if not window else list(range(15, 75))
+    assert seen == expected
+
+
+def test_streamed_ndjson_is_gzip_compressed(client):
+    response = client.get("/api/videos/abc123/transcript?format=ndjson", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(response.get_data()).decode("utf-8").splitlines()
+    header, segments = json.loads(lines[0]), [json.loads(line) for line in lines[1:]]
+    assert header["count"] == len(segments) == 120
+    assert segments[0]["text"] == "caption line 0"
+
+
+def test_unknown_video_is_404(client):
+    assert client.get("/api/videos/nope/transcript").status_code == 404
+
+
+def test_json_is_brotli_compressed_when_available(client):
+    brotli = pytest.importorskip("brotli")
+    response = client.get("/api/videos/abc123/transcript", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.get_data()))["count"] == 120
@@ -0,0 +1,48 @@
+# tests/test_transcript_store.py
+from app import models
+from app.models import VideoTranscript
+from app.kg_pipeline.yt_videos import save_transcript
+from app.transcript_store import Segment, PackedSegments, pack_segments
+
+SEGMENTS = [Segment(0.0, 2.5, "first line"), Segment(2.5, 3.0, ""), Segment(5.5, 2.0, "third line")]
+NEW_SEGMENTS = [Segment(0.0, 1.0, "a different"), Segment(1.0, 1.0, "transcript")]
+
+
+def raw_doc(youtube_id):
+    return VideoTranscript._get_collection().find_one({"youtube_id": youtube_id})
+
+
+def test_packed_segments_round_trip():
+    full_text, packed = pack_segments(SEGMENTS)
+    segments = PackedSegments(full_text, packed["segment_starts"], packed["segment_durations"],
+                              packed["segment_offsets"])
+
+    assert full_text == "first line third line"
+    assert [(s.start, s.duration, s.text) for s in segments] == [tuple(s) for s in SEGMENTS]
+    assert segments.window(3.0, 6.0) == (1, 3)
+
+
+def test_resaving_legacy_transcript_drops_embedded_segments(db):
+    VideoTranscript._get_collection().insert_one({
+        "youtube_id": "legacy", "full_text": "first line third line",
+        "segments": [{"start": s.start, "duration": s.duration, "text": s.text} for s in SEGMENTS]
+    })
+
+    save_transcript("legacy", NEW_SEGMENTS, "a different transcript")
+
+    doc = raw_doc("legacy")
+    assert "segments" not in doc
+    assert doc["segment_count"] == 2
+    assert [s.text for s in PackedSegments.from_son(doc)] == ["a different", "transcript"]
+
+
+def test_resaving_compact_transcript_as_embedded_drops_packed_fields(db, monkeypatch):
+    save_transcript("compact", SEGMENTS, "first line third line")
+    monkeypatch.setattr(models, "TRANSCRIPT_SEGMENT_STORAGE", "embedded")
+
+    save_transcript("compact", NEW_SEGMENTS, "a different transcript")
+
+    doc = raw_doc("compact")
+    assert not {"segment_count", "segment_starts", "segment_durations", "segment_offsets"} & set(doc)
+    assert doc["full_text"] == "a different transcript"
+    assert [s.text for s in PackedSegments.from_son(doc)] == ["a different", "transcript"]
@@ -0,0 +1,74 @@
+# tests/test_transcript_validation.py
+from app.models import KnowledgeGraphNode, VideoTranscript
+from app.kg_pipeline.relevance import PREFILTER_MIN_BM25, prefilter_transcript, score_transcript
+from app.kg_pipeline.yt_videos import get_video_transcript_and_quiz, get_cached_topic_content, get_transcript_validation
+
+
+def make_node():
+    return KnowledgeGraphNode(
+        subject="Physics", title="Newton's Laws of Motion", code="PHY_NEWTON_LAWS", difficulty_level="base",
+        keywords=["inertia", "force", "acceleration", "reaction"]
+    ).save()
+
+
+def test_verdict_of_searched_video_is_stored_under_node_title(db, youtube_stub, llm_stub):
+    node = make_node()
+
+    result = get_video_transcript_and_quiz(node.code)
+
+    assert result['video_status'] == 'fetched_new'
+    # The search string is "title kw1 kw2 kw3", but readers compare against the title
+    assert youtube_stub.searches and youtube_stub.searches[0] != node.title
+    verdict = VideoTranscript.objects.get(youtube_id=result['youtube_id']).validation
+    assert verdict.topic == node.title
+
+
+def test_prepared_content_is_served_from_the_store(db, youtube_stub, llm_stub):
+    node = make_node()
+    get_video_transcript_and_quiz(node.code)
+    llm_requests = llm_stub.requests
+
+    assert get_cached_topic_content(node.code) is not None
+    again = get_video_transcript_and_quiz(node.code)
+    assert again['video_status'] == 'found_existing'
+    assert llm_stub.requests == llm_requests      # stored verdict and quiz reused
+
+
+def test_prefilter_rejection_is_not_stored_as_a_verdict(db, llm_stub):
+    node = make_node()
+    off_topic = "today we bake sourdough bread with flour water salt and a lot of patience " * 20
+    VideoTranscript(youtube_id="bread", full_text=off_topic).save()
+    doc = VideoTranscript.objects.get(youtube_id="bread")
+
+    validation = get_transcript_validation(doc, off_topic, node.title, keywords=node.keywords)
+
+    assert validation['prefilter'] is True and not validation['is_relevant']
+    assert llm_stub.requests == 0
+    assert VideoTranscript.objects.get(youtube_id="bread").validation is None
+
+
+def test_bm25_gate_tells_lectures_from_passing_mentions():
+    title, keywords = "Newton's Laws of Motion", ["inertia", "force", "acceleration", "reaction"]
+    lecture = ("the first of newton's laws of motion is about inertia, the second relates force and acceleration "
+               "and the third says every action has an equal and opposite reaction. ") * 60
+    chatter = "welcome back to the channel today we cook pasta with garlic and olive oil " * 30
+    mention = chatter + " the force of the stove is strong " + chatter
+
+    assert prefilter_transcript(lecture, title, keywords)[0]
+    # long on-topic lectures must not score lower than short ones
+    assert score_transcript(lecture, title, keywords)["bm25"] >= score_transcript(lecture[:600], title, keywords)["bm25"]
+    passed, scores, _ = prefilter_transcript(mention, title, keywords, min_coverage=0.0, min_density=0.0)
+    assert not passed and scores["bm25"] < PREFILTER_MIN_BM25
+
+
+def test_forced_revalidation_reaches_the_llm(db, youtube_stub, llm_stub, llm_cache):
+    node = make_node()
+    result = get_video_transcript_and_quiz(node.code)
+    doc = VideoTranscript.objects.get(youtube_id=result['youtube_id'])
+    requests = llm_stub.requests
+
+    validation = get_transcript_validation(doc, doc.get_full_text(), node.title, force_revalidate=True,
+                                           keywords=node.keywords)
+
+    assert validation['cached'] is False and 'prefilter' not in validation
+    assert llm_stub.requests == requests + 1
@@ -78,16 +78,23 @@ export async function fetchSubjectTopics(subjectName) {
  * @param {number} options.numQuestions - Number of quiz questions (default: 10)
  * @param {boolean} options.forceRegenerate - Force regenerate quiz (default: false)
  * @param {boolean} options.validateLlm - Use LLM validation (default: true)
+ * @param {string} options.includeTranscript - "full", "preview" or "none" (default: "full")
  */
 export async function fetchTopicContent(topicCode, options = {}) {
     try {
         const params = new URLSearchParams({
             num_questions: options.numQuestions || 10,
             force_regenerate: options.forceRegenerate || false,
-            validate_llm: options.validateLlm !== false // default true
+            validate_llm: options.validateLlm !== false, // default true
+            include_transcript: options.includeTranscript || 'full'
         });
         
         const data = await apiCall(`/api/topics/${encodeURIComponent(topicCode)}/content?${params}`);
+        
+        // Content not ready yet: the backend queued a job, poll until it finishes
+        if (data.status === 'pending' && data.job_id) {
+            return await waitForContentJob(data.status_url);
+        }
         return data;
     } catch (error) {
         console.error(`Failed to fetch content for ${topicCode}:`, error);
@@ -95,10 +102,60 @@ export async function fetchTopicContent(topicCode, options = {}) {
     }
 }
 
+/**
+ * Poll a content-preparation job until it is done
+ * @param {string} statusUrl - Job status URL returned by the content endpoint
+ * @param {number} intervalMs - Delay between polls
+ */
+async function waitForContentJob(statusUrl, intervalMs = 1500) {
+    while (true) {
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+        const job = await apiCall(statusUrl);
+        
+        if (job.status === 'done') {
+            if (!job.content) {
+                throw new Error(job.message || job.error || 'Failed to fetch topic content');
+            }
+            return job.content;
+        }
+        if (job.status === 'error') {
+            throw new Error(job.error || 'Content preparation failed');
+        }
+    }
+}
+
+/**
+ * Fetch timed transcript segments of a video
+ * @param {string} youtubeId - YouTube video id
+ * @param {object} options - Optional parameters
+ * @param {number} options.offset - First segment index
+ * @param {number} options.limit - Number of segments
+ * @param {number} options.start - Window start (seconds)
+ * @param {number} options.end - Window end (seconds)
+ */
+export async function fetchTranscript(youtubeId, options = {}) {
+    try {
+        const params = new URLSearchParams();
+        for (const key of ['offset', 'limit', 'start', 'end']) {
+            if (options[key] != null) params.append(key, options[key]);
+        }
+        
+        return await apiCall(`/api/videos/${encodeURIComponent(youtubeId)}/transcript?${params}`);
+    } catch (error) {
+        console.error(`Failed to fetch transcript for ${youtubeId}:`, error);
+        throw error;
+    }
+}
+
 export const fetchQuizFromApi = async (topicCode) => {
   setLoading(true);
   try {
-     const data = await apiCall(`/api/topics/${encodeURIComponent(topicCode)}/content`);
+     let data = await apiCall(`/api/topics/${encodeURIComponent(topicCode)}/content?include_transcript=none`);
+
+    // Content not ready yet: the backend queued a job, poll until it finishes
+    if (data.status === 'pending' && data.job_id) {
+      data = await waitForContentJob(data.status_url);
+    }
 
     if (data.success && data.quiz) {
       const generatedQs = data.quiz.map((q, index) => {
@@ -148,6 +205,25 @@ export async function searchTopics(query, subject = null) {
     }
 }
 
+/**
+ * Autocomplete topic titles and keywords for a partially typed query
+ * @param {string} prefix - What the user has typed so far
+ * @param {string} subject - Optional subject filter
+ * @param {number} limit - Number of suggestions
+ */
+export async function suggestTopics(prefix, subject = null, limit = 8) {
+    try {
+        const params = new URLSearchParams({ q: prefix, limit });
+        if (subject) params.append('subject', subject);
+        
+        const data = await apiCall(`/api/topics/suggest?${params}`);
+        return data.suggestions || [];
+    } catch (error) {
+        console.error('Suggestions failed:', error);
+        return [];
+    }
+}
+
 // Generic API request function
 const apiRequest = async (endpoint, options = {}) => {
   try {